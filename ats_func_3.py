@@ -1,16 +1,11 @@
-import json
-import google.generativeai as genai
-import os
-import pdfplumber
-import re
-import time
-from dotenv import load_dotenv
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
-
-load_dotenv()
-
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+import retry
+import structured_output
+import telemetry
+from extraction_cache import cache_key, get_cache
+from model_client import get_client
+import dates
+from pdf_extract import extract_text
+from preprocess import prepare_job_description, prepare_resume
 
 MODEL_CONFIG = {
     "temperature": 0.1,
@@ -23,28 +18,30 @@ safety_settings = [
     {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_ONLY_HIGH"},
 ]
 
+MODEL_NAME = 'gemini-1.5-flash'
+
+# Bump whenever the extraction prompt changes so cached results are not reused
+EXTRACTION_PROMPT_VERSION = 'resume-v2'
+
+def get_model():
+    """Return the shared model client (MODEL_CONFIG and safety settings applied)"""
+    return get_client(MODEL_NAME, MODEL_CONFIG, safety_settings)
+
 def safe_json_parse(response_text):
-    """Robust JSON parsing with multiple fallback strategies"""
-    try:
-        
-        return json.loads(response_text)
-    except json.JSONDecodeError:
-        try:
-           
-            json_match = re.search(r'```json\n(.*?)\n```', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(1))
-        except:
-            try:
-                json_str = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_str:
-                    return json.loads(json_str.group())
-            except:
-                return {}
-    return {}
-
-def extract_structured_data(text):
+    """First JSON object in a model answer, repaired if needed ({} when there is none)"""
+    value, _ = structured_output.loads(response_text, "{")
+    return value if isinstance(value, dict) else {}
+
+def extract_structured_data(text, use_cache=True):
     """Extract resume data with validation and retries"""
+    text = prepare_resume(text)
+    cache = get_cache()
+    key = cache_key(text, EXTRACTION_PROMPT_VERSION, MODEL_NAME)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     prompt = f"""
     Extract resume data as VALID JSON with:
     Work experience (exclude freelancing/voluntary/college/Teaching/Intern/Internship/fellowship/Instructing/Projects work and out of context/field experience). For each position, label it as false in relevant.
@@ -63,57 +60,39 @@ def extract_structured_data(text):
         ]
     
     }}
-    Resume Text (truncated):
-    {text[:10000]}
+    Resume Text:
+    {text}
     """
     
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    for attempt in range(3):
-        try:
-            response = model.generate_content(prompt)
-            if response.text:
-                data = safe_json_parse(response.text)
-                
-                if all(key in data for key in ['skills', 'education', 'experience']):
-                    return data
-        except Exception as e:
-            print(f"Extraction error (attempt {attempt+1}): {str(e)[:50]}")
-            time.sleep(2 ** attempt)
-    return {"skills": [], "education": [], "experience": []}
+    try:
+        data = retry.generate_parsed(get_model(), prompt, structured_output.RESUME)
+    except Exception as e:
+        print(f"Extraction error: {str(e)[:50]}")
+        telemetry.note(last_error=str(e))
+        return {"skills": [], "education": [], "experience": [], "failed": True}
+    if use_cache:
+        cache.put(key, data)
+    return data
 
     
 
-def parse_date(date_str):
-    """Robust date parsing with multiple formats"""
-    date_str = str(date_str).strip()
-    if not date_str:
-        return datetime.now()
-    
-    try:
-        if date_str.lower() == "present":
-            return datetime.now()
-        
-        
-        for fmt in ("%m/%Y", "%Y/%m", "%b %Y", "%B %Y", "%Y"):
-            try:
-                return datetime.strptime(date_str, fmt)
-            except:
-                continue
-    except:
-        pass
-    
-    return datetime.now()
+def parse_date(date_str, now=None):
+    """Robust date parsing with multiple formats; "Present" and unknown values map to `now`"""
+    return dates.parse_date(date_str, now)
 
-def calculate_experience(experiences):
+def calculate_experience(experiences, now=None):
     """Calculate total relevant experience with merged date ranges"""
+    from dateutil.relativedelta import relativedelta
+
+    now = now or dates.reference_date()
     try:
         intervals = []
         for exp in experiences:
             if not exp.get('relevant', False):
                 continue
             
-            start = parse_date(exp.get('start', '01/2000'))
-            end = parse_date(exp.get('end', 'Present'))
+            start = parse_date(exp.get('start', '01/2000'), now)
+            end = parse_date(exp.get('end', 'Present'), now)
             intervals.append((start, end))
         
         if not intervals:
@@ -140,16 +119,19 @@ def calculate_experience(experiences):
         print(f"Experience calculation error: {str(e)[:50]}")
         return 0.0
 
-def calculate_stability(experiences):
+def calculate_stability(experiences, now=None):
     """Calculate stability score based on tenure points"""
+    from dateutil.relativedelta import relativedelta
+
+    now = now or dates.reference_date()
     try:
         points = []
         for exp in experiences:
             if not exp.get('relevant', False):
                 continue
             
-            start = parse_date(exp.get('start', '01/2000'))
-            end = parse_date(exp.get('end', 'Present'))
+            start = parse_date(exp.get('start', '01/2000'), now)
+            end = parse_date(exp.get('end', 'Present'), now)
             months = relativedelta(end, start).years * 12 + relativedelta(end, start).months
             
             if months < 6:
@@ -172,9 +154,22 @@ def calculate_stability(experiences):
         print(f"Stability calculation error: {str(e)[:50]}")
         return 0
 
+def calculate_experience_batch(experience_lists, now=None):
+    """calculate_experience for many candidates at once, vectorized (see tenure)"""
+    import tenure
+
+    columns = tenure.experience_columns(experience_lists, start_default='01/2000', now=now)
+    return tenure.total_experience(columns).tolist()
+
+def calculate_stability_batch(experience_lists, now=None):
+    """calculate_stability for many candidates at once, vectorized (see tenure)"""
+    import tenure
+
+    return tenure.stability(tenure.experience_columns(experience_lists, now=now)).tolist()
+
 def get_match_percentage(job_desc, resume_text):
     """Calculate match percentage with validation"""
-    model = genai.GenerativeModel('gemini-1.5-flash')
+    model = get_model()
     
     prompt = f"""
     For example: Return EXACTLY like this JSON format:
@@ -188,59 +183,62 @@ def get_match_percentage(job_desc, resume_text):
     - Stability%: Tenure points converted to percentage. 
     
     Job Description:
-    {job_desc[:10000]}
+    {prepare_job_description(job_desc)}
     
     Resume Content:
-    {resume_text[:10000]}
+    {prepare_resume(resume_text)}
     """
     
-    for attempt in range(5):
-        try:
-            response = model.generate_content(prompt)
-            if response.text:
-                data = safe_json_parse(response.text)
-                if "match" in data and "stability" in data:
-                    return {
-                        "match": max(0, min(100, int(data["match"]))),
-                        "stability": max(0, min(100, int(data["stability"])))
-                    }
-        except Exception as e:
-            sleep_time = min(2 ** attempt + 5, 60)  
-            print(f"API Error (attempt {attempt+1}): Sleeping {sleep_time}s")
-            time.sleep(sleep_time)
-    
-    return {"match": 0, "stability": 0}
-
-def analyze_resume(file_path, job_description):
-    """Main analysis function with error handling"""
     try:
-        with pdfplumber.open(file_path) as pdf:
-            text = "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
-        
-        resume_data = extract_structured_data(text)
-        print("************************************************************")
-        print(resume_data)
-        print("************************************************************")
-        print("##############################################################")
-        print(job_description)
-        print("##############################################################")
-        scores = get_match_percentage(job_description, text)
-        
-        
-        return {
-            "Overall_Match": scores["match"],
-            "Stability_Score": scores["stability"],
-            "Total_Experience": calculate_experience(resume_data.get("experience", [])),
-            "Companies_Count": len([e for e in resume_data.get("experience", []) if e.get("relevant", False)])
-        }
-    
-      
+        return retry.generate_parsed(model, prompt, structured_output.MATCH)
     except Exception as e:
-        print(f"Analysis failed: {str(e)[:50]}")
-        return {
-            "Overall_Match": 0,
-            "Stability_Score": 0,
-            "Total_Experience": 0.0,
-            "Companies_Count": 0
-        }
+        print(f"API Error: {str(e)[:50]}")
+        telemetry.note(last_error=str(e))
+    
+    return {"match": 0, "stability": 0, "failed": True}
+
+def analyze_resume(file_path, job_description, text=None):
+    """Main analysis function with error handling.
+
+    `text` may carry the already-extracted PDF text (see pdf_extract).
+    """
+    with telemetry.trace(kind="resume", resume=str(file_path), scoring="llm"):
+        try:
+            if text is None:
+                with telemetry.stage("pdf_extract"):
+                    text = extract_text(file_path)
+
+            with telemetry.stage("extraction"):
+                resume_data = extract_structured_data(text)
+            if resume_data.get("failed"):
+                raise RuntimeError("Resume extraction failed")
+            print("************************************************************")
+            print(resume_data)
+            print("************************************************************")
+            print("##############################################################")
+            print(job_description)
+            print("##############################################################")
+            with telemetry.stage("scoring"):
+                scores = get_match_percentage(job_description, text)
+            if scores.get("failed"):
+                raise RuntimeError("Scoring failed")
 
+            with telemetry.stage("post_processing"):
+                return {
+                    "Overall_Match": scores["match"],
+                    "Stability_Score": scores["stability"],
+                    "Total_Experience": calculate_experience(resume_data.get("experience", [])),
+                    "Companies_Count": len([e for e in resume_data.get("experience", []) if e.get("relevant", False)])
+                }
+
+        except Exception as e:
+            print(f"Analysis failed: {str(e)[:50]}")
+            telemetry.add("failures")
+            telemetry.note(error=f"{type(e).__name__}: {e}")
+            return {
+                "Overall_Match": 0,
+                "Stability_Score": 0,
+                "Total_Experience": 0.0,
+                "Companies_Count": 0,
+                "Failed": True
+            }
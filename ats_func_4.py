@@ -1,16 +1,14 @@
 import json
-import google.generativeai as genai
-import os
-import pdfplumber
-import re
-import time
-from dotenv import load_dotenv
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
-
-load_dotenv()
-
-genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+import retry
+import structured_output
+import telemetry
+from extraction_cache import cache_key, get_cache
+from model_client import get_client
+import dates
+from pdf_extract import extract_text
+from preprocess import count_tokens, prepare_job_description, prepare_resume
+from batch_llm import run_batched
+from jd_registry import jd_hash
 
 MODEL_CONFIG = {
     "temperature": 0.1,
@@ -24,29 +22,38 @@ safety_settings = [
 ]
 
 
-def safe_json_parse(response_text):
-    """Robust JSON parsing with multiple fallback strategies"""
-    try:
+MODEL_NAME = "gemini-1.5-flash"
 
-        return json.loads(response_text)
-    except json.JSONDecodeError:
-        try:
+# Bump whenever the extraction prompt changes so cached results are not reused
+EXTRACTION_PROMPT_VERSION = "resume-v2"
+JD_PROMPT_VERSION = "jd-v2"
 
-            json_match = re.search(r"```json\n(.*?)\n```", response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(1))
-        except:
-            try:
-                json_str = re.search(r"\{.*\}", response_text, re.DOTALL)
-                if json_str:
-                    return json.loads(json_str.group())
-            except:
-                return {}
-    return {}
+# Gemini 1.5 Flash output cap; batched answers need more than MODEL_CONFIG's limit
+MAX_OUTPUT_TOKENS = 8192
+# Items per batched request, so a full batch of MODEL_CONFIG-sized answers fits under the cap
+BATCH_MAX_ITEMS = max(1, MAX_OUTPUT_TOKENS // MODEL_CONFIG["max_output_tokens"])
 
+def get_model():
+    """Return the shared model client (MODEL_CONFIG and safety settings applied)"""
+    return get_client(MODEL_NAME, MODEL_CONFIG, safety_settings)
 
-def extract_structured_data(text):
+
+def safe_json_parse(response_text):
+    """First JSON object in a model answer, repaired if needed ({} when there is none)"""
+    value, _ = structured_output.loads(response_text, "{")
+    return value if isinstance(value, dict) else {}
+
+
+def extract_structured_data(text, use_cache=True):
     """Extract resume data with validation and retries"""
+    text = prepare_resume(text)
+    cache = get_cache()
+    key = cache_key(text, EXTRACTION_PROMPT_VERSION, MODEL_NAME)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     prompt = f"""
     Extract resume data as VALID JSON with:
     Work experience (exclude freelancing/voluntary/college/Teaching/Intern/Internship/fellowship/Instructing/Projects work and out of context/field experience). For each position, label it as false in relevant.
@@ -65,47 +72,31 @@ def extract_structured_data(text):
         ]
     
     }}
-    Resume Text (truncated):
-    {text[:10000]}
+    Resume Text:
+    {text}
     """
 
-    model = genai.GenerativeModel("gemini-1.5-flash")
-    for attempt in range(3):
-        try:
-            response = model.generate_content(prompt)
-            if response.text:
-                data = safe_json_parse(response.text)
-
-                if all(key in data for key in ["skills", "education", "experience"]):
-                    return data
-        except Exception as e:
-            print(f"Extraction error (attempt {attempt+1}): {str(e)[:50]}")
-            time.sleep(2**attempt)
-    return {"skills": [], "education": [], "experience": []}
-
-
-def parse_date(date_str):
-    """Robust date parsing with multiple formats"""
-    date_str = str(date_str).strip()
-    if not date_str:
-        return datetime.now()
-
     try:
-        if date_str.lower() == "present":
-            return datetime.now()
+        data = retry.generate_parsed(get_model(), prompt, structured_output.RESUME)
+    except Exception as e:
+        print(f"Extraction error: {str(e)[:50]}")
+        telemetry.note(last_error=str(e))
+        return {"skills": [], "education": [], "experience": [], "failed": True}
+    if use_cache:
+        cache.put(key, data)
+    return data
 
-        for fmt in ("%m/%Y", "%Y/%m", "%b %Y", "%B %Y", "%Y"):
-            try:
-                return datetime.strptime(date_str, fmt)
-            except:
-                continue
-    except:
-        pass
 
-    return datetime.now()
+def parse_date(date_str, now=None):
+    """Robust date parsing with multiple formats; "Present" and unknown values map to `now`"""
+    return dates.parse_date(date_str, now)
+
 
-def calculate_experience(experiences):
+def calculate_experience(experiences, now=None):
     """Calculate total relevant experience with merged date ranges (FIXED)"""
+    from dateutil.relativedelta import relativedelta
+
+    now = now or dates.reference_date()
     try:
         intervals = []
         # 1. Collect relevant experiences
@@ -113,8 +104,8 @@ def calculate_experience(experiences):
             if not exp.get("relevant", False):
                 continue
 
-            start = parse_date(exp.get("start", "Present"))
-            end = parse_date(exp.get("end", "Present"))
+            start = parse_date(exp.get("start", "Present"), now)
+            end = parse_date(exp.get("end", "Present"), now)
             intervals.append((start, end))  
 
         if not intervals:
@@ -152,16 +143,19 @@ def calculate_experience(experiences):
         return 0.0
 
 
-def calculate_stability(experiences):
+def calculate_stability(experiences, now=None):
     """Calculate stability score based on tenure points"""
+    from dateutil.relativedelta import relativedelta
+
+    now = now or dates.reference_date()
     try:
         points = []
         for exp in experiences:
             if not exp.get("relevant", False):
                 continue
 
-            start = parse_date(exp.get("start", "01/2000"))
-            end = parse_date(exp.get("end", "Present"))
+            start = parse_date(exp.get("start", "01/2000"), now)
+            end = parse_date(exp.get("end", "Present"), now)
             months = (
                 relativedelta(end, start).years * 12 + relativedelta(end, start).months
             )
@@ -189,9 +183,55 @@ def calculate_stability(experiences):
 
 
 
-def get_match_percentage(job_desc, resume_data):
-    """Calculate match percentage based on structured resume data and job description"""
-    model = genai.GenerativeModel("gemini-1.5-flash")
+def calculate_experience_batch(experience_lists, now=None):
+    """calculate_experience for many candidates at once, vectorized (see tenure)"""
+    import tenure
+
+    columns = tenure.experience_columns(experience_lists, start_default="Present", now=now)
+    return tenure.total_experience(columns).tolist()
+
+
+def calculate_stability_batch(experience_lists, now=None):
+    """calculate_stability for many candidates at once, vectorized (see tenure)"""
+    import tenure
+
+    return tenure.stability(tenure.experience_columns(experience_lists, now=now)).tolist()
+
+
+def parse_job_description(job_desc):
+    """Parse a job description into structured requirements (None on failure)"""
+    prompt = f"""
+    Extract the job requirements as VALID JSON with:
+    {{
+        "required_skills": ["Python", "Machine Learning", ...],
+        "required_education": ["Bachelor's in Computer Science", ...],
+        "min_experience": years,
+        "relevant_titles": ["Job Title", ...],
+        "keywords": ["keyword", ...]
+    }}
+    Job Description:
+    {prepare_job_description(job_desc)}
+    """
+
+    try:
+        return retry.generate_parsed(get_model(), prompt, structured_output.JOB)
+    except Exception as e:
+        print(f"Job description parsing error: {str(e)[:50]}")
+        telemetry.note(last_error=str(e))
+        return None
+
+
+def get_match_percentage(job_desc, resume_data, job_reqs=None):
+    """Calculate match percentage based on structured resume data and job description.
+
+    When `job_reqs` (parsed once per JD) is given it replaces the raw job
+    description in the prompt, which is much shorter.
+    """
+    model = get_model()
+    if job_reqs:
+        jd_section = f"Job Requirements:\n    {json.dumps(job_reqs, ensure_ascii=False)}"
+    else:
+        jd_section = f"Job Description:\n    {prepare_job_description(job_desc)}"
 
     prompt = f"""
         Analyze this resume against the job description. Return JSON with:
@@ -227,71 +267,387 @@ def get_match_percentage(job_desc, resume_data):
         "detailed_analysis": "paragraph explaining scoring rationale"
     }}
     
-    Job Description:
-    {job_desc[:10000]}
+    {jd_section}
     """
 
 
 
-    for attempt in range(5):
-        try:
-            response = model.generate_content(prompt)
-            if response.text:
-                data = safe_json_parse(response.text)
-                if "match" in data and "stability" in data:
-                    return {
-                        "match": max(0, min(100, int(data["match"]))),
-                        "stability": max(0, min(100, int(data["stability"]))),
-                        "score_breakdown":data.get("strength",[]),
-                        "strengths": data.get("strengths",[]),
-                        "weaknesses": data.get("weaknesses",[]),
-                        "analysis":data.get("detailed_analysis","")
-                    }
-        except Exception as e:
-            sleep_time = min(2**attempt + 5, 60)
-            print(f"API Error (attempt {attempt+1}): Sleeping {sleep_time}s")
-            time.sleep(sleep_time)
+    try:
+        return _score_result(retry.generate_parsed(model, prompt, structured_output.SCORE))
+    except Exception as e:
+        print(f"API Error: {str(e)[:50]}")
+        telemetry.note(last_error=str(e))
 
-    return{"match":0,"stability":0,"score_breakdown":0,"strengths":0,"weaknesses":0,"analysis":0}
+    return{"match":0,"stability":0,"score_breakdown":{},"strengths":[],"weaknesses":[],"analysis":"","failed":True}
 
-def analyze_resume(file_path, job_description):
-    """Main analysis function with explainable AI features"""
-    try:
-        with pdfplumber.open(file_path) as pdf:
-            text = "\n".join(page.extract_text() for page in pdf.pages if page.extract_text())
+def _valid_extraction(entry):
+    return structured_output.RESUME.validate(entry) is not None
 
-        resume_data = extract_structured_data(text)
-        total_exp = calculate_experience(resume_data.get("experience", []))
-        resume_data["total_experience"] = total_exp
-        
-        scores = get_match_percentage(job_description, resume_data)
-
-        return {
-            "Overall_Match": scores["match"],
-            "Stability_Score": scores["stability"],
-            "Total_Experience": total_exp,
-            "Companies_Count": len([e for e in resume_data.get("experience", []) if e.get("relevant", False)]),
-            "Score_Breakdown": scores["score_breakdown"],
-            "Strengths": scores["strengths"],
-            "Weaknesses": scores["weaknesses"],
-            "Detailed_Analysis": scores["analysis"],
-            "Skills": resume_data.get("skills", []),
-            "Education": resume_data.get("education", []),
-            "Relevant_Experience": [e for e in resume_data.get("experience", []) if e.get("relevant", False)]
-        }
 
-    except Exception as e:
-        print(f"Analysis failed: {str(e)[:50]}")
-        return {
-            "Overall_Match": 0,
-            "Stability_Score": 0,
-            "Total_Experience": 0.0,
-            "Companies_Count": 0,
-            "Score_Breakdown": {},
-            "Strengths": [],
-            "Weaknesses": [],
-            "Detailed_Analysis": "",
-            "Skills": [],
-            "Education": [],
-            "Relevant_Experience": []
-        }
+def extract_structured_data_batch(texts, use_cache=True, stats=None):
+    """Batched extract_structured_data: several resumes per request.
+
+    Returns one result per text, in order. Cached texts skip the model;
+    items the batch answer gets wrong fall back to single extraction.
+    """
+    texts = [prepare_resume(text) for text in texts]
+    cache = get_cache()
+    keys = [cache_key(text, EXTRACTION_PROMPT_VERSION, MODEL_NAME) for text in texts]
+    results = [cache.get(key) if use_cache else None for key in keys]
+    missing = [(str(i), texts[i]) for i, result in enumerate(results) if result is None]
+
+    def build_prompt(batch):
+        resumes = "\n".join(f"--- candidate_id: {cid} ---\n{text}" for cid, text in batch)
+        return f"""
+    Extract resume data for EACH candidate below and return a VALID JSON array with one object per candidate.
+    Work experience (exclude freelancing/voluntary/college/Teaching/Intern/Internship/fellowship/Instructing/Projects work and out of context/field experience). For each position, label it as false in relevant.
+    Terminologies similar to skills which are mention in job experience, projects are also contedas a skills.
+    [
+        {{
+            "candidate_id": "id from the header",
+            "skills": ["Python", "Machine Learning", ...],
+            "education": ["Bachelor's in Computer Science", ...],
+            "experience": [
+                {{
+                    "company": "Company Name",
+                    "start": "MM/YYYY",
+                    "end": "MM/YYYY/Present",
+                    "position": "Job Title",
+                    "relevant": true/false
+                }}
+            ]
+        }}
+    ]
+    Resumes:
+    {resumes}
+    """
+
+    answered = run_batched(
+        missing,
+        get_model(),
+        build_prompt,
+        _valid_extraction,
+        fallback=lambda text: extract_structured_data(text, use_cache),
+        convert=structured_output.RESUME.validate,
+        cost=count_tokens,
+        stats=stats,
+        max_items=BATCH_MAX_ITEMS,
+        output_tokens=lambda batch: min(MAX_OUTPUT_TOKENS, MODEL_CONFIG["max_output_tokens"] * len(batch)),
+    )
+    for cid, data in answered.items():
+        i = int(cid)
+        results[i] = data
+        if use_cache and _valid_extraction(data) and not data.get("failed"):
+            cache.put(keys[i], data)
+    return results
+
+
+def _score_result(data):
+    """get_match_percentage's result shape from a structured_output.SCORE answer"""
+    data = structured_output.SCORE.validate(data)
+    return {
+        "match": data["match"],
+        "stability": data["stability"],
+        "score_breakdown": data["score_breakdown"],
+        "strengths": data["strengths"],
+        "weaknesses": data["weaknesses"],
+        "analysis": data["detailed_analysis"],
+    }
+
+
+def _valid_score(entry):
+    return structured_output.SCORE.validate(entry) is not None
+
+
+def get_match_percentage_batch(job_desc, resume_datas, job_reqs=None, stats=None):
+    """Batched get_match_percentage for several resumes against one job description"""
+    if job_reqs:
+        jd_section = f"Job Requirements:\n    {json.dumps(job_reqs, ensure_ascii=False)}"
+    else:
+        jd_section = f"Job Description:\n    {prepare_job_description(job_desc)}"
+
+    def profile(resume_data):
+        return json.dumps({
+            "skills": resume_data.get("skills", []),
+            "education": resume_data.get("education", []),
+            "total_experience": resume_data.get("total_experience", 0),
+            "positions": [e.get("position") for e in resume_data.get("experience", [])],
+        }, ensure_ascii=False)
+
+    def build_prompt(batch):
+        candidates = "\n".join(f"- candidate_id {cid}: {profile(data)}" for cid, data in batch)
+        return f"""
+    Analyze EACH candidate profile below against the job. Give consistent scores according to the keyword
+    and semantic matching of skills, education and experience (years vs job requirements), position
+    relevance, keyword presence and career stability.
+
+    Return a VALID JSON array with one object per candidate, EXACTLY in this format:
+    [
+        {{
+            "candidate_id": "id from the list",
+            "match": percentage,
+            "stability": percentage,
+            "score_breakdown": {{
+                "skills_match": percentage,
+                "education_match": percentage,
+                "experience_match": percentage,
+                "keyword_match": percentage
+            }},
+            "strengths": ["list", "of", "strengths"],
+            "weaknesses": ["list", "of", "weaknesses"],
+            "detailed_analysis": "paragraph explaining scoring rationale"
+        }}
+    ]
+
+    Candidates:
+    {candidates}
+
+    {jd_section}
+    """
+
+    answered = run_batched(
+        [(str(i), data) for i, data in enumerate(resume_datas)],
+        get_model(),
+        build_prompt,
+        _valid_score,
+        fallback=lambda data: get_match_percentage(job_desc, data, job_reqs),
+        convert=_score_result,
+        cost=lambda data: count_tokens(profile(data)),
+        stats=stats,
+        max_items=BATCH_MAX_ITEMS,
+        output_tokens=lambda batch: min(MAX_OUTPUT_TOKENS, MODEL_CONFIG["max_output_tokens"] * len(batch)),
+    )
+    return [answered[str(i)] for i in range(len(resume_datas))]
+
+def local_match_percentage(job_reqs, resume_data, stability=None):
+    """Deterministic counterpart of get_match_percentage using scoring.JobScorer.
+
+    `stability` may carry a precomputed calculate_stability() value.
+    """
+    from scoring import ATS_WEIGHTS, JobScorer
+
+    scorer = JobScorer(job_reqs, weights=ATS_WEIGHTS, semantic=True)
+    scores = scorer.score(resume_data)
+    matched, missing = scorer.skill_gaps(resume_data)
+    if stability is None:
+        stability = calculate_stability(resume_data.get("experience", []))
+    return {
+        "match": int(round(scores["match"])),
+        "stability": int(round(stability)),
+        "score_breakdown": {
+            "skills_match": round(scores["skills_match"]),
+            "education_match": round(scores["education_match"]),
+            "experience_match": round(scores["experience_match"]),
+        },
+        "strengths": [f"Has required skill: {skill}" for skill in matched],
+        "weaknesses": [f"Missing required skill: {skill}" for skill in missing],
+        "analysis": (
+            f"Local score: skills {scores['skills_match']:.0f}%, education {scores['education_match']:.0f}%, "
+            f"experience {scores['experience_match']:.0f}% weighted {ATS_WEIGHTS}"
+        ),
+    }
+
+
+def score_shortlist(index, job_description, job_reqs, k=50, load=None, stats=None):
+    """Score only the top-`k` BM25 candidates of a talent_index.TalentIndex with the LLM.
+
+    `load(profile_id)` returns a profile's extraction result; it defaults to
+    the extraction cache, whose keys are the ids ExtractionCache.items()
+    yields. Returns [(profile_id, bm25_score, scores)], best BM25 first.
+    """
+    load = load or get_cache().get
+    shortlist = index.search(job_reqs, k)
+    resume_datas = [dict(load(profile_id) or {}) for profile_id, _ in shortlist]
+    experience_lists = [resume_data.get("experience", []) for resume_data in resume_datas]
+    for resume_data, years in zip(resume_datas, calculate_experience_batch(experience_lists)):
+        resume_data["total_experience"] = years
+    scores = get_match_percentage_batch(job_description, resume_datas, job_reqs, stats=stats)
+    return [(profile_id, rank, score) for (profile_id, rank), score in zip(shortlist, scores)]
+
+
+def _tiers():
+    import tiered
+
+    return tiered.get_scorer()
+
+
+def analyze_resume(file_path, job_description, job_reqs=None, scoring="llm", text=None):
+    """Main analysis function with explainable AI features.
+
+    scoring="local" replaces the LLM scoring call with local_match_percentage,
+    leaving one LLM call per resume (plus one per distinct JD when `job_reqs`
+    is not supplied by a JobRegistry). scoring="tiered" scores locally first
+    and only calls the LLM for candidates the shared tiered.TieredScorer
+    escalates. `text` may carry the already-extracted PDF text (see
+    pdf_extract).
+    """
+    with telemetry.trace(kind="resume", resume=str(file_path), scoring=scoring):
+        try:
+            if text is None:
+                with telemetry.stage("pdf_extract"):
+                    text = extract_text(file_path)
+
+            with telemetry.stage("extraction"):
+                resume_data = extract_structured_data(text)
+            if resume_data.get("failed"):
+                raise RuntimeError("Resume extraction failed")
+            with telemetry.stage("post_processing"):
+                resume_data["total_experience"] = calculate_experience(resume_data.get("experience", []))
+
+            if scoring in ("local", "tiered"):
+                if job_reqs is None:
+                    with telemetry.stage("jd_parse"):
+                        job_reqs = parse_job_description(job_description)
+                    if job_reqs is None:
+                        # Scoring against empty requirements would look like a real score
+                        raise RuntimeError("Job description parsing failed")
+                with telemetry.stage("local_scoring"):
+                    scores = local_match_percentage(job_reqs, resume_data)
+                if scoring == "tiered" and _tiers().should_escalate(job_description, scores["match"]):
+                    telemetry.add("escalated")
+                    with telemetry.stage("scoring"):
+                        scores = get_match_percentage(job_description, resume_data, job_reqs)
+            else:
+                with telemetry.stage("scoring"):
+                    scores = get_match_percentage(job_description, resume_data, job_reqs)
+
+            if scores.get("failed"):
+                raise RuntimeError("Scoring failed")
+            with telemetry.stage("post_processing"):
+                return _build_result(scores, resume_data)
+
+        except Exception as e:
+            print(f"Analysis failed: {str(e)[:50]}")
+            telemetry.add("failures")
+            telemetry.note(error=f"{type(e).__name__}: {e}")
+            return _failed_result()
+
+
+def is_failed(result):
+    """True for an analyze_resume(s) result standing in for a failed analysis"""
+    return bool(result.get("Failed"))
+
+
+def _build_result(scores, resume_data):
+    result = {
+        "Overall_Match": scores["match"],
+        "Stability_Score": scores["stability"],
+        "Total_Experience": resume_data["total_experience"],
+        "Companies_Count": len([e for e in resume_data.get("experience", []) if e.get("relevant", False)]),
+        "Score_Breakdown": scores["score_breakdown"],
+        "Strengths": scores["strengths"],
+        "Weaknesses": scores["weaknesses"],
+        "Detailed_Analysis": scores["analysis"],
+        "Skills": resume_data.get("skills", []),
+        "Education": resume_data.get("education", []),
+        "Relevant_Experience": [e for e in resume_data.get("experience", []) if e.get("relevant", False)]
+    }
+    if scores.get("failed") or resume_data.get("failed"):
+        result["Failed"] = True
+    return result
+
+
+def rescore_results(job_description, resume_datas, job_reqs=None, stats=None):
+    """LLM scoring for candidates whose extraction is already known (e.g. from a profile_store).
+
+    Skips PDF extraction and resume extraction entirely; returns
+    analyze_resume()-shaped results in input order.
+    """
+    with telemetry.trace(kind="rescore", resumes=len(resume_datas)):
+        with telemetry.stage("scoring"):
+            scores = get_match_percentage_batch(job_description, resume_datas, job_reqs, stats=stats)
+        return [_build_result(score, resume_data) for score, resume_data in zip(scores, resume_datas)]
+
+
+def _failed_result():
+    return {
+        "Overall_Match": 0,
+        "Stability_Score": 0,
+        "Total_Experience": 0.0,
+        "Companies_Count": 0,
+        "Score_Breakdown": {},
+        "Strengths": [],
+        "Weaknesses": [],
+        "Detailed_Analysis": "",
+        "Skills": [],
+        "Education": [],
+        "Relevant_Experience": [],
+        "Failed": True
+    }
+
+
+def analyze_resumes(file_paths, job_descriptions, job_reqs_list=None, texts=None, scoring="llm", stats=None):
+    """Batched analyze_resume: packs several resumes into each extraction and scoring request.
+
+    Results are returned in input order. Scoring requests are batched per
+    distinct job description; with scoring="tiered" only the escalated
+    candidates of each group are sent.
+    """
+    n = len(file_paths)
+    job_reqs_list = job_reqs_list or [None] * n
+    texts = list(texts) if texts is not None else [None] * n
+    with telemetry.trace(kind="batch", resumes=n, scoring=scoring):
+        try:
+            for i in range(n):
+                if texts[i] is None:
+                    with telemetry.stage("pdf_extract"):
+                        texts[i] = extract_text(file_paths[i])
+
+            with telemetry.stage("extraction"):
+                resume_datas = extract_structured_data_batch(texts, stats=stats)
+            with telemetry.stage("post_processing"):
+                experience_lists = [resume_data.get("experience", []) for resume_data in resume_datas]
+                for resume_data, years in zip(resume_datas, calculate_experience_batch(experience_lists)):
+                    resume_data["total_experience"] = years
+                stabilities = calculate_stability_batch(experience_lists) if scoring in ("local", "tiered") else None
+
+            scores = [None] * n
+            groups = {}
+            for i in range(n):
+                # Failed extractions are not scored; they come back as failed results
+                if not resume_datas[i].get("failed"):
+                    groups.setdefault(jd_hash(job_descriptions[i]), []).append(i)
+            for positions in groups.values():
+                first = positions[0]
+                job_reqs = job_reqs_list[first]
+                if scoring in ("local", "tiered"):
+                    if job_reqs is None:
+                        with telemetry.stage("jd_parse"):
+                            job_reqs = parse_job_description(job_descriptions[first])
+                        if job_reqs is None:
+                            # The group comes back as failed results, not scores against empty requirements
+                            telemetry.add("failures", len(positions))
+                            continue
+                    with telemetry.stage("local_scoring"):
+                        for i in positions:
+                            scores[i] = local_match_percentage(job_reqs, resume_datas[i], stabilities[i])
+                    if scoring == "tiered":
+                        matches = [scores[i]["match"] for i in positions]
+                        decisions = _tiers().select(job_descriptions[first], matches)
+                        escalated = [i for i, escalate in zip(positions, decisions) if escalate]
+                        telemetry.add("escalated", len(escalated))
+                        if escalated:
+                            with telemetry.stage("scoring"):
+                                group_scores = get_match_percentage_batch(
+                                    job_descriptions[first], [resume_datas[i] for i in escalated], job_reqs,
+                                    stats=stats,
+                                )
+                            for i, score in zip(escalated, group_scores):
+                                scores[i] = score
+                else:
+                    with telemetry.stage("scoring"):
+                        group_scores = get_match_percentage_batch(
+                            job_descriptions[first], [resume_datas[i] for i in positions], job_reqs, stats=stats
+                        )
+                    for i, score in zip(positions, group_scores):
+                        scores[i] = score
+
+            with telemetry.stage("post_processing"):
+                return [_failed_result() if scores[i] is None else _build_result(scores[i], resume_datas[i])
+                        for i in range(n)]
+
+        except Exception as e:
+            print(f"Batch analysis failed: {str(e)[:50]}")
+            telemetry.add("failures", n)
+            telemetry.note(error=f"{type(e).__name__}: {e}")
+            return [_failed_result() for _ in range(n)]
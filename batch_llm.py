@@ -0,0 +1,80 @@
+import threading
+
+import retry
+from bulk_runner import estimate_tokens
+from structured_output import parse_array
+
+DEFAULT_TOKEN_BUDGET = 24000
+DEFAULT_MAX_ITEMS = 8
+
+# `stats` dicts are shared by the bulk runner's worker threads
+_stats_lock = threading.Lock()
+
+
+def _count(stats, name, value=1):
+    with _stats_lock:
+        stats[name] = stats.get(name, 0) + value
+
+
+def pack_batches(items, cost, token_budget=DEFAULT_TOKEN_BUDGET, max_items=DEFAULT_MAX_ITEMS):
+    """Greedily pack (candidate_id, payload) items into batches under a token budget.
+
+    An item larger than the whole budget still gets a batch of its own.
+    """
+    batch, used = [], 0
+    for item in items:
+        tokens = cost(item[1])
+        if batch and (used + tokens > token_budget or len(batch) >= max_items):
+            yield batch
+            batch, used = [], 0
+        batch.append(item)
+        used += tokens
+    if batch:
+        yield batch
+
+
+def parse_json_array(response_text):
+    """Parse a JSON array answer, tolerating code fences, common defects or a {"results": [...]} wrapper"""
+    return parse_array(response_text)
+
+
+def run_batched(items, model, build_prompt, validate, fallback, convert=None, cost=None,
+                token_budget=DEFAULT_TOKEN_BUDGET, max_items=DEFAULT_MAX_ITEMS, stats=None,
+                output_tokens=None):
+    """Answer many (candidate_id, payload) items with one request per packed batch.
+
+    The model must return a JSON array of objects carrying "candidate_id".
+    Items whose answer is missing or fails `validate` are re-done one by one
+    with `fallback(payload)`; valid answers go through `convert` so both
+    paths return the same shape. Returns {candidate_id: result}. When given, the
+    `stats` dict accumulates requests, items and fallbacks. `output_tokens(batch)`
+    raises the response token limit for large batches.
+    """
+    cost = cost or (lambda payload: estimate_tokens(str(payload)))
+    stats = stats if stats is not None else {}
+    results = {}
+    for batch in pack_batches(items, cost, token_budget, max_items):
+        entries = []
+        try:
+            overrides = {"max_output_tokens": output_tokens(batch)} if output_tokens else {}
+            response = retry.call(model.generate_content, build_prompt(batch), **overrides)
+            entries = parse_json_array(response.text or "")
+        except Exception as e:
+            print(f"Batch request failed ({len(batch)} items): {str(e)[:50]}")
+        _count(stats, "requests")
+        _count(stats, "items", len(batch))
+
+        by_id = {}
+        for entry in entries:
+            if isinstance(entry, dict) and "candidate_id" in entry:
+                by_id[str(entry["candidate_id"])] = entry
+        for candidate_id, payload in batch:
+            entry = by_id.get(str(candidate_id))
+            if entry is not None and validate(entry):
+                entry = dict(entry)
+                entry.pop("candidate_id", None)
+                results[candidate_id] = convert(entry) if convert else entry
+            else:
+                _count(stats, "fallbacks")
+                results[candidate_id] = fallback(payload)
+    return results
@@ -0,0 +1,154 @@
+"""Duplicate resume detection: accuracy, lookup cost and model calls saved.
+
+1. Index: signs --docs synthetic resumes, a share of them trivially edited
+   copies (one word changed, a line added, renamed file), and compares LSH
+   lookups with a brute-force scan of every stored signature: time per
+   lookup and precision/recall against the known copies.
+2. Pipeline: runs resume_bulk_analysis_4.process_resumes on a sheet with
+   --rows rows (same JD, --dup-rate resubmissions) against the fake model,
+   with and without deduplication, and reports model calls and wall time.
+   The defaults are a realistic resubmission rate and model latency; with
+   a near-zero --latency the saved calls cost less than the MinHash pass.
+
+Usage: python benchmarks/bench_dedup.py [--docs 5000] [--rows 120] [--dup-rate 0.1] [--latency 0.5]
+"""
+import argparse
+import atexit
+import contextlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import dedup  # noqa: E402
+from model_client import FakeBackend  # noqa: E402
+from synthetic import FILLER, make_pdf, resume_lines  # noqa: E402
+
+
+def resume(rng, i):
+    lines = resume_lines(rng, f"Candidate {i}")
+    lines += rng.sample(FILLER, 3) + [f"Phone +1 555 {rng.randint(1000, 9999)}", f"Email candidate{i}@example.com"]
+    return lines
+
+
+def edit(rng, lines):
+    """A trivial resubmission: one changed word or one added line"""
+    lines = list(lines)
+    if rng.random() < 0.5:
+        row = rng.randrange(len(lines))
+        words = lines[row].split()
+        words[rng.randrange(len(words))] = "updated"
+        lines[row] = " ".join(words)
+    else:
+        lines.insert(rng.randrange(len(lines)), "Available to start immediately")
+    return lines
+
+
+def corpus(rng, count, dup_rate):
+    """[(lines, original index or None)]"""
+    docs = []
+    for i in range(count):
+        if docs and rng.random() < dup_rate:
+            source = rng.randrange(len(docs))
+            original = docs[source][1] if docs[source][1] is not None else source
+            docs.append((edit(rng, docs[original][0]), original))
+        else:
+            docs.append((resume(rng, i), None))
+    return docs
+
+
+def bench_index(args):
+    rng = random.Random(args.seed)
+    docs = corpus(rng, args.docs, args.dup_rate)
+    hasher = dedup.MinHasher()
+    started = time.perf_counter()
+    signatures = [hasher.signature(dedup._words("\n".join(lines))) for lines, _ in docs]
+    sign_s = time.perf_counter() - started
+
+    index = dedup.LSHIndex()
+    found, lsh_s, brute_s = {}, 0.0, 0.0
+    canonical = {}
+    for i, signature in enumerate(signatures):
+        started = time.perf_counter()
+        match = index.query(signature, args.threshold)
+        lsh_s += time.perf_counter() - started
+        if i % 50 == 0:
+            # Brute force on a sample: compare with every stored signature
+            started = time.perf_counter()
+            for other in index.signatures.values():
+                (other == signature).mean()
+            brute_s += (time.perf_counter() - started) * 50
+        if match is None:
+            index.add(i, signature)
+            canonical[i] = i
+        else:
+            found[i] = match[0]
+            canonical[i] = match[0]
+
+    truth = {i for i, (_, original) in enumerate(docs) if original is not None}
+    correct = sum(1 for i, original in found.items() if docs[i][1] == original)
+    print(f"{args.docs} resumes, {len(truth)} edited copies, threshold {args.threshold}")
+    print(f"signing: {sign_s / len(docs) * 1e6:.0f} us per resume")
+    print(f"lookup: LSH {lsh_s / len(docs) * 1e6:.0f} us, brute force {brute_s / len(docs) * 1e6:.0f} us "
+          f"per resume (over {len(index)} stored)")
+    print(f"precision {correct / max(len(found), 1):.3f}, recall {correct / max(len(truth), 1):.3f}")
+
+
+def bench_pipeline(args):
+    import pandas as pd
+
+    import resume_bulk_analysis_4
+
+    rng = random.Random(args.seed)
+    directory = tempfile.mkdtemp()
+    # Registered first so it runs last, after the caches' own atexit saves
+    atexit.register(shutil.rmtree, directory, True)
+    jd = "We are hiring a Data Scientist. Requirements: Python, SQL, Pandas. At least 2 years of experience."
+    records = []
+    for i, (lines, _) in enumerate(corpus(rng, args.rows, args.dup_rate)):
+        path = os.path.join(directory, f"upload_{i}.pdf")
+        make_pdf(path, lines)
+        records.append({"Applicant": f"Applicant {i}", "JobDescription": jd, "Resume": path, "Position": "Analyst"})
+    sheet = os.path.join(directory, "candidates.xlsx")
+    pd.DataFrame(records).to_excel(sheet, index=False)
+
+    print(f"\n{args.rows} rows, dup rate {args.dup_rate}")
+    print(f"{'mode':<12} {'calls':>7} {'seconds':>9}")
+    for deduplicate in (False, True):
+        workdir = os.path.join(directory, f"dedup_{deduplicate}")
+        os.makedirs(workdir)
+        os.chdir(workdir)
+        backend = FakeBackend(args.latency, seed=args.seed)
+        started = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            resume_bulk_analysis_4.process_resumes(
+                sheet, "out.xlsx", rpm=10**9, tpm=10**12, backend=backend, checkpoint=False, events=False,
+                deduplicate=deduplicate,
+            )
+        elapsed = time.perf_counter() - started
+        print(f"{'dedup' if deduplicate else 'no dedup':<12} {backend.calls:>7} {elapsed:>9.2f}")
+    report = dedup.duplicates_path(os.path.join(workdir, "out.xlsx"), "ats4-llm")
+    if os.path.exists(report):
+        print(f"collapsed rows: {len(pd.read_csv(report))} (see {os.path.basename(report)})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--rows", type=int, default=120)
+    parser.add_argument("--dup-rate", type=float, default=0.1)
+    parser.add_argument("--threshold", type=float, default=dedup.DEFAULT_THRESHOLD)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    bench_index(args)
+    bench_pipeline(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Offline throughput of the shared model client at full concurrency.
+
+Usage: python benchmarks/bench_model_client.py --requests 2000 --latency 0.05 --concurrency 64
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_client import FakeBackend, ModelClient, agenerate_all  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    prompts = [f"Extract resume data as VALID JSON\nResume {i}" for i in range(args.requests)]
+
+    client = ModelClient(FakeBackend(args.latency, args.failure_rate))
+    started = time.perf_counter()
+    results = asyncio.run(agenerate_all(client, prompts, concurrency=args.concurrency))
+    elapsed = time.perf_counter() - started
+    errors = sum(isinstance(r, Exception) for r in results)
+    print(f"asyncio: {args.requests / elapsed:.0f} req/s ({elapsed:.2f}s, {errors} errors)")
+
+    client = ModelClient(FakeBackend(args.latency, args.failure_rate))
+
+    def call(prompt):
+        try:
+            return client.generate_content(prompt).text
+        except Exception as e:
+            return e
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(call, prompts))
+    elapsed = time.perf_counter() - started
+    errors = sum(isinstance(r, Exception) for r in results)
+    print(f"threads: {args.requests / elapsed:.0f} req/s ({elapsed:.2f}s, {errors} errors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""End-to-end offline benchmark of the bulk pipelines on synthetic PDFs and a fake model.
+
+Builds a sheet of synthetic PDF resumes and job descriptions, then runs
+each scenario (resume_bulk_analysis_3/4 process_resumes paths and
+utils.main) in a fresh process and working directory against
+model_client.FakeBackend with the given latency and failure rate. Reports
+throughput, p50/p99 latency per resume (from the telemetry events), peak
+RSS and LLM calls per resume.
+
+Every run is appended to a JSON-lines results file together with the git
+revision, and compared with the last stored run of the same scenario and
+parameters; changes beyond --tolerance are flagged as regressions.
+
+Usage: python benchmarks/bench_pipeline.py [--rows 200] [--latency 0.05] [--failure-rate 0]
+       [--workers 8] [--scenarios ats4-llm ats4-batch ...] [--results benchmarks/results/pipeline.jsonl]
+"""
+import argparse
+import contextlib
+import glob
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import job_description, make_pdf, resume_lines  # noqa: E402
+
+RESULTS_PATH = os.path.join(ROOT, "benchmarks", "results", "pipeline.jsonl")
+
+SCENARIOS = {
+    "ats3": ("resume_bulk_analysis_3", {}),
+    "ats4-llm": ("resume_bulk_analysis_4", {"scoring": "llm"}),
+    "ats4-local": ("resume_bulk_analysis_4", {"scoring": "local"}),
+    "ats4-tiered": ("resume_bulk_analysis_4", {"scoring": "tiered"}),
+    "ats4-batch": ("resume_bulk_analysis_4", {"scoring": "llm", "batch_size": 8}),
+    "ats4-tbatch": ("resume_bulk_analysis_4", {"scoring": "tiered", "batch_size": 8}),
+    "utils": ("utils", {}),
+}
+
+# Metric -> True when higher is better
+METRICS = {
+    "rows_per_s": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "peak_rss_mb": False,
+    "llm_calls_per_resume": False,
+}
+
+
+def build_inputs(directory, rows, distinct_jds=5, seed=0):
+    import pandas as pd
+
+    rng = random.Random(seed)
+    jds = [job_description(rng) for _ in range(distinct_jds)]
+    records = []
+    for i in range(rows):
+        path = os.path.join(directory, f"resume_{i}.pdf")
+        make_pdf(path, resume_lines(rng, f"Candidate {i}"))
+        records.append({"Applicant": f"Applicant {i}", "JobDescription": rng.choice(jds),
+                        "Resume": path, "Position": "Engineer"})
+    sheet = os.path.join(directory, "candidates.xlsx")
+    pd.DataFrame(records).to_excel(sheet, index=False)
+    return sheet
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def child(scenario, sheet, args):
+    import model_client
+    from bulk_runner import RateLimiter
+    from model_client import FakeBackend
+
+    module_name, options = SCENARIOS[scenario]
+    module = __import__(module_name)
+    backend = FakeBackend(args.latency, args.failure_rate, seed=args.seed)
+    output = os.path.abspath("results.xlsx")
+
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if module_name == "utils":
+            # utils.main has no backend/limiter parameters
+            model_client.configure(backend=backend, limiter=RateLimiter(rpm=10**9, tpm=10**12))
+            module.main(sheet, output)
+        else:
+            module.process_resumes(
+                sheet, output, workers=args.workers, rpm=10**9, tpm=10**12, backend=backend,
+                checkpoint=False, **options,
+            )
+    elapsed = time.perf_counter() - started
+
+    latencies, rows = [], 0
+    for path in glob.glob("*.events.jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                event = json.loads(line)
+                count = event.get("resumes", 1)
+                rows += count
+                # A batch event covers several resumes; each is charged the batch time
+                latencies += [event["seconds"]] * count
+    print(json.dumps({
+        "rows_per_s": round(args.rows / elapsed, 2),
+        "seconds": round(elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "llm_calls_per_resume": round(backend.calls / args.rows, 3),
+        "failed_calls": backend.failures,
+        "traced_resumes": rows,
+    }))
+
+
+def git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                             text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return out.stdout.strip() + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_previous(path):
+    previous = {}
+    if not os.path.exists(path):
+        return previous
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            previous[(entry["scenario"], json.dumps(entry["params"], sort_keys=True))] = entry
+    return previous
+
+
+def compare(entry, before, tolerance):
+    """Metrics that got worse than `before` by more than `tolerance` (a fraction)"""
+    regressions = []
+    for metric, higher_is_better in METRICS.items():
+        old, new = before["metrics"].get(metric), entry["metrics"].get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        if (change < -tolerance) if higher_is_better else (change > tolerance):
+            regressions.append(f"{metric} {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake model latency per call (s)")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--results", default=RESULTS_PATH, help="JSON-lines history of runs")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative change")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--child", choices=sorted(SCENARIOS))
+    parser.add_argument("--sheet")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.sheet, args)
+        return
+
+    params = {"rows": args.rows, "latency": args.latency, "failure_rate": args.failure_rate,
+              "workers": args.workers, "seed": args.seed}
+    previous = load_previous(args.results)
+    revision = git_revision()
+    entries, regressed = [], False
+    with tempfile.TemporaryDirectory() as directory:
+        sheet = build_inputs(directory, args.rows, seed=args.seed)
+        print(f"{args.rows} synthetic resumes, fake latency {args.latency}s, failure rate {args.failure_rate}")
+        print(f"{'scenario':<12} {'rows/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'peak MB':>8} {'calls/resume':>13}")
+        for scenario in args.scenarios:
+            # A fresh process and working directory per scenario, so neither
+            # peak RSS nor the on-disk caches are shared
+            workdir = os.path.join(directory, scenario)
+            os.makedirs(workdir)
+            command = [sys.executable, os.path.abspath(__file__), "--child", scenario, "--sheet", sheet,
+                       "--rows", str(args.rows), "--latency", str(args.latency),
+                       "--failure-rate", str(args.failure_rate), "--workers", str(args.workers),
+                       "--seed", str(args.seed)]
+            env = dict(os.environ, PYTHONPATH=ROOT)
+            out = subprocess.run(command, cwd=workdir, capture_output=True, text=True, env=env)
+            if out.returncode != 0:
+                print(f"{scenario:<12} failed: {out.stderr.strip().splitlines()[-1:]}")
+                continue
+            metrics = json.loads(out.stdout.strip().splitlines()[-1])
+            print(f"{scenario:<12} {metrics['rows_per_s']:>8.1f} {metrics['p50_ms']:>9.1f} {metrics['p99_ms']:>9.1f} "
+                  f"{metrics['peak_rss_mb']:>8.1f} {metrics['llm_calls_per_resume']:>13.2f}")
+            entry = {"scenario": scenario, "params": params, "revision": revision,
+                     "ts": time.strftime("%Y-%m-%dT%H:%M:%S"), "metrics": metrics}
+            before = previous.get((scenario, json.dumps(params, sort_keys=True)))
+            if before is not None:
+                regressions = compare(entry, before, args.tolerance)
+                if regressions:
+                    regressed = True
+                    print(f"  REGRESSION vs {before['revision']}: " + "; ".join(regressions))
+            entries.append(entry)
+
+    if not args.no_save and entries:
+        os.makedirs(os.path.dirname(args.results) or ".", exist_ok=True)
+        with open(args.results, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        print(f"results appended to {args.results}")
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Memory per 100k scored profiles, and re-rank/filter/export speed of the profile store.
+
+Compares three in-memory shapes of the same candidates: the result dicts
+analyze_resume() returns, profile_store.Profile __slots__ records, and
+ProfileColumns arrays. Then times loading, filtering, re-ranking and
+re-exporting from the SQLite store, none of which calls the model.
+
+Usage: python benchmarks/bench_profile_store.py [--profiles 100000] [--export out.csv]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from profile_store import Profile, ProfileStore
+from synthetic import POSITIONS, SKILLS
+
+
+def result(rng):
+    skills = rng.sample(SKILLS, rng.randint(4, 12))
+    return {
+        "Overall_Match": rng.randint(0, 100),
+        "Score_Breakdown": {"skills_match": rng.randint(0, 100), "education_match": rng.randint(0, 100),
+                            "experience_match": rng.randint(0, 100)},
+        "Strengths": skills[:2],
+        "Weaknesses": skills[2:3],
+        "Detailed_Analysis": "Synthetic analysis.",
+        "Stability_Score": rng.uniform(0, 100),
+        "Total_Experience": rng.uniform(0, 20),
+        "Companies_Count": rng.randint(0, 6),
+        "Skills": skills,
+        "Education": ["Bachelor's in Computer Science"],
+        "Relevant_Experience": [{"company": "Company 0", "position": rng.choice(POSITIONS),
+                                 "start": "01/2020", "end": "Present", "relevant": True}],
+    }
+
+
+def measure(label, n, build):
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = build()
+    seconds = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {size / 2**20:8.1f} MiB per {n} profiles ({size / n:6.0f} B each), built in {seconds:.2f}s")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--export", default=None, help="re-export the top 1000 to this .csv/.xlsx/.parquet")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    n = args.profiles
+    jd = "Synthetic job description"
+    rows = [{"Applicant": f"A{i}", "Position": rng.choice(POSITIONS), "Resume": f"r{i}.pdf", "JobDescription": jd}
+            for i in range(n)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ProfileStore(os.path.join(tmp, "profiles.sqlite"))
+        results = measure("analyze_resume() dicts", n, lambda: [result(rng) for _ in range(n)])
+
+        started = time.perf_counter()
+        for start in range(0, n, 5000):
+            store.put_many(zip(rows[start:start + 5000], results[start:start + 5000]))
+        print(f"store: {n} profiles written in {time.perf_counter() - started:.2f}s, "
+              f"{len(store.skill_ids)} interned skills")
+        del results
+
+        measure("Profile __slots__ records", n,
+                lambda: [store.get(profile_id) for profile_id in store.columns().profile_ids])
+        columns = measure("ProfileColumns", n, lambda: store.columns(jd))
+        assert isinstance(store.get(columns.profile_ids[0]), Profile)
+
+        started = time.perf_counter()
+        selected = columns.filter(min_experience=5, min_stability=50, skills=[SKILLS[0]])
+        filtered = time.perf_counter() - started
+        started = time.perf_counter()
+        ranked = columns.rank({"match": 1.0, "stability": 0.2, "total_experience": 1.0}, selected)
+        print(f"filter: {len(selected)} kept in {filtered * 1000:.1f} ms; "
+              f"re-rank in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        if args.export:
+            started = time.perf_counter()
+            store.export(args.export, columns, ranked[:1000])
+            print(f"export: {min(len(ranked), 1000)} rows to {args.export} in {time.perf_counter() - started:.2f}s")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
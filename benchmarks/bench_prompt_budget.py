@@ -0,0 +1,61 @@
+"""Average prompt input size with blind 10,000-character truncation vs preprocess budgeting.
+
+Usage: python benchmarks/bench_prompt_budget.py [--count 500] [--pages 4] [--resume-budget 2000]
+       python benchmarks/bench_prompt_budget.py --sheet cvs.xlsx
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preprocess import (JD_TOKEN_BUDGET, RESUME_TOKEN_BUDGET, count_tokens, prepare_job_description,
+                        prepare_resume)
+from synthetic import long_job_description, resume_text
+
+
+def report(label, texts, prepare):
+    started = time.perf_counter()
+    prepared = [prepare(text) for text in texts]
+    seconds = time.perf_counter() - started
+    before = [text[:10000] for text in texts]
+    for name, sample in (("truncated", before), ("budgeted", prepared)):
+        chars = sum(map(len, sample)) / len(sample)
+        tokens = sum(map(count_tokens, sample)) / len(sample)
+        print(f"{label:7} {name:10} avg chars {chars:8.0f}  avg tokens {tokens:7.0f}")
+    print(f"{label:7} preprocessing {seconds / len(texts) * 1000:.2f} ms per document")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--resume-budget", type=int, default=RESUME_TOKEN_BUDGET)
+    parser.add_argument("--jd-budget", type=int, default=JD_TOKEN_BUDGET)
+    parser.add_argument("--sheet", help="Input sheet; its Resume PDFs and JobDescription column are measured")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.sheet:
+        from pdf_extract import iter_extracted
+        from sheet_io import iter_input_rows
+
+        rows = list(iter_input_rows(args.sheet))
+        resumes = [text for _, text in iter_extracted([row["Resume"] for row in rows]) if text]
+        jds = [str(row["JobDescription"]) for row in rows]
+    else:
+        rng = random.Random(args.seed)
+        resumes = [resume_text(rng, f"Candidate {i}", args.pages) for i in range(args.count)]
+        jds = [long_job_description(rng) for _ in range(args.count)]
+
+    if resumes:
+        report("resume", resumes, partial(prepare_resume, budget=args.resume_budget))
+    if jds:
+        report("jd", jds, partial(prepare_job_description, budget=args.jd_budget))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Incremental re-scoring after a job description edit vs re-running the whole sheet.
+
+Analyzes a synthetic sheet against one job description into a
+profile_store, edits the JD (--edit), then compares rerunning
+resume_bulk_analysis_4.process_resumes on the edited sheet with
+rescore_resumes on the stored profiles: model calls, wall time and, with
+--scoring local (where the stored breakdown is the local one), how far the
+incrementally updated match is from the full re-run.
+
+The fake model's JD parser reads the skills and years from the JD text, so
+an edit changes exactly the requirements it touches.
+
+Usage: python benchmarks/bench_rescore.py [--rows 200] [--edit skill|experience|education|wording]
+       [--scoring llm|local] [--latency 0.0]
+"""
+import argparse
+import atexit
+import contextlib
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from model_client import FAKE_SKILLS, FakeBackend, fake_response  # noqa: E402
+from synthetic import make_pdf, resume_lines  # noqa: E402
+
+OLD_JD = ("We are hiring a Machine Learning Engineer. Requirements: Python, SQL, Docker, PyTorch, AWS. "
+          "At least 3 years of experience. Bachelor's degree in Computer Science.")
+
+EDITS = {
+    "skill": lambda jd: jd.replace("Docker", "Kubernetes"),
+    "experience": lambda jd: jd.replace("At least 3 years", "At least 5 years"),
+    "education": lambda jd: jd.replace("Bachelor's degree in Computer Science", "Master's degree in Statistics"),
+    "wording": lambda jd: jd.replace("We are hiring", "Join us as"),
+}
+
+
+def responder(prompt):
+    """fake_response, except that JD parsing reads the requirements from the JD text"""
+    if "required_skills" in prompt and "Requirements:" in prompt and '"match"' not in prompt:
+        skills = re.search(r"Requirements: ([^.]*)\.", prompt).group(1).split(", ")
+        years = int(re.search(r"At least (\d+) years", prompt).group(1))
+        degree = re.search(r"\. ((?:Bachelor|Master)[^.]*)\.", prompt).group(1)
+        return json.dumps({"required_skills": skills, "required_education": [degree], "min_experience": years,
+                           "relevant_titles": ["Machine Learning Engineer"]})
+    return fake_response(prompt)
+
+
+def build_sheet(directory, name, rows, job_desc, seed):
+    import pandas as pd
+
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        path = os.path.join(directory, f"resume_{i}.pdf")
+        if not os.path.exists(path):
+            make_pdf(path, resume_lines(rng, f"Candidate {i}"))
+        records.append({"Applicant": f"Applicant {i}", "JobDescription": job_desc, "Resume": path,
+                        "Position": "Engineer"})
+    sheet = os.path.join(directory, name)
+    pd.DataFrame(records).to_excel(sheet, index=False)
+    return sheet
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--edit", choices=sorted(EDITS), default="skill")
+    parser.add_argument("--scoring", choices=["llm", "local"], default="llm")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import pandas as pd
+
+    import resume_bulk_analysis_4
+    from profile_store import ProfileStore
+
+    assert set(FAKE_SKILLS) >= {"Docker", "Kubernetes"}
+    new_jd = EDITS[args.edit](OLD_JD)
+    directory = tempfile.mkdtemp()
+    # Registered first so it runs last, after the caches' own atexit saves
+    atexit.register(shutil.rmtree, directory, True)
+    os.chdir(directory)
+    store = ProfileStore(os.path.join(directory, "profiles.sqlite"))
+    old_sheet = build_sheet(directory, "old_jd.xlsx", args.rows, OLD_JD, args.seed)
+    new_sheet = build_sheet(directory, "new_jd.xlsx", args.rows, new_jd, args.seed)
+
+    def run(label, fn):
+        backend = FakeBackend(args.latency, seed=args.seed, responder=responder)
+        started = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            fn(backend)
+        elapsed = time.perf_counter() - started
+        print(f"{label:<28} {backend.calls:>8} {elapsed:>9.2f}")
+
+    print(f"{args.rows} candidates, edit '{args.edit}', stored scoring {args.scoring}")
+    print(f"{'run':<28} {'calls':>8} {'seconds':>9}")
+    common = dict(rpm=10**9, tpm=10**12, checkpoint=False, events=False, scoring=args.scoring)
+    run("initial analysis", lambda backend: resume_bulk_analysis_4.process_resumes(
+        old_sheet, "old.xlsx", backend=backend, profiles=store, **common))
+    run("full re-run (warm caches)", lambda backend: resume_bulk_analysis_4.process_resumes(
+        new_sheet, "full.xlsx", backend=backend, **common))
+    run("incremental rescore", lambda backend: resume_bulk_analysis_4.rescore_resumes(
+        OLD_JD, new_jd, "incremental.xlsx", store, rpm=10**9, tpm=10**12, backend=backend,
+        explain=args.scoring == "llm"))
+
+    if args.scoring == "local":
+        full = pd.read_excel("full.xlsx").set_index("Applicant")["Match_Percentage"]
+        incremental = pd.read_excel("incremental.xlsx").set_index("Applicant")["Match_Percentage"]
+        gap = (full - incremental.reindex(full.index)).abs()
+        print(f"match vs full re-run: mean abs diff {gap.mean():.2f}, max {gap.max():.2f} points")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
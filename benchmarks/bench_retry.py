@@ -0,0 +1,137 @@
+"""Fault-injection harness for retry.Retrier vs the old per-call retry loops.
+
+Runs the same prompts through a FakeBackend that injects rate-limit,
+server, timeout and garbled-answer faults, once with the per-call loops
+the ats modules used before (fixed exponential sleeps, no shared state)
+and once through retry.Retrier (per-class policies, decorrelated jitter,
+retry budget, shared circuit breaker), threaded and with asyncio. All
+waits are multiplied by --scale so a run takes seconds; rerun with a high
+--rate-limit to see the budget and breaker cap the extra load.
+
+Usage: python benchmarks/bench_retry.py [--calls 400] [--workers 8] [--rate-limit 0.1] [--server 0.05]
+       [--timeout 0.02] [--invalid 0.05] [--scale 0.01]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import retry  # noqa: E402
+import structured_output  # noqa: E402
+from bulk_runner import run_bulk  # noqa: E402
+from model_client import FakeBackend, ModelClient  # noqa: E402
+
+SCHEMA = structured_output.SCORE
+
+
+def prompts(count):
+    return [f'Return "match" and "stability" for candidate {i}' for i in range(count)]
+
+
+def legacy_call(client, prompt, scale):
+    """get_match_percentage's loop before retry.Retrier"""
+    for attempt in range(5):
+        try:
+            response = client.generate_content(prompt)
+            data = structured_output.parse(response.text, SCHEMA)
+            if data is not None:
+                return data
+        except Exception:
+            time.sleep(min(2**attempt + 5, 60) * scale)
+    return None
+
+
+def scaled_retrier(scale, seed):
+    policies = {name: retry.RetryPolicy(policy.attempts, policy.base * scale, policy.cap * scale)
+                for name, policy in retry.DEFAULT_POLICIES.items()}
+    breaker = retry.CircuitBreaker(cooldown=2.0 * scale, max_cooldown=60.0 * scale)
+    return retry.Retrier(policies=policies, budget=retry.RetryBudget(min_per_second=0.1 / scale),
+                         breaker=breaker, seed=seed)
+
+
+def engine_call(retrier, client, prompt):
+    def attempt():
+        data = structured_output.parse(client.generate_content(prompt).text, SCHEMA)
+        if data is None:
+            raise retry.InvalidAnswer("bad answer")
+        return data
+
+    try:
+        return retrier.call(attempt)
+    except Exception:
+        return None
+
+
+async def engine_acall(retrier, client, prompt, semaphore):
+    async def attempt():
+        data = structured_output.parse((await client.agenerate_content(prompt)).text, SCHEMA)
+        if data is None:
+            raise retry.InvalidAnswer("bad answer")
+        return data
+
+    async with semaphore:
+        try:
+            return await retrier.acall(attempt)
+        except Exception:
+            return None
+
+
+def report(name, backend, results, elapsed, extra=""):
+    ok = sum(result is not None for result in results)
+    print(f"{name:<16} {ok / len(results):>8.1%} {backend.calls / max(ok, 1):>11.2f} {elapsed:>9.2f} "
+          f"{json.dumps(backend.injected, sort_keys=True)} {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--rate-limit", type=float, default=0.1)
+    parser.add_argument("--server", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=0.02)
+    parser.add_argument("--invalid", type=float, default=0.05)
+    parser.add_argument("--scale", type=float, default=0.01, help="multiplier for every wait")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    faults = {"rate_limit": args.rate_limit, "server": args.server, "timeout": args.timeout,
+              "invalid": args.invalid}
+    items = prompts(args.calls)
+    print(f"{args.calls} calls, {args.workers} workers, faults {faults}, waits x{args.scale}")
+    print(f"{'mode':<16} {'success':>8} {'calls/ok':>11} {'elapsed':>9} injected")
+
+    backend = FakeBackend(args.latency, seed=args.seed, faults=faults)
+    client = ModelClient(backend)
+    started = time.perf_counter()
+    results = run_bulk(items, lambda prompt: legacy_call(client, prompt, args.scale), workers=args.workers)
+    report("legacy loops", backend, results, time.perf_counter() - started)
+
+    backend = FakeBackend(args.latency, seed=args.seed, faults=faults)
+    client = ModelClient(backend)
+    retrier = scaled_retrier(args.scale, args.seed)
+    started = time.perf_counter()
+    results = run_bulk(items, lambda prompt: engine_call(retrier, client, prompt), workers=args.workers)
+    report("retrier threads", backend, results, time.perf_counter() - started)
+    print(f"  {retrier.stats()}")
+
+    backend = FakeBackend(args.latency, seed=args.seed, faults=faults)
+    client = ModelClient(backend)
+    retrier = scaled_retrier(args.scale, args.seed)
+
+    async def run_async():
+        semaphore = asyncio.Semaphore(args.workers)
+        return await asyncio.gather(*(engine_acall(retrier, client, prompt, semaphore) for prompt in items))
+
+    started = time.perf_counter()
+    results = asyncio.run(run_async())
+    report("retrier asyncio", backend, results, time.perf_counter() - started)
+    print(f"  {retrier.stats()}")
+
+
+if __name__ == "__main__":
+    main()
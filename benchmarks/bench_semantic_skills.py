@@ -0,0 +1,122 @@
+"""Exact vs semantic (hashed n-gram vector) skill matching for many resumes against one JD.
+
+First checks --threshold against known pairs: every VARIANT_PAIRS entry
+must match and no NEGATIVE_PAIRS entry may (exit 1 otherwise), so a
+threshold change can be judged before it ships.
+
+Usage: python benchmarks/bench_semantic_skills.py [--resumes 10000] [--threshold 0.85]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Spelling variants an LLM extraction produces for the same skill
+VARIANTS = {
+    "Python": ["Python", "Python 3", "python3", "Python (Django)"],
+    "React": ["React", "ReactJS", "React.js", "React Hooks"],
+    "Selenium": ["Selenium", "Selenium WebDriver", "selenium-webdriver"],
+    "PostgreSQL": ["PostgreSQL", "Postgres", "Postgres SQL"],
+    "TensorFlow": ["TensorFlow", "TensorFlow 2", "tensorflow2"],
+    "Machine Learning": ["Machine Learning", "ML", "machine-learning"],
+    "Docker": ["Docker", "Docker Compose", "docker containers"],
+    "Kubernetes": ["Kubernetes", "K8s", "kubernetes cluster"],
+    "REST APIs": ["REST APIs", "RESTful API", "REST API design"],
+    "Data Analysis": ["Data Analysis", "Data Analytics", "data analyses"],
+    "Java": ["Java", "Java 8", "Core Java"],
+    "JavaScript": ["JavaScript", "Javascript ES6", "JS"],
+}
+
+# (job skill, resume skill) pairs that name the same skill
+VARIANT_PAIRS = [
+    ("Python", "Python 3"),
+    ("React", "React.js"),
+    ("PostgreSQL", "Postgres SQL"),
+    ("TensorFlow", "TensorFlow 2"),
+    ("TensorFlow", "tensorflow2"),
+    ("Machine Learning", "machine-learning"),
+    ("Java", "Java 8"),
+    ("JavaScript", "Javascript ES6"),
+]
+
+# Related but different skills that must not count as a match
+NEGATIVE_PAIRS = [
+    ("Machine Learning", "ML Ops"),
+    ("Machine Learning", "Deep Learning"),
+    ("React", "React Native"),
+    ("Angular", "AngularJS"),
+    ("Java", "JavaScript"),
+    ("SQL", "NoSQL"),
+    ("SQL", "SQL Server"),
+    ("Spring", "Spring Boot"),
+    ("Microsoft Excel", "Microsoft Word"),
+    ("Project Management", "Product Management"),
+    ("Data Analysis", "Data Engineering"),
+    ("Visual Studio", "Visual Basic"),
+    ("Power BI", "Power Apps"),
+]
+
+
+def check_pairs(threshold):
+    """Print every known pair's similarity and return False if one is misjudged"""
+    from skill_vectors import same_skill, similarity
+
+    ok = True
+    for expected, pairs in ((True, VARIANT_PAIRS), (False, NEGATIVE_PAIRS)):
+        for job_skill, resume_skill in pairs:
+            matched = same_skill(job_skill, resume_skill, threshold)
+            ok &= matched == expected
+            print(f"{'ok  ' if matched == expected else 'FAIL'} {similarity(job_skill, resume_skill):.2f} "
+                  f"{'match   ' if matched else 'no match'} {job_skill!r} / {resume_skill!r}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="similarity threshold to try (default: ATS_SKILL_SIMILARITY or 0.8)")
+    args = parser.parse_args()
+    if args.threshold is not None:
+        os.environ["ATS_SKILL_SIMILARITY"] = str(args.threshold)
+
+    rng = random.Random(args.seed)
+    job_reqs = {"required_skills": rng.sample(sorted(VARIANTS), 6), "min_experience": 3}
+    resumes = [
+        {"skills": [rng.choice(VARIANTS[skill]) for skill in rng.sample(sorted(VARIANTS), rng.randint(3, 8))],
+         "total_experience": rng.uniform(0, 10)}
+        for _ in range(args.resumes)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["ATS_SKILL_INDEX"] = os.path.join(tmp, "skill_vectors")
+        from scoring import JobScorer
+        from skill_vectors import DEFAULT_THRESHOLD
+
+        print(f"known pairs at threshold {DEFAULT_THRESHOLD}")
+        if not check_pairs(DEFAULT_THRESHOLD):
+            sys.exit(1)
+
+        started = time.perf_counter()
+        exact = JobScorer(job_reqs).score_batch(resumes)["skills_match"]
+        exact_seconds = time.perf_counter() - started
+
+        timings = []
+        for _ in range(2):
+            started = time.perf_counter()
+            semantic = JobScorer(job_reqs, semantic=True).score_batch(resumes)["skills_match"]
+            timings.append(time.perf_counter() - started)
+
+    print(f"{args.resumes} resumes vs {job_reqs['required_skills']}")
+    print(f"exact      {exact_seconds:.3f}s  mean skills match {exact.mean():.1f}%")
+    print(f"semantic   {timings[0]:.3f}s (cold)  {timings[1]:.3f}s (warm)  mean skills match {semantic.mean():.1f}%")
+    print(f"resumes with a higher skills match: {(semantic > exact).sum()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Load test of the local HTTP scoring service against the fake model.
+
+Starts scoring_service on a free local port with a FakeBackend, registers
+one job description and sends --requests scoring requests from
+--concurrency keep-alive client threads. A --hot-rate share of requests
+re-sends one of a few "hot" resumes, so identical requests overlap and
+are coalesced. Reports throughput, p50/p99 latency of successful
+requests, responses by status (429 = queue full) and the model calls made.
+
+Usage: python benchmarks/bench_service.py [--requests 400] [--concurrency 32] [--workers 8]
+       [--queue 16] [--hot-rate 0.3] [--latency 0.05] [--pdf]
+"""
+import argparse
+import atexit
+import http.client
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from model_client import FakeBackend  # noqa: E402
+from synthetic import job_description, make_pdf, resume_lines  # noqa: E402
+
+
+def uploads(args, directory):
+    """[(body, content type)] for --resumes distinct resumes"""
+    rng = random.Random(args.seed)
+    bodies = []
+    for i in range(args.resumes):
+        lines = resume_lines(rng, f"Candidate {i}")
+        if args.pdf:
+            path = os.path.join(directory, f"resume_{i}.pdf")
+            make_pdf(path, lines)
+            with open(path, "rb") as f:
+                bodies.append((f.read(), "application/pdf"))
+        else:
+            bodies.append(("\n".join(lines).encode("utf-8"), "text/plain; charset=utf-8"))
+    return bodies
+
+
+def request(conn, method, path, body=None, content_type="application/json"):
+    conn.request(method, path, body=body, headers={"Content-Type": content_type})
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--queue", type=int, default=16)
+    parser.add_argument("--resumes", type=int, default=300)
+    parser.add_argument("--hot-rate", type=float, default=0.3)
+    parser.add_argument("--scoring", choices=["llm", "local", "tiered"], default="llm")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--pdf", action="store_true", help="upload PDFs instead of extracted text")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import scoring_service
+
+    directory = tempfile.mkdtemp()
+    # Registered first so it runs last, after the caches' own atexit saves
+    atexit.register(shutil.rmtree, directory, True)
+    os.chdir(directory)
+    bodies = uploads(args, directory)
+
+    backend = FakeBackend(args.latency, seed=args.seed)
+    service = scoring_service.ScoringService(
+        workers=args.workers, queue_size=args.queue, scoring=args.scoring,
+        rpm=10**9, tpm=10**12, backend=backend,
+    )
+    server = scoring_service.make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    jd = job_description(random.Random(args.seed))
+    status, payload = request(conn, "POST", "/jobs", json.dumps({"job_description": jd}))
+    assert status == 201, payload
+    job_id = payload["job_id"]
+    conn.close()
+
+    rng = random.Random(args.seed)
+    hot = bodies[:4]
+    plan = [rng.choice(hot) if rng.random() < args.hot_rate else bodies[i % len(bodies)]
+            for i in range(args.requests)]
+    statuses, latencies, coalesced = Counter(), [], Counter()
+    lock = threading.Lock()
+    cursor = iter(enumerate(plan))
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+        while True:
+            with lock:
+                item = next(cursor, None)
+            if item is None:
+                break
+            body, content_type = item[1]
+            started = time.perf_counter()
+            status, payload = request(conn, "POST", f"/score?job={job_id}", body, content_type)
+            elapsed = time.perf_counter() - started
+            with lock:
+                statuses[status] += 1
+                if status == 200:
+                    latencies.append(elapsed)
+                    coalesced[payload["coalesced"]] += 1
+        conn.close()
+
+    started = time.perf_counter()
+    clients = [threading.Thread(target=client) for _ in range(args.concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+    latencies.sort()
+
+    def percentile(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+
+    stats = service.stats()
+    print(f"{args.requests} requests, {args.concurrency} clients, {args.workers} workers + {args.queue} queued, "
+          f"hot rate {args.hot_rate}, {'PDF' if args.pdf else 'text'} uploads, fake latency {args.latency}s")
+    print(f"throughput: {statuses[200] / elapsed:.1f} scored/s over {elapsed:.2f} s")
+    print(f"latency (200s): p50 {percentile(0.5):.1f} ms, p99 {percentile(0.99):.1f} ms, "
+          f"max {percentile(1.0):.1f} ms")
+    print(f"responses: {dict(sorted(statuses.items()))}")
+    print(f"coalesced: {coalesced[True]} of {statuses[200]} successful requests "
+          f"({stats['analyses']} analyses run)")
+    print(f"model calls: {backend.calls}")
+
+
+if __name__ == "__main__":
+    main()
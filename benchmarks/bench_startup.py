@@ -0,0 +1,61 @@
+"""Import-time budget for the pipeline modules.
+
+Each module is imported in a fresh interpreter without GOOGLE_API_KEY. The
+run fails (exit 1) when the median import time exceeds the budget or when a
+heavy dependency is loaded eagerly.
+
+Usage: python benchmarks/bench_startup.py --budget-ms 100
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = ["ats_func_3", "ats_func_4", "utils", "resume_bulk_analysis_3", "resume_bulk_analysis_4"]
+HEAVY = ["google.generativeai", "pdfplumber", "pandas", "numpy", "dateutil", "dotenv", "openpyxl", "asyncio"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module, repeats):
+    env = {k: v for k, v in os.environ.items() if k != "GOOGLE_API_KEY"}
+    timings, heavy = [], []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        timings.append(result["ms"])
+        heavy = result["heavy"]
+    return statistics.median(timings), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        ms, heavy = measure(module, args.repeats)
+        ok = ms <= args.budget_ms and not heavy
+        failed |= not ok
+        loaded = f"  eagerly loaded: {', '.join(heavy)}" if heavy else ""
+        print(f"{'ok  ' if ok else 'FAIL'} {module:<24} {ms:7.1f} ms{loaded}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Peak RSS of process_resumes in in-memory vs streaming mode on a large synthetic sheet.
+
+Usage: python benchmarks/bench_streaming_io.py --rows 50000
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from model_client import FakeBackend  # noqa: E402
+from synthetic import job_description, make_pdf, resume_lines  # noqa: E402
+
+
+def build_inputs(directory, rows, distinct_pdfs=20):
+    rng = random.Random(0)
+    pdfs = []
+    for i in range(distinct_pdfs):
+        path = os.path.join(directory, f"resume_{i}.pdf")
+        make_pdf(path, resume_lines(rng, f"Candidate {i}"))
+        pdfs.append(path)
+    jds = [job_description(rng) for _ in range(5)]
+    sheet = os.path.join(directory, "candidates.csv")
+    with open(sheet, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Applicant", "JobDescription", "Resume", "Position"])
+        for i in range(rows):
+            writer.writerow([f"Applicant {i}", rng.choice(jds), pdfs[i % len(pdfs)], "Engineer"])
+    return sheet
+
+
+def child(mode, sheet, directory):
+    import contextlib
+
+    import resume_bulk_analysis_4
+
+    if mode == "in-memory":
+        import pandas as pd
+        xlsx = os.path.join(directory, "candidates.xlsx")
+        if not os.path.exists(xlsx):
+            pd.read_csv(sheet).to_excel(xlsx, index=False)
+        sheet, output = xlsx, os.path.join(directory, "results.xlsx")
+    else:
+        output = os.path.join(directory, "results.csv")
+
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        resume_bulk_analysis_4.process_resumes(
+            sheet, output, workers=8, rpm=10**9, tpm=10**12, backend=FakeBackend(),
+            scoring="local", checkpoint=False, streaming=(mode == "streaming"),
+        )
+    elapsed = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"mode": mode, "seconds": round(elapsed, 2), "peak_rss_mb": round(peak_kb / 1024, 1)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--child", choices=["in-memory", "streaming"])
+    parser.add_argument("--sheet")
+    parser.add_argument("--dir")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.sheet, args.dir)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        sheet = build_inputs(directory, args.rows)
+        print(f"rows: {args.rows}")
+        for mode in ("in-memory", "streaming"):
+            # Each mode runs in a fresh process and working directory so
+            # neither peak RSS nor the on-disk caches are shared
+            workdir = os.path.join(directory, mode)
+            os.makedirs(workdir)
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--sheet", sheet, "--dir", workdir],
+                cwd=workdir, capture_output=True, text=True, check=True,
+            )
+            print(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    main()
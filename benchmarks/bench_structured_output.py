@@ -0,0 +1,125 @@
+"""Recovery rate and parse time of structured_output vs the old safe_json_parse.
+
+Generates fake-backend answers for the resume, job and score prompts and
+damages a share of them the way real model output goes wrong (prose and
+code fences around the JSON, trailing commas, single quotes, Python
+literals, percentages as strings, truncation). An answer the old parser
+cannot use costs another model call; the new parser repairs it locally.
+
+Usage: python benchmarks/bench_structured_output.py [--answers 20000] [--defect-rate 0.3]
+"""
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import structured_output  # noqa: E402
+from model_client import fake_response  # noqa: E402
+
+PROMPTS = {
+    "resume": ("Extract resume data as VALID JSON\nResume {i}", structured_output.RESUME,
+               ["skills", "education", "experience"]),
+    "job": ('"required_skills" job {i}', structured_output.JOB,
+            ["required_skills", "required_education", "min_experience"]),
+    "score": ('"match" score {i}', structured_output.SCORE, ["match", "stability"]),
+}
+
+
+def legacy_parse(response_text):
+    """safe_json_parse as it was before structured_output"""
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        try:
+            json_match = re.search(r"```json\n(.*?)\n```", response_text, re.DOTALL)
+            if json_match:
+                return json.loads(json_match.group(1))
+        except Exception:
+            try:
+                json_str = re.search(r"\{.*\}", response_text, re.DOTALL)
+                if json_str:
+                    return json.loads(json_str.group())
+            except Exception:
+                return {}
+    return {}
+
+
+def legacy_ok(data, keys):
+    try:
+        if keys[0] == "match":
+            int(data["match"]), int(data["stability"])
+        return all(k in data for k in keys)
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def damage(rng, answer):
+    defect = rng.choice(["prose", "fence", "trailing_comma", "single_quotes", "python_literals",
+                         "string_percent", "truncated"])
+    if defect == "prose":
+        return defect, f"Sure! Here is the analysis you asked for:\n{answer}\nLet me know if you need more."
+    if defect == "fence":
+        return defect, f"```json\n{answer}\n```\nNotes: scores are estimates {{approximate}}."
+    if defect == "trailing_comma":
+        return defect, re.sub(r"([\]}\"\d])(\s*[}\]])", r"\1,\2", answer, count=2)
+    if defect == "single_quotes":
+        return defect, answer.replace("'", "").replace('"', "'")
+    if defect == "python_literals":
+        return defect, answer.replace("true", "True").replace("false", "False")
+    if defect == "string_percent":
+        return defect, re.sub(r'"(match|stability)": (\d+)', r'"\1": "\2%"', answer)
+    return defect, answer[: int(len(answer) * 0.8)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--answers", type=int, default=20000)
+    parser.add_argument("--defect-rate", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = []
+    for i in range(args.answers):
+        kind = rng.choice(sorted(PROMPTS))
+        template, schema, keys = PROMPTS[kind]
+        answer = fake_response(template.format(i=i))
+        defect = "clean"
+        if rng.random() < args.defect_rate:
+            defect, answer = damage(rng, answer)
+        corpus.append((kind, defect, answer, schema, keys))
+
+    legacy, legacy_s, new, new_s = [], {}, [], {}
+    structured_output.reset_stats()
+    for _, defect, answer, schema, keys in corpus:
+        kind = "clean" if defect == "clean" else "damaged"
+        started = time.perf_counter()
+        legacy.append(legacy_ok(legacy_parse(answer), keys))
+        legacy_s[kind] = legacy_s.get(kind, 0.0) + time.perf_counter() - started
+        started = time.perf_counter()
+        new.append(structured_output.parse(answer, schema) is not None)
+        new_s[kind] = new_s.get(kind, 0.0) + time.perf_counter() - started
+
+    print(f"{len(corpus)} answers, defect rate {args.defect_rate}")
+    print(f"{'defect':<18} {'count':>7} {'legacy ok':>10} {'new ok':>8}")
+    for defect in sorted({entry[1] for entry in corpus}):
+        rows = [i for i, entry in enumerate(corpus) if entry[1] == defect]
+        print(f"{defect:<18} {len(rows):>7} {sum(legacy[i] for i in rows) / len(rows):>10.1%} "
+              f"{sum(new[i] for i in rows) / len(rows):>8.1%}")
+    saved = sum(n and not o for n, o in zip(new, legacy))
+    print(f"model calls saved (recovered locally): {saved} ({saved / len(corpus):.1%} of answers)")
+    print(f"parse time: legacy {sum(legacy_s.values()) / len(corpus) * 1e6:.1f} us, "
+          f"new {sum(new_s.values()) / len(corpus) * 1e6:.1f} us per answer")
+    for kind in sorted(new_s):
+        count = sum(1 for entry in corpus if (entry[1] == "clean") == (kind == "clean"))
+        print(f"  {kind:<8} legacy {legacy_s[kind] / count * 1e6:.1f} us, new {new_s[kind] / count * 1e6:.1f} us")
+    print(json.dumps(structured_output.stats(), indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Build, query and update latency of the BM25 talent index on a synthetic pool.
+
+Usage: python benchmarks/bench_talent_index.py [--profiles 100000] [--queries 200] [--k 50]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic import POSITIONS, SKILLS
+from talent_index import TalentIndex
+
+EXTRA_SKILLS = [f"{stem} {suffix}" for stem in ("Spark", "Airflow", "Kafka", "Terraform", "Go", "Rust", "Vue",
+                                                 "Angular", "Excel", "Tableau", "Power BI", "Linux")
+                for suffix in ("", "Admin", "Development", "Automation")]
+DEGREES = ["Bachelor's in Computer Science", "Master of Science in Data Science", "B.Tech Information Technology",
+           "MBA", "PhD in Machine Learning"]
+
+
+def profile(rng):
+    vocabulary = SKILLS + EXTRA_SKILLS
+    return {
+        "skills": rng.sample(vocabulary, rng.randint(4, 15)),
+        "education": [rng.choice(DEGREES)],
+        "experience": [{"position": rng.choice(POSITIONS)} for _ in range(rng.randint(1, 4))],
+    }
+
+
+def job(rng):
+    return {
+        "required_skills": rng.sample(SKILLS + EXTRA_SKILLS, rng.randint(4, 8)),
+        "required_education": [rng.choice(DEGREES)],
+        "relevant_titles": rng.sample(POSITIONS, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    profiles = [profile(rng) for _ in range(args.profiles)]
+    index = TalentIndex()
+    started = time.perf_counter()
+    index.add_many(enumerate(profiles))
+    print(f"build: {args.profiles} profiles in {time.perf_counter() - started:.2f}s")
+
+    jobs = [job(rng) for _ in range(args.queries)]
+    index.search(jobs[0], args.k)
+    latencies = []
+    for job_reqs in jobs:
+        started = time.perf_counter()
+        index.search(job_reqs, args.k)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    print(f"search top-{args.k}: p50 {statistics.median(latencies):.2f} ms  "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1]:.2f} ms")
+
+    started = time.perf_counter()
+    for i in range(1000):
+        index.remove(i)
+        index.add(f"new-{i}", profile(rng))
+    print(f"update: {(time.perf_counter() - started) * 1000 / 1000:.3f} ms per remove+add (1000 pairs)")
+    started = time.perf_counter()
+    index.search(jobs[0], args.k)
+    print(f"first search after updates: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
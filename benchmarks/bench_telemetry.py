@@ -0,0 +1,60 @@
+"""Overhead of telemetry per analyzed resume, with and without the JSON-lines event file.
+
+Each simulated resume opens a trace with the stages and counters that
+ats_func_4.analyze_resume records; the stages themselves do no work.
+
+Usage: python benchmarks/bench_telemetry.py [--resumes 100000] [--threads 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telemetry import Telemetry  # noqa: E402
+
+STAGES = ["extraction", "post_processing", "scoring", "post_processing"]
+COUNTERS = ["extraction_cache_misses", "model_calls", "model_s", "limiter_wait_s", "prompt_chars",
+            "response_chars", "model_calls", "model_s", "limiter_wait_s", "prompt_chars", "response_chars"]
+
+
+def resume(recorder, i):
+    with recorder.trace(kind="resume", resume=f"r{i}.pdf", scoring="llm"):
+        for name in STAGES:
+            with recorder.stage(name):
+                pass
+        for name in COUNTERS:
+            recorder.add(name, 1)
+
+
+def run(recorder, n, threads):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda i: resume(recorder, i), range(n)))
+    elapsed = time.perf_counter() - started
+    recorder.close()
+    return elapsed / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=100_000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    baseline = run(Telemetry(enabled=False), args.resumes, args.threads)
+    summary_only = run(Telemetry(), args.resumes, args.threads)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "events.jsonl")
+        with_events = run(Telemetry(path), args.resumes, args.threads)
+        size = os.path.getsize(path)
+    print(f"disabled:        {baseline:6.1f} us per resume")
+    print(f"summary only:    {summary_only:6.1f} us per resume")
+    print(f"summary + JSONL: {with_events:6.1f} us per resume ({size / args.resumes:.0f} B per event)")
+
+
+if __name__ == "__main__":
+    main()
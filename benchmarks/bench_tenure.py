@@ -0,0 +1,77 @@
+"""Per-candidate vs vectorized experience and stability computation.
+
+Usage: python benchmarks/bench_tenure.py [--positions 100000] [--per-candidate 4]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ats_func_4
+import dates
+
+DATE_SHAPES = ["{m:02d}/{y}", "{y}/{m:02d}", "{b} {y}", "{B} {y}", "{y}"]
+
+
+def format_date(rng, value):
+    return rng.choice(DATE_SHAPES).format(m=value.month, y=value.year, b=value.strftime("%b"), B=value.strftime("%B"))
+
+
+def random_position(rng):
+    start, end = sorted(datetime(rng.randint(1995, 2025), rng.randint(1, 12), 1) for _ in range(2))
+    start, end = format_date(rng, start), "Present" if rng.random() < 0.15 else format_date(rng, end)
+    if rng.random() < 0.05:
+        # Some extractions come back with the dates swapped
+        start, end = end, start
+    return {"start": start, "end": end, "relevant": rng.random() < 0.8}
+
+
+def experience_lists(rng, positions, per_candidate):
+    lists, remaining = [], positions
+    while remaining > 0:
+        count = min(remaining, rng.randint(1, 2 * per_candidate - 1))
+        lists.append([random_position(rng) for _ in range(count)])
+        remaining -= count
+    return lists
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--positions", type=int, default=100_000)
+    parser.add_argument("--per-candidate", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    lists = experience_lists(random.Random(args.seed), args.positions, args.per_candidate)
+    print(f"{args.positions} positions, {len(lists)} candidates")
+
+    # One reference date for "Present" on both paths
+    with dates.pinned() as now:
+        experience_seconds, loop_experience = timed(lambda: [ats_func_4.calculate_experience(e) for e in lists])
+        stability_seconds, loop_stability = timed(lambda: [ats_func_4.calculate_stability(e) for e in lists])
+    loop_total = experience_seconds + stability_seconds
+
+    experience_seconds, batch_experience = timed(ats_func_4.calculate_experience_batch, lists, now)
+    stability_seconds, batch_stability = timed(ats_func_4.calculate_stability_batch, lists, now)
+    batch_total = experience_seconds + stability_seconds
+
+    for label, seconds in (("per-candidate", loop_total), ("vectorized", batch_total)):
+        print(f"{label:14} {seconds:7.3f}s  {args.positions / seconds:12,.0f} positions/s")
+    print(f"speedup: {loop_total / batch_total:.1f}x")
+    mismatches = sum(a != b for a, b in zip(loop_experience, batch_experience))
+    mismatches += sum(a != b for a, b in zip(loop_stability, batch_stability))
+    print(f"mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
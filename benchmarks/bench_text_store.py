@@ -0,0 +1,54 @@
+"""Cold vs warm PDF extraction timings with the persistent text store.
+
+Usage: python benchmarks/bench_text_store.py resume1.pdf resume2.pdf ...
+       python benchmarks/bench_text_store.py --sheet cvs.xlsx
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_extract import iter_extracted
+from text_store import TextStore
+
+
+def timed_pass(paths, store, workers):
+    started = time.perf_counter()
+    extracted = sum(1 for _, text in iter_extracted(paths, workers=workers, store=store) if text)
+    return time.perf_counter() - started, extracted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="*")
+    parser.add_argument("--sheet", help="Excel file with a Resume column of PDF paths")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    paths = list(args.pdfs)
+    if args.sheet:
+        import pandas as pd
+        paths += list(pd.read_excel(args.sheet)["Resume"])
+    if not paths:
+        parser.error("no PDFs given")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TextStore(os.path.join(tmp, "pdf_text.sqlite"))
+        cold, extracted = timed_pass(paths, store, args.workers)
+        cold_stats = store.stats()
+        warm, _ = timed_pass(paths, store, args.workers)
+        warm_stats = store.stats()
+        store.close()
+
+    print(f"files: {len(paths)} (extracted {extracted})")
+    print(f"cold: {cold:.3f}s  {cold_stats}")
+    print(f"warm: {warm:.3f}s  hits={warm_stats['hits'] - cold_stats['hits']}")
+    if warm > 0:
+        print(f"speedup: {cold / warm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
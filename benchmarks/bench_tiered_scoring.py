@@ -0,0 +1,104 @@
+"""LLM calls saved by tiered scoring, and how closely its ranking agrees with full LLM scoring.
+
+Replays tiered.TieredScorer over a labelled sample: candidates whose full
+LLM match score is known. With --store the sample is a profile_store
+filled by a scoring="llm" run, re-scored locally against the job
+requirements saved in the JobRegistry file; without it, a synthetic pool
+whose "LLM" score is the local score plus noise. No model calls are made.
+
+Usage: python benchmarks/bench_tiered_scoring.py [--store .ats_cache/profiles.sqlite]
+       [--candidates 5000] [--noise 15] [--band 40 75] [--top-n 10]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from scoring import ATS_WEIGHTS, JobScorer  # noqa: E402
+from synthetic import POSITIONS, SKILLS  # noqa: E402
+from tiered import DEFAULT_BAND, DEFAULT_TOP_N, replay  # noqa: E402
+
+BANDS = [(50.0, 70.0), DEFAULT_BAND, (30.0, 85.0)]
+
+
+def synthetic_sample(rng, n, noise):
+    job_reqs = {
+        "required_skills": rng.sample(SKILLS, 5),
+        "required_education": ["Bachelor's in Computer Science"],
+        "min_experience": rng.randint(1, 5),
+    }
+    resumes = [{
+        "skills": rng.sample(SKILLS, rng.randint(2, 10)),
+        "education": [rng.choice(["Bachelor's in Computer Science", "Diploma in Arts"])],
+        "total_experience": rng.uniform(0, 8),
+        "experience": [{"position": rng.choice(POSITIONS)}],
+    } for _ in range(n)]
+    local = JobScorer(job_reqs, weights=ATS_WEIGHTS, semantic=True).score_batch(resumes)["match"]
+    llm = np.clip(local + np.asarray([rng.gauss(0, noise) for _ in range(n)]), 0, 100)
+    return [("synthetic", local, llm)]
+
+
+def store_samples(path, registry_path):
+    import ats_func_4
+    from jd_registry import REGISTRY_PATH
+    from profile_store import ProfileStore
+
+    with open(registry_path or REGISTRY_PATH, encoding="utf-8") as f:
+        parsed = json.load(f).get(f"ats_func_4:{ats_func_4.JD_PROMPT_VERSION}:{ats_func_4.MODEL_NAME}", {})
+    store = ProfileStore(path)
+    samples = []
+    for job_hash in store.job_hashes():
+        job_reqs = parsed.get(job_hash)
+        if not job_reqs:
+            print(f"skipping {job_hash[:12]}: job requirements not in the registry")
+            continue
+        columns = store.columns(job_hash=job_hash)
+        details = store.details(columns.profile_ids)
+        resumes = [{
+            "skills": columns.skills(i),
+            "education": details[profile_id].get("Education", []),
+            "experience": details[profile_id].get("Relevant_Experience", []),
+            "total_experience": float(columns.total_experience[i]),
+        } for i, profile_id in enumerate(columns.profile_ids)]
+        local = JobScorer(job_reqs, weights=ATS_WEIGHTS, semantic=True).score_batch(resumes)["match"]
+        samples.append((job_hash[:12], np.round(local), columns.match))
+    store.close()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--store", default=None, help="profile store from a scoring='llm' run")
+    parser.add_argument("--registry", default=None, help="JobRegistry file (default: jd_registry.REGISTRY_PATH)")
+    parser.add_argument("--candidates", type=int, default=5000)
+    parser.add_argument("--noise", type=float, default=15.0, help="synthetic LLM score noise (std dev)")
+    parser.add_argument("--band", type=float, nargs=2, default=None)
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.store:
+        samples = store_samples(args.store, args.registry)
+    else:
+        samples = synthetic_sample(random.Random(args.seed), args.candidates, args.noise)
+    bands = [tuple(args.band)] if args.band else BANDS
+
+    for name, local, llm in samples:
+        print(f"{name}: {len(local)} candidates, top-{args.top_n} always escalated")
+        for band in bands:
+            report = replay(local, llm, band, args.top_n)
+            stats = report["stats"]
+            tiered, local_only = report["tiered_agreement"], report["local_agreement"]
+            print(f"  band {band[0]:>4.0f}-{band[1]:<4.0f} LLM calls {stats['llm_calls']:>6} "
+                  f"saved {stats['llm_calls_saved'] / max(stats['candidates'], 1):6.1%}  "
+                  f"spearman {tiered['spearman']:.3f} (local only {local_only['spearman']:.3f})  "
+                  f"top-k overlap {tiered['top_k_overlap']:.2f} (local only {local_only['top_k_overlap']:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Behaviour check for batched model calls, fed with canned answers.
+
+Runs batch_llm.run_batched against a stub model and the batched
+ats_func_4 paths (get_match_percentage_batch, extract_structured_data_batch)
+against a FakeBackend whose batch answers are reordered, incomplete or
+unparsable. Checks that answers reach the right candidate_id, that a
+missing or invalid entry falls back on its own and is counted in
+stats["fallbacks"], that an unparsable batch falls back for every item and
+that max_output_tokens reaches the model. Exits 1 on the first failed check.
+
+Usage: python benchmarks/check_batching.py
+"""
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import batch_llm  # noqa: E402
+import model_client  # noqa: E402
+from model_client import FakeBackend, ModelResponse, fake_response  # noqa: E402
+
+
+def check(condition, message):
+    print(f"{'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        sys.exit(1)
+
+
+class CannedModel:
+    """generate_content() answering each call with the next canned text"""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.overrides = []
+
+    def generate_content(self, prompt, **overrides):
+        self.overrides.append(overrides)
+        return ModelResponse(self.answers.pop(0))
+
+
+def run(items, answers, **options):
+    model = CannedModel(answers)
+    stats = {}
+    results = batch_llm.run_batched(
+        items, model,
+        build_prompt=lambda batch: " ".join(cid for cid, _ in batch),
+        validate=lambda entry: isinstance(entry.get("value"), str),
+        fallback=lambda payload: {"value": payload, "fallback": True},
+        stats=stats, **options,
+    )
+    return results, stats, model
+
+
+def check_run_batched():
+    items = [("a", "A"), ("b", "B"), ("c", "C")]
+
+    answer = json.dumps([{"candidate_id": cid, "value": payload} for cid, payload in reversed(items)])
+    results, stats, _ = run(items, [answer])
+    check(all(results[cid] == {"value": payload} for cid, payload in items) and not stats.get("fallbacks"),
+          "run_batched: reordered answers are matched by candidate_id")
+
+    answer = json.dumps([{"candidate_id": "a", "value": "A"}, {"candidate_id": "b", "value": 7}])
+    results, stats, _ = run(items, [answer])
+    check(results["a"] == {"value": "A"} and results["b"]["fallback"] and results["c"]["fallback"]
+          and stats["fallbacks"] == 2,
+          "run_batched: an invalid and a missing entry fall back alone")
+
+    results, stats, _ = run(items, ["Sorry, I cannot help with that."])
+    check(all(results[cid]["fallback"] for cid, _ in items) and stats["fallbacks"] == 3,
+          "run_batched: an unparsable batch falls back for every item")
+
+    answers = [json.dumps([{"candidate_id": cid, "value": p} for cid, p in items[:2]]),
+               json.dumps([{"candidate_id": "c", "value": "C"}])]
+    results, stats, model = run(items, answers, max_items=2, output_tokens=lambda batch: 1000 * len(batch))
+    check([o.get("max_output_tokens") for o in model.overrides] == [2000, 1000] and stats["requests"] == 2,
+          "run_batched: output_tokens(batch) is passed as max_output_tokens")
+
+
+class RecordingBackend(FakeBackend):
+    """FakeBackend that rewrites batch answers and records per-call overrides"""
+
+    def __init__(self, rewrite):
+        super().__init__(responder=self.respond)
+        self.rewrite = rewrite
+        self.overrides = []
+
+    def respond(self, prompt):
+        answer = fake_response(prompt)
+        if '"candidate_id"' in prompt:
+            return self.rewrite(json.loads(answer))
+        return answer
+
+    def generate(self, prompt, timeout, overrides=None):
+        self.overrides.append(dict(overrides or {}))
+        return super().generate(prompt, timeout, overrides)
+
+
+def batched(rewrite, call):
+    backend = RecordingBackend(rewrite)
+    model_client.configure(backend=backend)
+    stats = {}
+    results = call(stats)
+    return results, stats, backend
+
+
+def check_score_batch(ats):
+    profiles = [{"skills": [f"Skill {i}"], "education": [], "experience": [], "total_experience": 2}
+                for i in range(6)]
+
+    def call(stats):
+        return ats.get_match_percentage_batch("Python developer", profiles, {"required_skills": ["Python"]}, stats)
+
+    def numbered(entries):
+        # Each answer's match encodes its candidate, in reverse order
+        return json.dumps([dict(e, match=int(e["candidate_id"])) for e in reversed(entries)])
+
+    results, stats, backend = batched(numbered, call)
+    check([r["match"] for r in results] == list(range(6)) and not stats.get("fallbacks"),
+          "get_match_percentage_batch: scores reach their candidates")
+    sizes = [min(ats.MAX_OUTPUT_TOKENS, ats.MODEL_CONFIG["max_output_tokens"] * n)
+             for n in (ats.BATCH_MAX_ITEMS, 6 - ats.BATCH_MAX_ITEMS)]
+    check([o.get("max_output_tokens") for o in backend.overrides] == sizes,
+          f"get_match_percentage_batch: max_output_tokens {sizes} per batch")
+
+    def one_invalid(entries):
+        # Candidate 1's entry has no match, so it fails validation
+        return json.dumps([dict(e, match=int(e["candidate_id"])) if e["candidate_id"] != "1"
+                           else {"candidate_id": "1"} for e in entries])
+
+    results, stats, backend = batched(one_invalid, call)
+    others = [r["match"] for i, r in enumerate(results) if i != 1]
+    check(others == [0, 2, 3, 4, 5] and stats["fallbacks"] == 1 and backend.calls == stats["requests"] + 1,
+          "get_match_percentage_batch: an invalid entry falls back alone")
+
+    results, stats, backend = batched(lambda entries: "not json at all", call)
+    check(stats["fallbacks"] == 6 and backend.calls == stats["requests"] + 6 and all(r["match"] for r in results),
+          "get_match_percentage_batch: an unparsable batch falls back for every item")
+
+
+def check_extraction_batch(ats):
+    texts = [f"Candidate {i}\nSkills: Python\nDeveloper at Acme 01/2020 - Present" for i in range(ats.BATCH_MAX_ITEMS)]
+
+    def call(stats):
+        return ats.extract_structured_data_batch(texts, use_cache=False, stats=stats)
+
+    def labelled(entries):
+        # Skills name the candidate; candidate 1 is left out of the answer
+        return json.dumps([dict(e, skills=[f"Skill {e['candidate_id']}"])
+                           for e in reversed(entries) if e["candidate_id"] != "1"])
+
+    results, stats, backend = batched(labelled, call)
+    check(all(r["skills"] == [f"Skill {i}"] for i, r in enumerate(results) if i != 1)
+          and results[1]["skills"] != ["Skill 1"] and stats["fallbacks"] == 1,
+          "extract_structured_data_batch: a missing entry falls back alone")
+    size = min(ats.MAX_OUTPUT_TOKENS, ats.MODEL_CONFIG["max_output_tokens"] * len(texts))
+    check(backend.overrides[0].get("max_output_tokens") == size and stats["requests"] == 1,
+          f"extract_structured_data_batch: max_output_tokens {size} for one batch")
+
+
+def main():
+    os.chdir(tempfile.mkdtemp())
+    check_run_batched()
+
+    import ats_func_4
+
+    check_score_batch(ats_func_4)
+    check_extraction_batch(ats_func_4)
+
+
+if __name__ == "__main__":
+    main()
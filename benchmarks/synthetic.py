@@ -0,0 +1,91 @@
+"""Synthetic resumes and job descriptions for offline benchmarks."""
+
+from model_client import FAKE_POSITIONS as POSITIONS
+from model_client import FAKE_SKILLS as SKILLS
+
+
+def make_pdf(path, lines):
+    """Write a minimal one-page PDF with one Helvetica text line per entry"""
+    escaped = [line.replace("\\", "").replace("(", "").replace(")", "") for line in lines]
+    content = "BT /F1 10 Tf 50 750 Td 12 TL " + " ".join(f"({line}) '" for line in escaped) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R"
+        " /Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def resume_lines(rng, name):
+    skills = rng.sample(SKILLS, 6)
+    lines = [name, "Skills: " + ", ".join(skills), "Education: Bachelor's in Computer Science", "Experience"]
+    year = 2024
+    for i in range(rng.randint(1, 4)):
+        start = year - rng.randint(1, 3)
+        lines.append(f"Company {i} {rng.choice(POSITIONS)} {rng.randint(1, 12):02d}/{start} - 06/{year}")
+        year = start
+    return lines
+
+
+def job_description(rng):
+    skills = rng.sample(SKILLS, 5)
+    return (
+        f"We are hiring a {rng.choice(POSITIONS)}. Requirements: {', '.join(skills)}. "
+        f"At least {rng.randint(1, 5)} years of experience. Bachelor's degree in Computer Science."
+    )
+
+
+FILLER = [
+    "Collaborated with cross-functional teams to deliver features on schedule",
+    "Improved reliability and performance of production services",
+    "Mentored junior engineers and reviewed code across several repositories",
+    "Designed data pipelines and dashboards used by business stakeholders",
+    "Wrote technical documentation and led knowledge-sharing sessions",
+]
+
+
+def resume_text(rng, name, pages=3):
+    """Multi-page resume text as pdf_extract returns it, with repeated headers and footers"""
+    body = ["Summary", f"{rng.choice(POSITIONS)} with a track record of shipping software.", "Experience"]
+    year = 2024
+    for i in range(rng.randint(3, 6)):
+        start = year - rng.randint(1, 3)
+        body.append(f"Company {i}  |  {rng.choice(POSITIONS)}   {rng.randint(1, 12):02d}/{start} - 06/{year}")
+        body += [f"   - {rng.choice(FILLER)} using {rng.choice(SKILLS)}." for _ in range(rng.randint(6, 14))]
+        year = start
+    body += ["Skills", ", ".join(rng.sample(SKILLS, 8)), "Education", "Bachelor's in Computer Science, 2015"]
+    body += ["Projects"] + [f"- Side project {i}: {rng.choice(FILLER)}." for i in range(rng.randint(4, 10))]
+    body += ["Interests"] + [f"- {rng.choice(FILLER)} in the community." for _ in range(rng.randint(4, 10))]
+    body += ["References", "Available on request."]
+
+    per_page = -(-len(body) // pages)
+    out = []
+    for page in range(pages):
+        lines = [f"{name} - Curriculum Vitae", f"{name.lower().replace(' ', '.')}@example.com"]
+        lines += body[page * per_page:(page + 1) * per_page]
+        lines += ["", f"Page {page + 1} of {pages}"]
+        out.append("\n".join(lines))
+    return "\f".join(out)
+
+
+def long_job_description(rng):
+    """Job description with company boilerplate around the requirements"""
+    about = " ".join(rng.choice(FILLER) + "." for _ in range(rng.randint(10, 30)))
+    duties = "\n".join(f"- {rng.choice(FILLER)}." for _ in range(rng.randint(5, 12)))
+    return (
+        f"About Us\n{about}\n\nResponsibilities\n{duties}\n\n"
+        f"Requirements\n{job_description(rng)}\n\nBenefits\n{about}"
+    )
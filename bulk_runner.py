@@ -0,0 +1,176 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from job_journal import checkpointed, checkpointed_batch, row_key
+from pdf_extract import iter_extracted
+
+# Gemini 1.5 Flash free-tier quota
+DEFAULT_RPM = 15
+DEFAULT_TPM = 1_000_000
+DEFAULT_WORKERS = 4
+
+
+def estimate_tokens(text):
+    """Rough token count used for rate limiting (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+def is_rate_limit_error(exc):
+    """True when the model client reports quota exhaustion (HTTP 429)"""
+    if type(exc).__name__ in ("ResourceExhausted", "TooManyRequests", "RateLimitError"):
+        return True
+    message = str(exc).lower()
+    return "429" in message or "quota" in message or "rate limit" in message
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate` per second"""
+
+    def __init__(self, capacity, rate):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount):
+        """Take `amount` tokens and return how long the caller must wait for them"""
+        amount = min(amount, self.capacity)
+        with self.lock:
+            self._refill()
+            self.tokens -= amount
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter shared by all workers"""
+
+    def __init__(self, rpm=DEFAULT_RPM, tpm=DEFAULT_TPM, sleep=time.sleep):
+        self.requests = TokenBucket(rpm, rpm / 60.0)
+        self.tokens = TokenBucket(tpm, tpm / 60.0)
+        self.sleep = sleep
+
+    def reserve(self, tokens=1):
+        """Claim one request carrying `tokens` prompt tokens; returns seconds to wait first"""
+        return max(self.requests.reserve(1), self.tokens.reserve(tokens))
+
+    def acquire(self, tokens=1):
+        """Block until one request carrying `tokens` prompt tokens is allowed"""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self.sleep(wait)
+
+
+def run_bulk(items, worker, workers=DEFAULT_WORKERS):
+    """Run `worker(item)` over `items` on a bounded thread pool.
+
+    Results are returned in input order regardless of completion order.
+    """
+    items = list(items)
+    if workers <= 1:
+        return [worker(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(worker, items))
+
+
+def run_pipeline(items, texts, worker, workers=DEFAULT_WORKERS):
+    """Overlap a producer stage with the thread pool.
+
+    `texts` yields (index, payload) pairs in any order, e.g. from
+    pdf_extract.iter_extracted; each is handed to `worker(items[index], payload)`
+    as soon as it arrives. Results are returned in input order.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = {pool.submit(worker, items[index], payload): index for index, payload in texts}
+        for future, index in futures.items():
+            results[index] = future.result()
+    except BaseException:
+        # Ctrl-C: drop queued rows instead of draining the whole batch
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return results
+
+
+def run_batched_pipeline(items, texts, batch_worker, batch_size, workers=DEFAULT_WORKERS):
+    """Like run_pipeline, but groups arriving payloads into batches of `batch_size`.
+
+    `batch_worker(items, payloads)` must return one result per item.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    futures = {}
+
+    def submit(batch):
+        indexes = [index for index, _ in batch]
+        future = pool.submit(batch_worker, [items[i] for i in indexes], [payload for _, payload in batch])
+        futures[future] = indexes
+
+    try:
+        batch = []
+        for index, payload in texts:
+            batch.append((index, payload))
+            if len(batch) >= batch_size:
+                submit(batch)
+                batch = []
+        if batch:
+            submit(batch)
+        for future, indexes in futures.items():
+            for index, result in zip(indexes, future.result()):
+                results[index] = result
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return results
+
+
+def process_rows(rows, worker, workers=DEFAULT_WORKERS, pdf_workers=None, store=None,
+                 journal=None, is_ok=None, batch_size=1, dedup=None):
+    """Extract and analyze one batch of input rows; results come back in row order.
+
+    With a job_journal.JobJournal, rows already finished in an earlier run are
+    read back from the journal and every new result is journaled as it
+    completes. With batch_size > 1, `worker(rows, texts)` handles a list of
+    rows at a time. With a dedup.Deduplicator, duplicate resumes are not
+    analyzed again but given their canonical copy's result.
+    """
+    rows = list(rows)
+    pending = rows
+    if journal is not None:
+        done = journal.completed()
+        pending = [row for row in rows if row_key(row) not in done]
+        if len(pending) < len(rows):
+            print(f"Resuming: {len(rows) - len(pending)} of {len(rows)} rows already done")
+        wrap = checkpointed_batch if batch_size > 1 else checkpointed
+        worker = wrap(worker, journal, is_ok)
+
+    texts = iter_extracted([row["Resume"] for row in pending], workers=pdf_workers, store=store)
+    if dedup is not None:
+        texts = dedup.filter(pending, texts)
+    if batch_size > 1:
+        new_results = run_batched_pipeline(pending, texts, worker, batch_size, workers=workers)
+    else:
+        new_results = run_pipeline(pending, texts, worker, workers=workers)
+    if dedup is not None:
+        for index in dedup.fill(pending, new_results):
+            if journal is not None:
+                journal.record(row_key(pending[index]), new_results[index], ok=is_ok(new_results[index]))
+    if len(pending) == len(rows):
+        return new_results
+
+    previous = iter(journal.results([row_key(row) for row in rows if row_key(row) in done]))
+    fresh = iter(new_results)
+    return [next(previous) if row_key(row) in done else next(fresh) for row in rows]
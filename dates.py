@@ -0,0 +1,170 @@
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+SEASONS = {"spring": 3, "summer": 6, "fall": 9, "autumn": 9, "winter": 12}
+PRESENT_WORDS = {"present", "current", "currently", "now", "ongoing", "today", "till date", "to date"}
+
+_MONTH_NAME = r"(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+_YEAR = r"(\d{4}|'\d\d)"
+
+# Date shapes tried in order on the lower-cased, whitespace-normalized string;
+# each maps its match to (year text, month)
+_SHAPES = [
+    (re.compile(r"(\d{1,2})\s*[/.-]\s*(\d{4})"), lambda m: (m[2], m[1])),               # 01/2020, 1-2020
+    (re.compile(r"(\d{4})\s*[/.-]\s*(\d{1,2})(?:\s*[/.-]\s*\d{1,2})?"), lambda m: (m[1], m[2])),  # 2020/01, 2020-01-15
+    (re.compile(_MONTH_NAME + r",?\s*" + _YEAR), lambda m: (m[2], MONTHS[m[1]])),      # Jan. 2020, September 2019
+    (re.compile(r"q([1-4])\s*[-,]?\s*" + _YEAR), lambda m: (m[2], int(m[1]) * 3 - 2)),  # Q3 2019
+    (re.compile(_YEAR + r"\s*[-,]?\s*q([1-4])"), lambda m: (m[1], int(m[2]) * 3 - 2)),  # 2019 Q3
+    (re.compile(r"(spring|summer|fall|autumn|winter)\s*" + _YEAR), lambda m: (m[2], SEASONS[m[1]])),
+    (re.compile(_YEAR), lambda m: (m[1], 1)),                                            # 2020, '20
+]
+
+PRESENT = "present"
+
+
+def _year(text):
+    if text.startswith("'"):
+        # Two-digit years: '95 -> 1995, '20 -> 2020
+        value = int(text[1:])
+        return value + (1900 if value > datetime.now().year % 100 + 1 else 2000)
+    return int(text)
+
+
+@lru_cache(maxsize=16384)
+def _parse_normalized(text):
+    """(year, month), PRESENT or None for an already normalized string"""
+    if not text:
+        return PRESENT
+    if text in PRESENT_WORDS:
+        return PRESENT
+    for pattern, parts in _SHAPES:
+        match = pattern.fullmatch(text)
+        if match:
+            year, month = parts(match)
+            year, month = _year(year), int(month)
+            if 1 <= month <= 12 and 1000 <= year <= 9999:
+                return year, month
+            return None
+    return None
+
+
+class DateStats:
+    """Thread-safe counters of parse outcomes, with the most common unparsed values"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.unparsed = Counter()
+
+    def record(self, outcome, raw=None):
+        with self.lock:
+            self.counts[outcome] += 1
+            if raw is not None:
+                self.unparsed[raw] += 1
+
+    def update(self, counts, unparsed):
+        with self.lock:
+            self.counts.update(counts)
+            self.unparsed.update(unparsed)
+
+    def snapshot(self, examples=5):
+        with self.lock:
+            result = dict(self.counts)
+            result["unparsed_examples"] = [value for value, _ in self.unparsed.most_common(examples)]
+        return result
+
+    def reset(self):
+        with self.lock:
+            self.counts.clear()
+            self.unparsed.clear()
+
+
+_stats = DateStats()
+_reference = None
+
+
+def stats():
+    info = _stats.snapshot()
+    info["cache"] = _parse_raw.cache_info()._asdict()
+    return info
+
+
+def reset_stats():
+    _stats.reset()
+
+
+def reference_date():
+    """The date "Present" stands for: the pinned batch date, otherwise now"""
+    return _reference or datetime.now()
+
+
+@contextmanager
+def pinned(now=None):
+    """Use one reference date for every "Present" parsed inside the block"""
+    global _reference
+    previous = _reference
+    _reference = now or datetime.now()
+    try:
+        yield _reference
+    finally:
+        _reference = previous
+
+
+@lru_cache(maxsize=16384)
+def _parse_raw(text):
+    return _parse_normalized(re.sub(r"\s+", " ", text.strip().lower()))
+
+
+def parse_month(value):
+    """(year, month) that `value` names; None for "Present", blank or unparsed.
+
+    Accepts e.g. "01/2020", "2020-01", "2020/1", "Jan. 2020", "September
+    2019", "Q3 2019", "Summer 2019", "'19" and "2020". Every call is counted
+    in stats().
+    """
+    result = _parse_raw(str(value))
+    if result is PRESENT:
+        _stats.record("present")
+        return None
+    if result is None:
+        _stats.record("unparsed", str(value).strip())
+        return None
+    _stats.record("parsed")
+    return result
+
+
+def parse_months(values):
+    """parse_month() over many values, counting them in one go"""
+    counts, unparsed, results = Counter(), Counter(), []
+    for value in values:
+        result = _parse_raw(str(value))
+        if result is PRESENT:
+            counts["present"] += 1
+            result = None
+        elif result is None:
+            counts["unparsed"] += 1
+            unparsed[str(value).strip()] += 1
+        else:
+            counts["parsed"] += 1
+        results.append(result)
+    _stats.update(counts, unparsed)
+    return results
+
+
+def parse(value):
+    """First day of the month `value` names, or None (see parse_month)"""
+    month = parse_month(value)
+    return None if month is None else datetime(month[0], month[1], 1)
+
+
+def parse_date(value, now=None):
+    """parse() with "Present" and unparsed values mapped to the reference date"""
+    return parse(value) or now or reference_date()
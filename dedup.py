@@ -0,0 +1,250 @@
+import csv
+import hashlib
+import os
+import re
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from jd_registry import jd_hash
+from job_journal import row_key
+
+NUM_PERM = 128
+BANDS = 16
+# Estimated Jaccard similarity of word shingles above which two resumes are the same CV
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_WORDS = 3
+# Result columns copied from the duplicate row instead of the canonical one
+IDENTITY_COLUMNS = ("Applicant", "Position")
+# Canonical texts and finished results kept for duplicates arriving in later streaming chunks
+MAX_RESULTS = 10000
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def duplicates_path(output_file, tag):
+    """Duplicates report next to the output file, like job_journal.journal_path"""
+    return f"{os.path.splitext(output_file)[0]}.{tag}.duplicates.csv"
+
+
+def _words(text):
+    return _WORD_RE.findall(text.casefold())
+
+
+class MinHasher:
+    """MinHash signatures of word shingles.
+
+    Shingles are CRC32-hashed and permuted with NUM_PERM seeded
+    multiply-shift hashes in one NumPy pass, so signing a resume costs well
+    under a millisecond and needs no third-party sketch library.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, shingle_words=SHINGLE_WORDS, seed=1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_words = shingle_words
+        self.a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, words):
+        k = self.shingle_words
+        shingles = {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))}
+        hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        # uint64 products wrap, which is what multiply-shift hashing wants
+        with np.errstate(over="ignore"):
+            permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) >> np.uint64(32)
+        return permuted.min(axis=1)
+
+
+class LSHIndex:
+    """Banded locality-sensitive hash index over MinHash signatures.
+
+    Each signature is cut into `bands` bands; two documents become
+    candidates when any band matches exactly, so a lookup touches a few
+    buckets instead of every stored signature.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+
+    def _keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, key, signature):
+        self.signatures[key] = signature
+        for band, bucket in self._keys(signature):
+            self.buckets[band].setdefault(bucket, []).append(key)
+
+    def query(self, signature, threshold):
+        """(key, estimated similarity) of the closest stored signature at or above `threshold`, or None"""
+        candidates = set()
+        for band, bucket in self._keys(signature):
+            candidates.update(self.buckets[band].get(bucket, ()))
+        best = None
+        for key in candidates:
+            similarity = float(np.mean(self.signatures[key] == signature))
+            if similarity >= threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    def __len__(self):
+        return len(self.signatures)
+
+
+class Cluster:
+    """Resumes judged to be one CV; the first one seen is canonical"""
+
+    __slots__ = ("applicant", "resume", "by_jd")
+
+    def __init__(self, applicant, resume):
+        self.applicant = applicant
+        self.resume = resume
+        # jd_hash -> row_key of the first member scored against that JD
+        self.by_jd = {}
+
+
+def _remember(cache, key, value):
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > MAX_RESULTS:
+        cache.popitem(last=False)
+
+
+class Deduplicator:
+    """Collapses duplicate and near-duplicate resumes in front of the bulk runners.
+
+    filter() wraps the (index, text) stream from pdf_extract.iter_extracted.
+    Exact copies (same normalized words) and near-duplicates (MinHash
+    similarity at or above `threshold`, found through an LSHIndex) of a
+    resume already seen are recognised. A copy scored against the same job
+    description is not analyzed at all: fill() gives it the canonical row's
+    result. A copy for another job description is still scored, but with
+    the canonical text, so its extraction comes from the extraction cache.
+    State is kept across calls, so streaming chunks dedupe against each
+    other (the last MAX_RESULTS results are kept for that); every
+    collapsed row is listed in report().
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, identity=IDENTITY_COLUMNS, hasher=None, index=None):
+        self.threshold = threshold
+        self.identity = identity
+        self.hasher = hasher or MinHasher()
+        self.index = index or LSHIndex(self.hasher.num_perm)
+        self.exact = {}
+        self.clusters = {}
+        self.pending = {}
+        self.batch = set()
+        self.results = OrderedDict()
+        self.texts = OrderedDict()
+        self.collapsed = []
+        self.seen = 0
+        self.reused_extractions = 0
+
+    def _available(self, key):
+        return key in self.batch or key in self.results
+
+    def filter(self, rows, texts):
+        """Yield the (index, text) pairs of `rows` that still need analysis"""
+        self.pending = {}
+        self.batch = set()
+        for index, text in texts:
+            self.seen += 1
+            words = _words(text) if text else []
+            if not words:
+                yield index, text
+                continue
+            row = rows[index]
+            digest = hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+            key, similarity = self.exact.get(digest), 1.0
+            if key is None:
+                signature = self.hasher.signature(words)
+                match = self.index.query(signature, self.threshold)
+                if match is None:
+                    key = row_key(row)
+                    self.exact[digest] = key
+                    self.index.add(key, signature)
+                    cluster = self.clusters[key] = Cluster(row["Applicant"], row["Resume"])
+                    cluster.by_jd[jd_hash(row["JobDescription"])] = key
+                    _remember(self.texts, key, text)
+                    self.batch.add(key)
+                    yield index, text
+                    continue
+                key, similarity = match
+
+            cluster = self.clusters[key]
+            job = jd_hash(row["JobDescription"])
+            scored = cluster.by_jd.get(job)
+            entry = {
+                "Applicant": row["Applicant"], "Resume": row["Resume"],
+                "Canonical_Applicant": cluster.applicant, "Canonical_Resume": cluster.resume,
+                "Similarity": round(similarity, 3),
+            }
+            if scored is not None and self._available(scored):
+                # Same CV, same job: reuse the whole result
+                self.pending[index] = scored
+                self.collapsed.append(dict(entry, Reused="score"))
+                continue
+            cluster.by_jd[job] = row_key(row)
+            self.batch.add(row_key(row))
+            canonical_text = self.texts.get(key)
+            if canonical_text is None:
+                yield index, text
+                continue
+            self.texts.move_to_end(key)
+            self.reused_extractions += 1
+            self.collapsed.append(dict(entry, Reused="extraction"))
+            yield index, canonical_text
+
+    def fill(self, rows, results):
+        """Complete `results` (one per row, in order) for the rows filter() held back.
+
+        Returns the indices that were filled in.
+        """
+        finished = {}
+        for row, result in zip(rows, results):
+            key = row_key(row)
+            if result is not None and key in self.batch:
+                finished[key] = result
+        filled = []
+        for index, key in self.pending.items():
+            result = finished.get(key)
+            if result is None:
+                result = self.results.get(key)
+            if result is None:
+                continue
+            row = rows[index]
+            results[index] = dict(result, **{column: row[column] for column in self.identity if column in result})
+            filled.append(index)
+        for key, result in finished.items():
+            _remember(self.results, key, result)
+        self.pending = {}
+        self.batch = set()
+        return filled
+
+    def stats(self):
+        return {
+            "resumes": self.seen,
+            "distinct": len(self.clusters),
+            "collapsed": sum(entry["Reused"] == "score" for entry in self.collapsed),
+            "reused_extractions": self.reused_extractions,
+        }
+
+    def report(self):
+        return list(self.collapsed)
+
+    def write_report(self, path):
+        """Write report() as CSV (nothing when no row was collapsed)"""
+        if not self.collapsed:
+            return
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.collapsed[0]))
+            writer.writeheader()
+            writer.writerows(self.collapsed)
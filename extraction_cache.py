@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import threading
+
+import telemetry
+
+CACHE_DIR = os.getenv("ATS_CACHE_DIR", os.path.join(".ats_cache", "extraction"))
+MAX_CACHE_BYTES = int(os.getenv("ATS_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+CACHE_ENABLED = os.getenv("ATS_EXTRACTION_CACHE", "1").lower() not in ("0", "false", "no", "off")
+
+
+def cache_key(text, prompt_version, model_name):
+    """Content address of one extraction: resume text + prompt version + model"""
+    digest = hashlib.sha256()
+    for part in (prompt_version, model_name, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """On-disk JSON cache of structured extraction results with size-based LRU eviction.
+
+    Each entry is one file; its mtime is bumped on every hit so eviction removes
+    the least recently used entries first.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, enabled=CACHE_ENABLED):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.total_bytes = None
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def get(self, key):
+        """Return the cached payload for `key`, or None"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self.lock:
+                self.misses += 1
+            telemetry.add("extraction_cache_misses")
+            return None
+        with self.lock:
+            self.hits += 1
+        telemetry.add("extraction_cache_hits")
+        return data
+
+    def put(self, key, data):
+        """Store `data` under `key` and evict old entries if over the size limit"""
+        if not self.enabled:
+            return
+        path = self._path(key)
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            try:
+                # An overwritten entry's bytes are no longer in the cache
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Extraction cache write failed: {str(e)[:50]}")
+            return
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self.total_bytes += len(payload) - replaced
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self.total_bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def items(self):
+        """(key, payload) for every cached entry, in no particular order"""
+        for path, _, _ in self._entries():
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            yield os.path.basename(path)[:-len(".json")], data
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_cache():
+    """Shared cache instance used by the extraction functions"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ExtractionCache()
+        return _default_cache
+
+
+def configure(directory=None, max_bytes=None, enabled=None):
+    """Replace the shared cache, e.g. configure(enabled=False) to opt out"""
+    global _default_cache
+    current = get_cache()
+    with _default_lock:
+        _default_cache = ExtractionCache(
+            directory=directory if directory is not None else current.directory,
+            max_bytes=max_bytes if max_bytes is not None else current.max_bytes,
+            enabled=enabled if enabled is not None else current.enabled,
+        )
+    return _default_cache
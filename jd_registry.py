@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+
+REGISTRY_PATH = os.getenv("ATS_JD_REGISTRY", os.path.join(".ats_cache", "job_requirements.json"))
+
+
+def jd_hash(job_desc):
+    """Stable hash of a job description, ignoring whitespace differences"""
+    normalized = re.sub(r"\s+", " ", str(job_desc)).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def group_by_jd(job_descs):
+    """Map each distinct JD hash to the row positions sharing that JD (first-seen order)"""
+    groups = OrderedDict()
+    for position, job_desc in enumerate(job_descs):
+        groups.setdefault(jd_hash(job_desc), []).append(position)
+    return groups
+
+
+class JobRegistry:
+    """Parses each distinct job description once and shares the requirements.
+
+    Parsed requirements are memoized in-process and persisted to a JSON file
+    so later batches skip the LLM call entirely. `namespace` separates parsers
+    whose prompts or output shapes differ. A parser returning None signals a
+    failed parse, which is not cached.
+    """
+
+    def __init__(self, parse_fn, namespace, path=REGISTRY_PATH, persist=True):
+        self.parse_fn = parse_fn
+        self.namespace = namespace
+        self.path = path
+        self.persist = persist
+        self.parsed = {}
+        self.parse_calls = 0
+        self.lock = threading.Lock()
+        self.key_locks = {}
+        self._load()
+
+    def _load(self):
+        if not self.persist or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f)
+            self.parsed.update(stored.get(self.namespace, {}))
+        except (OSError, ValueError) as e:
+            print(f"Could not load job registry: {str(e)[:50]}")
+
+    def _save(self):
+        if not self.persist:
+            return
+        try:
+            stored = {}
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    stored = json.load(f)
+            stored[self.namespace] = self.parsed
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(stored, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except (OSError, ValueError) as e:
+            print(f"Could not save job registry: {str(e)[:50]}")
+
+    def get(self, job_desc):
+        """Return parsed requirements for `job_desc`, parsing it at most once"""
+        key = jd_hash(job_desc)
+        with self.lock:
+            if key in self.parsed:
+                return self.parsed[key]
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent workers asking for the same JD wait for a single parse
+        with key_lock:
+            with self.lock:
+                if key in self.parsed:
+                    return self.parsed[key]
+            requirements = self.parse_fn(job_desc)
+            if requirements is None:
+                return None
+            with self.lock:
+                self.parse_calls += 1
+                self.parsed[key] = requirements
+                self._save()
+            return requirements
+
+    def prefetch(self, job_descs):
+        """Parse every distinct JD of a batch up front"""
+        job_descs = list(job_descs)
+        groups = group_by_jd(job_descs)
+        for positions in groups.values():
+            self.get(job_descs[positions[0]])
+        return groups
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import threading
+
+KEY_COLUMNS = ("Applicant", "Resume", "JobDescription")
+
+
+def row_key(row):
+    """Stable identity of one input row, independent of its position in the sheet"""
+    digest = hashlib.sha256()
+    for column in KEY_COLUMNS:
+        digest.update(str(row[column]).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def journal_path(output_file, tag):
+    """Journal next to the output file; `tag` keeps differently-shaped runs apart"""
+    return f"{os.path.splitext(output_file)[0]}.{tag}.journal.jsonl"
+
+
+class JobJournal:
+    """Append-only JSONL journal of finished rows.
+
+    Every finished row is written and fsynced as soon as it completes, so an
+    interrupted batch can be restarted and only the unfinished rows re-run.
+    Later lines for the same key supersede earlier ones.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = None
+        self.done = None
+
+    def _lines(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A torn final line from a crash mid-write
+                    continue
+
+    def completed(self):
+        """Keys of rows whose latest journal entry succeeded"""
+        with self.lock:
+            if self.done is None:
+                self.done = set()
+                for entry in self._lines():
+                    if entry.get("ok"):
+                        self.done.add(entry["key"])
+                    else:
+                        self.done.discard(entry["key"])
+            return set(self.done)
+
+    def record(self, key, result, ok=True):
+        line = json.dumps({"key": key, "ok": ok, "result": result}, ensure_ascii=False, default=str)
+        with self.lock:
+            if self.file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self.file = open(self.path, "a", encoding="utf-8")
+            self.file.write(line + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            if self.done is not None:
+                if ok:
+                    self.done.add(key)
+                else:
+                    self.done.discard(key)
+
+    def results(self, keys):
+        """Latest result for each of `keys`, in that order (None when missing)"""
+        wanted = set(keys)
+        latest = {}
+        for entry in self._lines():
+            if entry["key"] in wanted:
+                latest[entry["key"]] = entry["result"]
+        return [latest.get(key) for key in keys]
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+def checkpointed(worker, journal, is_ok):
+    """Wrap a bulk worker so each finished row is journaled as soon as it completes"""
+    def run(row, *args, **kwargs):
+        result = worker(row, *args, **kwargs)
+        journal.record(row_key(row), result, ok=is_ok(result))
+        return result
+    return run
+
+
+def checkpointed_batch(batch_worker, journal, is_ok):
+    """checkpointed() for workers that take and return lists of rows"""
+    def run(rows, *args, **kwargs):
+        results = batch_worker(rows, *args, **kwargs)
+        for row, result in zip(rows, results):
+            journal.record(row_key(row), result, ok=is_ok(result))
+        return results
+    return run
@@ -0,0 +1,295 @@
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+import telemetry
+from bulk_runner import estimate_tokens
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+DEFAULT_TIMEOUT = 60.0
+
+
+class ModelResponse:
+    """Minimal response object: call sites only read `.text`"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+class GeminiBackend:
+    """google.generativeai backend holding one GenerativeModel for reuse.
+
+    The SDK is imported and configured (including .env loading) on first
+    construction, not at module import, and the model object (and its
+    transport) is shared by all calls.
+    """
+
+    def __init__(self, model_name=DEFAULT_MODEL, generation_config=None, safety_settings=None):
+        import google.generativeai as genai
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+        self.generation_config = dict(generation_config or {})
+        self.model = genai.GenerativeModel(
+            model_name,
+            generation_config=self.generation_config or None,
+            safety_settings=safety_settings,
+        )
+
+    def _kwargs(self, timeout, overrides):
+        kwargs = {"request_options": {"timeout": timeout}}
+        if overrides:
+            kwargs["generation_config"] = {**self.generation_config, **overrides}
+        return kwargs
+
+    def generate(self, prompt, timeout, overrides=None):
+        return self.model.generate_content(prompt, **self._kwargs(timeout, overrides)).text
+
+    async def agenerate(self, prompt, timeout, overrides=None):
+        response = await self.model.generate_content_async(prompt, **self._kwargs(timeout, overrides))
+        return response.text
+
+
+class FakeRateLimitError(Exception):
+    """Raised by FakeBackend to imitate a 429 from the real API"""
+
+
+class FakeServerError(Exception):
+    """Raised by FakeBackend to imitate a 503 from the real API"""
+
+
+# Fault kind -> what FakeBackend does instead of answering
+FAKE_FAULTS = {
+    "rate_limit": lambda: FakeRateLimitError("429 Resource has been exhausted (e.g. check quota)."),
+    "server": lambda: FakeServerError("503 The service is currently unavailable."),
+    "timeout": lambda: TimeoutError("Deadline exceeded while waiting for the model."),
+    "invalid": None,  # answers, but with unusable text
+}
+
+
+FAKE_SKILLS = [
+    "Python", "SQL", "Machine Learning", "TensorFlow", "PyTorch", "AWS", "Docker",
+    "Kubernetes", "React", "Java", "Selenium", "Postman", "JMeter", "Pandas", "NLP",
+]
+FAKE_POSITIONS = ["Machine Learning Engineer", "Data Scientist", "QA Engineer", "Backend Developer"]
+
+
+def fake_response(prompt):
+    """Deterministic, plausible JSON answer for every prompt shape used in this repo"""
+    seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12], 16)
+    rng = random.Random(seed)
+
+    if '"candidate_id"' in prompt:
+        ids = re.findall(r"candidate_id:? (\w+)", prompt)
+        single = prompt.replace('"candidate_id"', "")
+        answers = []
+        for cid in ids:
+            payload = json.loads(fake_response(f"{single}\n{cid}"))
+            answers.append(dict(payload, candidate_id=cid))
+        return json.dumps(answers)
+
+    if '"match"' in prompt:
+        return json.dumps({
+            "match": rng.randint(30, 95),
+            "stability": rng.randint(25, 100),
+            "score_breakdown": {k: rng.randint(0, 100) for k in
+                                ("skills_match", "education_match", "experience_match", "keyword_match")},
+            "strengths": rng.sample(FAKE_SKILLS, 2),
+            "weaknesses": rng.sample(FAKE_SKILLS, 1),
+            "detailed_analysis": "Synthetic analysis from the fake backend.",
+        })
+
+    if "required_skills" in prompt:
+        return json.dumps({
+            "required_skills": rng.sample(FAKE_SKILLS, 5),
+            "required_education": ["Bachelor's in Computer Science"],
+            "min_experience": rng.randint(1, 5),
+            "relevant_titles": rng.sample(FAKE_POSITIONS, 2),
+        })
+
+    year = 2024
+    positions = []
+    for i in range(rng.randint(1, 4)):
+        start = year - rng.randint(1, 3)
+        positions.append((f"Company {i}", f"{rng.randint(1, 12):02d}/{start}", f"06/{year}",
+                          rng.choice(FAKE_POSITIONS), rng.random() > 0.2))
+        year = start
+    skills = rng.sample(FAKE_SKILLS, 6)
+
+    if "is_relevant" in prompt:
+        # utils.py extraction shape
+        return json.dumps({
+            "education": [{"field": "Computer Science", "institution": "Synthetic University"}],
+            "skills": skills,
+            "experience": [{"job_title": p, "company": c, "start_date": s, "end_date": e, "is_relevant": r}
+                           for c, s, e, p, r in positions],
+        })
+    return json.dumps({
+        "skills": skills,
+        "education": ["Bachelor's in Computer Science"],
+        "experience": [{"company": c, "start": s, "end": e, "position": p, "relevant": r}
+                       for c, s, e, p, r in positions],
+    })
+
+
+class FakeBackend:
+    """Offline backend with configurable latency and fault injection.
+
+    Answers come from `responder(prompt)` (fake_response by default), so the
+    whole pipeline runs without network access. `faults` maps a FAKE_FAULTS
+    kind to its rate per call; `failure_rate` is shorthand for rate-limit
+    faults. Faults are drawn from a seeded RNG and counted per kind.
+    """
+
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=0, responder=fake_response, faults=None):
+        self.latency = latency
+        self.faults = dict(faults or {})
+        if failure_rate:
+            self.faults["rate_limit"] = failure_rate
+        unknown = set(self.faults) - set(FAKE_FAULTS)
+        if unknown:
+            raise ValueError(f"unknown fault kinds: {sorted(unknown)}")
+        self.failure_rate = sum(self.faults.values())
+        self.responder = responder
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.injected = {}
+
+    def _fault(self):
+        """Fault kind for this call, or None for a normal answer"""
+        with self.lock:
+            self.calls += 1
+            draw = self.rng.random()
+            for kind, rate in self.faults.items():
+                if draw < rate:
+                    self.failures += 1
+                    self.injected[kind] = self.injected.get(kind, 0) + 1
+                    return kind
+                draw -= rate
+        return None
+
+    def _answer(self, prompt):
+        kind = self._fault()
+        if kind == "invalid":
+            return self.responder(prompt)[:20] + " ... (answer cut off)"
+        if kind is not None:
+            raise FAKE_FAULTS[kind]()
+        return self.responder(prompt)
+
+    def generate(self, prompt, timeout, overrides=None):
+        if self.latency:
+            time.sleep(min(self.latency, timeout))
+        return self._answer(prompt)
+
+    async def agenerate(self, prompt, timeout, overrides=None):
+        import asyncio
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._answer(prompt)
+
+
+class ModelClient:
+    """Shared model client with sync and asyncio interfaces.
+
+    Every call goes through the optional bulk_runner.RateLimiter and carries
+    a per-call timeout. Extra keyword arguments override generation config
+    fields for that call only (e.g. max_output_tokens for batched prompts).
+    Errors are raised as-is; retrying and pausing on a saturated backend is
+    left to retry.Retrier. asyncio is only imported by the async methods.
+    """
+
+    def __init__(self, backend, limiter=None, timeout=DEFAULT_TIMEOUT):
+        self.backend = backend
+        self.limiter = limiter
+        self.timeout = timeout
+        self.calls = 0
+
+    def _record(self, prompt, text, waited, seconds):
+        telemetry.add("model_calls")
+        telemetry.add("model_s", seconds)
+        telemetry.add("limiter_wait_s", waited)
+        telemetry.add("prompt_chars", len(prompt))
+        telemetry.add("response_chars", len(text or ""))
+
+    def generate_content(self, prompt, timeout=None, **overrides):
+        started = time.perf_counter()
+        if self.limiter is not None:
+            self.limiter.acquire(estimate_tokens(prompt))
+        called = time.perf_counter()
+        self.calls += 1
+        try:
+            text = self.backend.generate(prompt, timeout or self.timeout, overrides)
+        except Exception:
+            telemetry.add("model_errors")
+            raise
+        self._record(prompt, text, called - started, time.perf_counter() - called)
+        return ModelResponse(text)
+
+    async def agenerate_content(self, prompt, timeout=None, **overrides):
+        import asyncio
+
+        timeout = timeout or self.timeout
+        started = time.perf_counter()
+        if self.limiter is not None:
+            await asyncio.sleep(self.limiter.reserve(estimate_tokens(prompt)))
+        called = time.perf_counter()
+        self.calls += 1
+        try:
+            text = await asyncio.wait_for(self.backend.agenerate(prompt, timeout, overrides), timeout)
+        except Exception:
+            telemetry.add("model_errors")
+            raise
+        self._record(prompt, text, called - started, time.perf_counter() - called)
+        return ModelResponse(text)
+
+
+async def agenerate_all(client, prompts, concurrency=16, timeout=None):
+    """Run many prompts concurrently (bounded) with retries; returns texts, or the last exception, per prompt"""
+    import asyncio
+
+    import retry
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(prompt):
+        async with semaphore:
+            try:
+                return (await retry.acall(client.agenerate_content, prompt, timeout=timeout)).text
+            except Exception as e:
+                return e
+
+    return await asyncio.gather(*(one(prompt) for prompt in prompts))
+
+
+_clients = {}
+_backend = None
+_limiter = None
+_lock = threading.Lock()
+
+
+def configure(backend=None, limiter=None):
+    """Route every client through `backend` (None = Gemini) and an optional limiter"""
+    global _backend, _limiter
+    with _lock:
+        _backend = backend
+        _limiter = limiter
+        _clients.clear()
+
+
+def get_client(model_name=DEFAULT_MODEL, generation_config=None, safety_settings=None):
+    """Shared ModelClient for one model/config combination, created on first use"""
+    key = (model_name, json.dumps(generation_config, sort_keys=True), json.dumps(safety_settings, sort_keys=True))
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            backend = _backend or GeminiBackend(model_name, generation_config, safety_settings)
+            client = _clients[key] = ModelClient(backend, limiter=_limiter)
+        return client
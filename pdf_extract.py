@@ -0,0 +1,79 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import telemetry
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def extract_text(file_path):
+    """Text of every page, calling page.extract_text() once per page.
+
+    Pages are separated by a form feed so preprocess can recognise
+    per-page headers and footers.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(file_path) as pdf:
+        pages = (page.extract_text() for page in pdf.pages)
+        return "\f".join(text for text in pages if text)
+
+
+def _extract_row(job):
+    index, file_path = job
+    started = time.perf_counter()
+    try:
+        return index, extract_text(file_path), None, time.perf_counter() - started
+    except Exception as e:
+        return index, None, str(e), time.perf_counter() - started
+
+
+def iter_extracted(file_paths, workers=None, store=None):
+    """Extract PDFs on a process pool, yielding (index, text) as each one finishes.
+
+    pdfplumber is CPU-bound and holds the GIL, so it runs in separate
+    processes while the caller's threads wait on the network. With a
+    text_store.TextStore, unchanged files are served from the store first
+    and only the rest are parsed. Failed files yield text None; the caller
+    decides how to report them.
+    """
+    file_paths = list(file_paths)
+    hits, jobs = [], []
+    for index, file_path in enumerate(file_paths):
+        text = store.get(file_path) if store is not None else None
+        if text is not None:
+            telemetry.add("text_store_hits")
+            hits.append((index, text))
+        else:
+            jobs.append((index, file_path))
+
+    def finish(result):
+        index, text, error, seconds = result
+        telemetry.record("pdf_extract", seconds)
+        if error:
+            telemetry.add("pdf_errors")
+            print(f"PDF extraction failed for row {index}: {error[:50]}")
+        elif store is not None:
+            store.put(file_paths[index], text, seconds)
+        return index, text
+
+    workers = min(workers or available_cores(), len(jobs))
+    if workers <= 1:
+        yield from hits
+        for job in jobs:
+            yield finish(_extract_row(job))
+        return
+
+    # Worker processes are started before anything is yielded, so they fork
+    # before the consumer has started any threads
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_extract_row, job) for job in jobs]
+        yield from hits
+        for future in as_completed(futures):
+            yield finish(future.result())
@@ -0,0 +1,183 @@
+import os
+import re
+from collections import Counter
+
+# pdf_extract.extract_text separates pages with a form feed
+PAGE_BREAK = "\f"
+
+RESUME_TOKEN_BUDGET = int(os.getenv("ATS_RESUME_TOKEN_BUDGET", 2000))
+JD_TOKEN_BUDGET = int(os.getenv("ATS_JD_TOKEN_BUDGET", 1000))
+# Largest part of the budget one section gets before the others are served
+MAX_SECTION_SHARE = 0.6
+
+# Section name -> heading words. Order does not matter; priorities below do.
+RESUME_SECTIONS = {
+    "experience": r"(work |professional |employment )?(experience|history)|employment|career",
+    "skills": r"(technical |core |key )?(skills|competencies|technologies|tools)( & tools)?",
+    "education": r"education|academics?|qualifications?",
+    "projects": r"(personal |academic |key )?projects",
+    "certifications": r"certifications?|licen[cs]es?|courses|training",
+    "summary": r"summary|profile|objective|about( me)?",
+    "achievements": r"achievements|awards|honou?rs|publications",
+    "other": r"languages|interests|hobbies|references|volunteer(ing)?|activities",
+}
+RESUME_PRIORITY = ["experience", "skills", "education", "preamble", "certifications", "projects",
+                   "summary", "achievements", "other"]
+
+JD_SECTIONS = {
+    "requirements": r"requirements|qualifications|must have|what you( will)? need|who you are",
+    "responsibilities": r"(key )?responsibilities|duties|what you('ll| will) do|the role",
+    "preferred": r"preferred( skills| qualifications)?|nice to have|bonus|plus points",
+    "about": r"about (us|the company)|who we are|benefits|perks|what we offer|why join us",
+}
+JD_PRIORITY = ["requirements", "preamble", "responsibilities", "preferred", "about"]
+
+_WORD_RE = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+_DATED_LINE_RE = re.compile(r"\b(19|20)\d\d\b|\bpresent\b", re.IGNORECASE)
+# "Page 2", "Page 2 of 3", "2 of 3", "- 2 -": page numbers wherever they appear
+_PAGE_LABEL_RE = re.compile(r"^(page\s*\d+(\s*(of|/)\s*\d+)?|\d+\s+of\s+\d+|-\s*\d+\s*-)$", re.IGNORECASE)
+# "2" or "2/3": only a page number on the first or last line of a page
+_BARE_NUMBER_RE = re.compile(r"^(\d+)(\s*/\s*(\d+))?$")
+
+
+def count_tokens(text):
+    """Fast local token estimate: ~4 letters per token, one per number or symbol"""
+    return sum((len(piece) + 3) // 4 if piece.isalpha() else 1 for piece in _WORD_RE.findall(text))
+
+
+def collapse_whitespace(text):
+    lines = (re.sub(r"[ \t ]+", " ", line).strip() for line in text.split("\n"))
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _shape(line):
+    return re.sub(r"\d+", "#", line.strip().lower())
+
+
+def _page_number(line, at_edge, page_count):
+    line = line.strip()
+    if _PAGE_LABEL_RE.match(line):
+        return True
+    match = _BARE_NUMBER_RE.match(line) if at_edge and page_count > 1 else None
+    if match is None:
+        return False
+    # Years, phone numbers and IDs on their own line are content, not page numbers
+    number, total = int(match.group(1)), match.group(3)
+    return 0 < number <= page_count and (total is None or int(total) == page_count)
+
+
+def strip_headers_footers(text, edge_lines=2):
+    """Drop page numbers and lines repeated at the top or bottom of most pages.
+
+    The first copy of a repeated header is kept: it is usually the
+    candidate's name and contact line. A line holding only a number is
+    dropped only at the top or bottom of a page of a multi-page document,
+    and only when it could be that page's number.
+    """
+    pages = [page.split("\n") for page in text.split(PAGE_BREAK)]
+    edges = Counter()
+    for lines in pages:
+        content = [line for line in lines if line.strip()]
+        edges.update({_shape(line) for line in content[:edge_lines] + content[-edge_lines:]})
+    threshold = max(2, (len(pages) + 1) // 2)
+    repeated = {shape for shape, count in edges.items() if count >= threshold} if len(pages) > 1 else set()
+
+    kept, seen = [], set()
+    for lines in pages:
+        filled = [i for i, line in enumerate(lines) if line.strip()]
+        edge = {filled[0], filled[-1]} if filled else set()
+        for i, line in enumerate(lines):
+            shape = _shape(line)
+            if _page_number(line, i in edge, len(pages)) or shape in seen:
+                continue
+            if shape in repeated:
+                seen.add(shape)
+            kept.append(line)
+    return "\n".join(kept)
+
+
+def split_sections(text, sections):
+    """Split text into (name, body) pairs at recognised heading lines.
+
+    Text before the first heading is returned as "preamble" (usually the
+    contact block or the JD introduction).
+    """
+    patterns = {name: re.compile(rf"^\W*({words})\W*$", re.IGNORECASE) for name, words in sections.items()}
+    result = [["preamble", []]]
+    for line in text.split("\n"):
+        stripped = line.strip().rstrip(":")
+        name = None
+        if 0 < len(stripped) <= 40:
+            name = next((n for n, pattern in patterns.items() if pattern.match(stripped)), None)
+        if name:
+            result.append([name, [line]])
+        else:
+            result[-1][1].append(line)
+    return [(name, "\n".join(lines).strip()) for name, lines in result if "\n".join(lines).strip()]
+
+
+def _truncate_lines(body, budget):
+    """Cut `body` to `budget` tokens, keeping its heading and dated lines first.
+
+    Dated lines are the job and degree headlines that experience and
+    education parsing depend on; other lines fill what is left, in order.
+    """
+    lines = body.split("\n")
+    costs = [count_tokens(line) + 1 for line in lines]
+    keep = [False] * len(lines)
+    used = 0
+    for first_pass in (True, False):
+        for i, line in enumerate(lines):
+            if keep[i] or (first_pass and i and not _DATED_LINE_RE.search(line)):
+                continue
+            if used + costs[i] <= budget:
+                keep[i] = True
+                used += costs[i]
+    return "\n".join(line for line, kept in zip(lines, keep) if kept)
+
+
+def pack_sections(sections, priority, budget, max_share=MAX_SECTION_SHARE):
+    """Fit (name, body) sections into `budget` tokens, most important first.
+
+    A first pass caps every section at `max_share` of the budget so one long
+    section cannot starve the rest; a second pass hands what is left back in
+    priority order. Sections are cut at line boundaries, a section reduced to
+    its bare heading is dropped, and the output keeps document order.
+    """
+    rank = {name: i for i, name in enumerate(priority)}
+    order = sorted(range(len(sections)), key=lambda i: (rank.get(sections[i][0], len(priority)), i))
+    sizes = [count_tokens(body) for _, body in sections]
+    allowed = [0] * len(sections)
+    remaining = budget
+    for cap in (int(budget * max_share), budget):
+        for i in order:
+            extra = min(sizes[i] - allowed[i], cap - allowed[i], remaining)
+            if extra > 0:
+                allowed[i] += extra
+                remaining -= extra
+
+    kept = []
+    for i, (name, body) in enumerate(sections):
+        if allowed[i] < sizes[i]:
+            body = _truncate_lines(body, allowed[i])
+            if name != "preamble" and "\n" not in body:
+                continue
+        if body:
+            kept.append(body)
+    return "\n\n".join(kept)
+
+
+def prepare_resume(text, budget=RESUME_TOKEN_BUDGET):
+    """Clean resume text and pack its most relevant sections into `budget` tokens"""
+    text = collapse_whitespace(strip_headers_footers(text))
+    if count_tokens(text) <= budget:
+        return text
+    return pack_sections(split_sections(text, RESUME_SECTIONS), RESUME_PRIORITY, budget)
+
+
+def prepare_job_description(job_desc, budget=JD_TOKEN_BUDGET):
+    """Clean a job description and keep requirements first within `budget` tokens"""
+    text = collapse_whitespace(str(job_desc))
+    if count_tokens(text) <= budget:
+        return text
+    return pack_sections(split_sections(text, JD_SECTIONS), JD_PRIORITY, budget)
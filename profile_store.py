@@ -0,0 +1,289 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from jd_registry import jd_hash
+from job_journal import row_key
+from scoring import normalize_term
+from sheet_io import open_sink
+
+STORE_PATH = os.getenv("ATS_PROFILE_STORE", os.path.join(".ats_cache", "profiles.sqlite"))
+
+
+class Profile:
+    """One analyzed candidate; skills are ids into the store's skill vocabulary"""
+
+    __slots__ = ("profile_id", "applicant", "position", "job_hash", "match", "stability",
+                 "total_experience", "companies_count", "skill_ids")
+
+    def __init__(self, profile_id, applicant, position, job_hash, match, stability,
+                 total_experience, companies_count, skill_ids):
+        self.profile_id = profile_id
+        self.applicant = applicant
+        self.position = position
+        self.job_hash = job_hash
+        self.match = match
+        self.stability = stability
+        self.total_experience = total_experience
+        self.companies_count = companies_count
+        self.skill_ids = skill_ids
+
+
+class ProfileColumns:
+    """Column arrays over many stored profiles, for filtering and re-ranking.
+
+    Numbers are float32 arrays; skills are a CSR pair (`skill_offsets`,
+    `skill_ids`) of interned int32 ids. Free-text fields stay in the store
+    and are only read back for export.
+    """
+
+    def __init__(self, store, rows):
+        self.store = store
+        n = len(rows)
+        self.profile_ids = [row[0] for row in rows]
+        self.applicants = [row[1] for row in rows]
+        self.positions = [row[2] for row in rows]
+        self.match = np.fromiter((row[3] for row in rows), dtype=np.float32, count=n)
+        self.stability = np.fromiter((row[4] for row in rows), dtype=np.float32, count=n)
+        self.total_experience = np.fromiter((row[5] for row in rows), dtype=np.float32, count=n)
+        self.companies_count = np.fromiter((row[6] for row in rows), dtype=np.int16, count=n)
+        skills = [np.frombuffer(row[7], dtype=np.int32) for row in rows]
+        self.skill_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(ids) for ids in skills], out=self.skill_offsets[1:])
+        self.skill_ids = np.concatenate(skills) if skills else np.zeros(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.profile_ids)
+
+    def has_skills(self, skills):
+        """Boolean per profile: has every one of `skills` (raw names, normalized here)"""
+        ids = [self.store.skill_id(skill) for skill in skills]
+        counts = np.zeros(len(self), dtype=np.int64)
+        if None in ids:
+            return counts > 0
+        rows = np.repeat(np.arange(len(self)), np.diff(self.skill_offsets))
+        np.add.at(counts, rows[np.isin(self.skill_ids, ids)], 1)
+        return counts >= len(set(ids))
+
+    def filter(self, min_match=None, min_stability=None, min_experience=None, skills=None):
+        """Row indices passing every given threshold"""
+        keep = np.ones(len(self), dtype=bool)
+        if min_match is not None:
+            keep &= self.match >= min_match
+        if min_stability is not None:
+            keep &= self.stability >= min_stability
+        if min_experience is not None:
+            keep &= self.total_experience >= min_experience
+        if skills:
+            keep &= self.has_skills(skills)
+        return np.flatnonzero(keep)
+
+    def rank(self, weights=None, indices=None):
+        """Row indices ordered by a weighted sum of columns, best first.
+
+        `weights` maps column names ("match", "stability", "total_experience",
+        "companies_count") to weights; the default ranks by match.
+        """
+        indices = np.arange(len(self)) if indices is None else np.asarray(indices)
+        score = np.zeros(len(indices), dtype=np.float64)
+        for column, weight in (weights or {"match": 1.0}).items():
+            score += weight * getattr(self, column)[indices]
+        return indices[np.argsort(-score, kind="stable")]
+
+    def skills(self, index):
+        ids = self.skill_ids[self.skill_offsets[index]:self.skill_offsets[index + 1]]
+        return [self.store.skill_name(skill) for skill in ids.tolist()]
+
+
+class ProfileStore:
+    """Durable SQLite store of analyzed candidates.
+
+    Each row of a bulk run is stored under job_journal.row_key(row) with its
+    scores, interned skill ids and the free-text analysis, so re-ranking,
+    filtering and re-exporting never call the model again.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS skills (id INTEGER PRIMARY KEY, term TEXT UNIQUE, name TEXT)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            " profile_id TEXT PRIMARY KEY, applicant TEXT, position TEXT, job_hash TEXT,"
+            " match REAL, stability REAL, total_experience REAL, companies_count INTEGER,"
+            " skills BLOB, details TEXT, updated REAL, resume TEXT)"
+        )
+        if "resume" not in [column[1] for column in self.conn.execute("PRAGMA table_info(profiles)")]:
+            # Stores created before the resume path was kept
+            self.conn.execute("ALTER TABLE profiles ADD COLUMN resume TEXT")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS profiles_job ON profiles (job_hash)")
+        self.conn.commit()
+        self.lock = threading.Lock()
+        self.skill_ids = {}
+        self.skill_names = {}
+        for skill, term, name in self.conn.execute("SELECT id, term, name FROM skills"):
+            self.skill_ids[term] = skill
+            self.skill_names[skill] = name
+
+    def _intern(self, name):
+        term = normalize_term(name)
+        skill = self.skill_ids.get(term)
+        if skill is None:
+            skill = self.conn.execute("INSERT INTO skills (term, name) VALUES (?, ?)", (term, str(name).strip())).lastrowid
+            self.skill_ids[term] = skill
+            self.skill_names[skill] = str(name).strip()
+        return skill
+
+    def skill_id(self, name):
+        return self.skill_ids.get(normalize_term(name))
+
+    def skill_name(self, skill):
+        return self.skill_names.get(skill)
+
+    def _record(self, row, result):
+        details = {
+            "Score_Breakdown": result.get("Score_Breakdown", {}),
+            "Strengths": result.get("Strengths", []),
+            "Weaknesses": result.get("Weaknesses", []),
+            "Detailed_Analysis": result.get("Detailed_Analysis", ""),
+            "Education": result.get("Education", []),
+            "Relevant_Experience": result.get("Relevant_Experience", []),
+        }
+        skills = sorted({self._intern(skill) for skill in result.get("Skills", []) if str(skill).strip()})
+        return (
+            row_key(row), str(row["Applicant"]), str(row["Position"]), jd_hash(row["JobDescription"]),
+            float(result["Overall_Match"]), float(result["Stability_Score"]),
+            float(result["Total_Experience"]), int(result["Companies_Count"]),
+            np.asarray(skills, dtype=np.int32).tobytes(),
+            json.dumps(details, ensure_ascii=False, default=str), time.time(), str(row["Resume"]),
+        )
+
+    def put(self, row, result):
+        """Store one analyzed row: `result` is an ats_func_4.analyze_resume() dict"""
+        self.put_many([(row, result)])
+
+    def put_many(self, pairs):
+        """Store (row, result) pairs in one transaction"""
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO profiles (profile_id, applicant, position, job_hash, match, stability,"
+                " total_experience, companies_count, skills, details, updated, resume)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [self._record(row, result) for row, result in pairs],
+            )
+            self.conn.commit()
+
+    def remove(self, profile_id):
+        with self.lock:
+            self.conn.execute("DELETE FROM profiles WHERE profile_id = ?", (profile_id,))
+            self.conn.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def get(self, profile_id):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT profile_id, applicant, position, job_hash, match, stability, total_experience,"
+                " companies_count, skills FROM profiles WHERE profile_id = ?",
+                (profile_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return Profile(*row[:8], np.frombuffer(row[8], dtype=np.int32))
+
+    def job_hashes(self):
+        """jd_registry.jd_hash of every job description with stored profiles"""
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT DISTINCT job_hash FROM profiles")]
+
+    def columns(self, job_description=None, job_hash=None):
+        """ProfileColumns over every stored profile, or those scored against one JD"""
+        query = ("SELECT profile_id, applicant, position, match, stability, total_experience,"
+                 " companies_count, skills FROM profiles")
+        params = ()
+        if job_description is not None:
+            job_hash = jd_hash(job_description)
+        if job_hash is not None:
+            query += " WHERE job_hash = ?"
+            params = (job_hash,)
+        with self.lock:
+            rows = self.conn.execute(query + " ORDER BY rowid", params).fetchall()
+        return ProfileColumns(self, rows)
+
+    def details(self, profile_ids):
+        """Free-text fields of `profile_ids` as {profile_id: dict}"""
+        result = {}
+        with self.lock:
+            for start in range(0, len(profile_ids), 500):
+                chunk = list(profile_ids[start:start + 500])
+                marks = ",".join("?" * len(chunk))
+                for profile_id, details in self.conn.execute(
+                    f"SELECT profile_id, details FROM profiles WHERE profile_id IN ({marks})", chunk
+                ):
+                    result[profile_id] = json.loads(details)
+        return result
+
+    def results(self, job_hash):
+        """(row, result) pairs stored for one JD, in the shapes put_many() takes.
+
+        Rows carry Applicant, Position and Resume (the profile id for stores
+        that predate the resume column); add JobDescription before storing.
+        """
+        with self.lock:
+            stored = self.conn.execute(
+                "SELECT profile_id, applicant, position, resume, match, stability, total_experience,"
+                " companies_count, skills, details FROM profiles WHERE job_hash = ? ORDER BY rowid",
+                (job_hash,),
+            ).fetchall()
+        pairs = []
+        for profile_id, applicant, position, resume, match, stability, experience, companies, skills, details in stored:
+            row = {"Applicant": applicant, "Position": position, "Resume": resume or profile_id}
+            result = dict(
+                json.loads(details),
+                Overall_Match=match,
+                Stability_Score=stability,
+                Total_Experience=experience,
+                Companies_Count=companies,
+                Skills=[self.skill_name(skill) for skill in np.frombuffer(skills, dtype=np.int32).tolist()],
+            )
+            pairs.append((row, result))
+        return pairs
+
+    def export(self, path, columns, indices=None, chunk_rows=1000):
+        """Write profiles (in `indices` order) with the bulk scripts' output columns"""
+        indices = range(len(columns)) if indices is None else indices
+        sink = open_sink(path)
+        try:
+            indices = list(indices)
+            for start in range(0, len(indices), chunk_rows):
+                chunk = indices[start:start + chunk_rows]
+                details = self.details([columns.profile_ids[i] for i in chunk])
+                sink.write([self._export_row(columns, i, details.get(columns.profile_ids[i], {})) for i in chunk])
+        finally:
+            sink.close()
+
+    @staticmethod
+    def _export_row(columns, i, details):
+        return {
+            "Applicant": columns.applicants[i],
+            "Position": columns.positions[i],
+            "Match_Percentage": round(float(columns.match[i]), 2),
+            "Stability_Score": round(float(columns.stability[i]), 2),
+            "Total_Experience": round(float(columns.total_experience[i]), 2),
+            "Companies_Count": int(columns.companies_count[i]),
+            "Strengths": ", ".join(details.get("Strengths", [])),
+            "Weaknesses": ", ".join(details.get("Weaknesses", [])),
+            "Score_Breakdown": json.dumps(details.get("Score_Breakdown", {})),
+            "Detailed_Analysis": details.get("Detailed_Analysis", ""),
+        }
+
+    def close(self):
+        self.conn.close()
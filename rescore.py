@@ -0,0 +1,148 @@
+from scoring import ATS_WEIGHTS, JobScorer, education_tokens, normalize_skills, normalize_term
+
+# Score components JobScorer recomputes locally, with their Score_Breakdown keys
+COMPONENTS = {
+    "skills": "skills_match",
+    "education": "education_match",
+    "experience": "experience_match",
+}
+
+# A component moving at least this many points makes the stored analysis stale
+DEFAULT_EXPLAIN_THRESHOLD = 10.0
+
+
+def _number(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _terms(values):
+    return {normalize_term(value) for value in values or [] if str(value).strip()} - {""}
+
+
+class JobDiff:
+    """What changed between two parsed job descriptions (parse_job_description shape).
+
+    `changed` holds the affected score components ("skills", "education",
+    "experience") and the LLM-only fields ("titles", "keywords").
+    `terms` are the normalized requirement terms added or removed.
+    """
+
+    def __init__(self, old_reqs, new_reqs):
+        old_reqs, new_reqs = old_reqs or {}, new_reqs or {}
+        self.changed = set()
+        self.terms = set()
+        self.labels = []
+
+        old_skills = normalize_skills(old_reqs.get("required_skills"))
+        new_skills = normalize_skills(new_reqs.get("required_skills"))
+        if old_skills != new_skills:
+            self.changed.add("skills")
+            self.terms |= old_skills ^ new_skills
+            # As spelled in either JD, for matching the stored analysis text
+            self.labels = sorted(
+                str(skill).strip() for skill in
+                (old_reqs.get("required_skills") or []) + (new_reqs.get("required_skills") or [])
+                if normalize_term(skill) in old_skills ^ new_skills
+            )
+        if education_tokens(old_reqs.get("required_education")) != education_tokens(new_reqs.get("required_education")):
+            self.changed.add("education")
+        if _number(old_reqs.get("min_experience")) != _number(new_reqs.get("min_experience")):
+            self.changed.add("experience")
+        for field, name in (("relevant_titles", "titles"), ("keywords", "keywords")):
+            old_terms, new_terms = _terms(old_reqs.get(field)), _terms(new_reqs.get(field))
+            if old_terms != new_terms:
+                self.changed.add(name)
+                self.terms |= old_terms ^ new_terms
+
+    @property
+    def components(self):
+        return [component for component in COMPONENTS if component in self.changed]
+
+    def __bool__(self):
+        return bool(self.changed)
+
+    def __repr__(self):
+        return f"JobDiff(changed={sorted(self.changed)}, terms={sorted(self.terms)})"
+
+
+def diff_requirements(old_reqs, new_reqs):
+    return JobDiff(old_reqs, new_reqs)
+
+
+def resume_data(result):
+    """Extraction-shaped resume data rebuilt from a stored analyze_resume() result"""
+    return {
+        "skills": result.get("Skills", []),
+        "education": result.get("Education", []),
+        "experience": result.get("Relevant_Experience", []),
+        "total_experience": result.get("Total_Experience", 0),
+    }
+
+
+def _clamp(value):
+    return max(0.0, min(100.0, value))
+
+
+class Rescorer:
+    """Re-scores stored candidates after a job description edit.
+
+    Only the components the edit touches are recomputed, as the change in
+    scoring.JobScorer's local score between the old and new requirements,
+    applied to the stored (LLM) breakdown and weighted into the overall
+    match with `weights`. A candidate goes back to the LLM only when its
+    stored explanation depends on what changed: a touched component moved
+    by at least `explain_threshold` points, or its strengths, weaknesses,
+    skills or positions mention an added or removed requirement.
+    """
+
+    def __init__(self, weights=ATS_WEIGHTS, explain_threshold=DEFAULT_EXPLAIN_THRESHOLD, semantic=True):
+        self.weights = dict(zip(COMPONENTS, weights))
+        self.explain_threshold = explain_threshold
+        self.semantic = semantic
+
+    def _mentions(self, diff, result):
+        if not diff.terms:
+            return False
+        text = " ".join(str(item) for item in result.get("Strengths", []) + result.get("Weaknesses", [])).casefold()
+        if any(label.casefold() in text for label in diff.labels):
+            return True
+        own = _terms(result.get("Skills", []))
+        own |= _terms(entry.get("position", "") for entry in result.get("Relevant_Experience", []))
+        return bool(own & diff.terms)
+
+    def rescore(self, old_reqs, new_reqs, results, diff=None):
+        """Updated copies of `results` (analyze_resume() dicts) and the indices needing the LLM"""
+        if diff is None:
+            diff = diff_requirements(old_reqs, new_reqs)
+        updated = [dict(result) for result in results]
+        if not diff or not results:
+            return updated, []
+
+        deltas = {}
+        if diff.components:
+            resume_datas = [resume_data(result) for result in results]
+            old_scores = JobScorer(old_reqs, semantic=self.semantic).score_batch(resume_datas)
+            new_scores = JobScorer(new_reqs, semantic=self.semantic).score_batch(resume_datas)
+            for component in diff.components:
+                key = COMPONENTS[component]
+                deltas[component] = new_scores[key] - old_scores[key]
+
+        explain = []
+        for i, result in enumerate(updated):
+            breakdown = dict(result.get("Score_Breakdown") or {})
+            match = _number(result.get("Overall_Match"))
+            moved = 0.0
+            for component, delta in deltas.items():
+                change = float(delta[i])
+                key = COMPONENTS[component]
+                breakdown[key] = round(_clamp(_number(breakdown.get(key)) + change))
+                match += self.weights[component] * change
+                moved = max(moved, abs(change))
+            result["Score_Breakdown"] = breakdown
+            result["Overall_Match"] = round(_clamp(match))
+            if moved >= self.explain_threshold or self._mentions(diff, result):
+                explain.append(i)
+        return updated, explain
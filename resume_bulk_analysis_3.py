@@ -1,41 +1,127 @@
-import pandas as pd
-import time
-import random
+from functools import partial
+import dates
+import model_client
+import retry
+import structured_output
+import telemetry
 from ats_func_3 import analyze_resume
+from extraction_cache import get_cache
+from bulk_runner import (
+    DEFAULT_RPM,
+    DEFAULT_TPM,
+    DEFAULT_WORKERS,
+    RateLimiter,
+    process_rows,
+)
+from sheet_io import DEFAULT_CHUNK_ROWS, iter_chunks, iter_input_rows, open_sink
+from text_store import TextStore
+from job_journal import JobJournal, journal_path
 
-def process_resumes(input_file, output_file):
-    df = pd.read_excel(input_file)
-    results = []
-    
-    for index, row in df.iterrows():
-        try:
-            
-            delay = min((2 ** index) + random.uniform(0, 1), 60)
-            time.sleep(delay)
-            
-            result = analyze_resume(row['Resume'], row['JobDescription'])
-            results.append({
-                "Applicant": row['Applicant'],
-                "Position": row['Position'],
-                "Match_Percentage": result["Overall_Match"],
-                "Stability_Score": result["Stability_Score"],
-                "Total_Experience": result["Total_Experience"],
-                "Companies_Count": result["Companies_Count"]
-            })
-            print(f"Processed: {row['Applicant']}")
-        except Exception as e:
-            print(f"Error processing {row['Applicant']}: {str(e)}")
-            results.append({
-                "Applicant": row['Applicant'],
-                "Position": row['Position'],
-                "Match_Percentage": "Error",
-                "Stability_Score": "Error",
-                "Total_Experience": "Error",
-                "Companies_Count": "Error"
-            })
-    
-    pd.DataFrame(results).to_excel(output_file, index=False)
+def analyze_row(row, text=None):
+    try:
+        result = analyze_resume(row['Resume'], row['JobDescription'], text=text)
+        if result.get("Failed"):
+            raise RuntimeError("analysis failed")
+        print(f"Processed: {row['Applicant']}")
+        return {
+            "Applicant": row['Applicant'],
+            "Position": row['Position'],
+            "Match_Percentage": result["Overall_Match"],
+            "Stability_Score": result["Stability_Score"],
+            "Total_Experience": result["Total_Experience"],
+            "Companies_Count": result["Companies_Count"]
+        }
+    except Exception as e:
+        print(f"Error processing {row['Applicant']}: {str(e)}")
+        return {
+            "Applicant": row['Applicant'],
+            "Position": row['Position'],
+            "Match_Percentage": "Error",
+            "Stability_Score": "Error",
+            "Total_Experience": "Error",
+            "Companies_Count": "Error"
+        }
+
+def process_resumes(input_file, output_file, workers=DEFAULT_WORKERS, rpm=DEFAULT_RPM,
+                    tpm=DEFAULT_TPM, backend=None, pdf_workers=None,
+                    use_text_store=True, checkpoint=True, streaming=False,
+                    chunk_rows=DEFAULT_CHUNK_ROWS, events=True, deduplicate=True):
+    """Analyze every row of `input_file` and write the results to `output_file`.
+
+    streaming=True reads the input in read-only chunks (.xlsx or .csv) and
+    appends each chunk's results to a write-only .xlsx, .csv or .parquet
+    sink, so memory stays flat for very large sheets.
+
+    Per-resume telemetry goes to an .events.jsonl file next to the output
+    when `events` is true and is summarized at the end (see telemetry).
+
+    With `deduplicate`, resubmitted copies of a resume (same or nearly the
+    same text, see dedup.Deduplicator) are not analyzed again for the same
+    job description; they reuse the first copy's result and are listed in a
+    .duplicates.csv report next to the output.
+    """
+    # Calls are paced by the shared rate limiter; workers only back off when
+    # the backend actually reports a rate-limit error. `backend` defaults to
+    # Gemini; pass model_client.FakeBackend() to run offline.
+    model_client.configure(backend=backend, limiter=RateLimiter(rpm=rpm, tpm=tpm))
+    recorder = telemetry.configure(telemetry.events_path(output_file, "ats3") if events else None)
+    worker = analyze_row
+
+    # PDFs are parsed on a process pool and each text is handed to the
+    # model-call threads as soon as it is ready; finished rows are journaled
+    # immediately so a restarted run skips them
+    store = TextStore() if use_text_store else None
+    journal = JobJournal(journal_path(output_file, "ats3")) if checkpoint else None
+    duplicates = None
+    if deduplicate:
+        from dedup import Deduplicator
+
+        duplicates = Deduplicator()
+    run = partial(
+        process_rows,
+        worker=worker,
+        workers=workers,
+        pdf_workers=pdf_workers,
+        store=store,
+        journal=journal,
+        is_ok=lambda result: result["Match_Percentage"] != "Error",
+        dedup=duplicates,
+    )
+
+    # One reference date for every "Present" in the run
+    dates.reset_stats()
+    structured_output.reset_stats()
+    retry.configure()
+    with dates.pinned():
+        if streaming:
+            sink = open_sink(output_file)
+            for chunk in iter_chunks(iter_input_rows(input_file), chunk_rows):
+                sink.write(run(chunk))
+            sink.close()
+        else:
+            import pandas as pd
+
+            df = pd.read_excel(input_file)
+            results = run([row for _, row in df.iterrows()])
+            pd.DataFrame(results).to_excel(output_file, index=False)
+
+    if journal is not None:
+        journal.close()
     print(f"Analysis complete. Results saved to {output_file}")
+    print(f"Extraction cache: {get_cache().stats()}")
+    if store is not None:
+        print(f"PDF text store: {store.stats()}")
+        store.close()
+    if duplicates is not None:
+        from dedup import duplicates_path
+
+        duplicates.write_report(duplicates_path(output_file, "ats3"))
+        print(f"Duplicates: {duplicates.stats()}")
+    print(f"Dates: {dates.stats()}")
+    print(f"Structured output: {structured_output.stats()}")
+    print(f"Retries: {retry.get_retrier().stats()}")
+    print(recorder.table())
+    recorder.close()
 
 if __name__ == "__main__":
     process_resumes(
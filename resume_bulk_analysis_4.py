@@ -1,55 +1,277 @@
-import pandas as pd
-import time
-import random
 import json
-from ats_func_4 import analyze_resume
+from functools import partial
+import ats_func_4
+import dates
+import model_client
+import retry
+import structured_output
+import telemetry
+from ats_func_4 import analyze_resume, analyze_resumes
+from extraction_cache import get_cache
+from jd_registry import JobRegistry, jd_hash
+from bulk_runner import (
+    DEFAULT_RPM,
+    DEFAULT_TPM,
+    DEFAULT_WORKERS,
+    RateLimiter,
+    process_rows,
+)
+from sheet_io import DEFAULT_CHUNK_ROWS, iter_chunks, iter_input_rows, open_sink
+from text_store import TextStore
+from job_journal import JobJournal, journal_path
 
-def process_resumes(input_file, output_file):
-    df = pd.read_excel(input_file)
-    results = []
-    
-    for index, row in df.iterrows():
+def format_row(row, result):
+    return {
+        "Applicant": row['Applicant'],
+        "Position": row['Position'],
+        "Match_Percentage": result["Overall_Match"],
+        "Stability_Score": result["Stability_Score"],
+        "Total_Experience": result["Total_Experience"],
+        "Companies_Count": result["Companies_Count"],
+        "Strengths": ", ".join(result["Strengths"]),
+        "Weaknesses": ", ".join(result["Weaknesses"]),
+        "Score_Breakdown": json.dumps(result["Score_Breakdown"]),
+        "Detailed_Analysis": result["Detailed_Analysis"]
+    }
+
+def error_row(row):
+    return {
+        "Applicant": row['Applicant'],
+        "Position": row['Position'],
+        "Match_Percentage": "Error",
+        "Stability_Score": "Error",
+        "Total_Experience": "Error",
+        "Companies_Count": "Error",
+        "Strengths": "Error",
+        "Weaknesses": "Error",
+        "Score_Breakdown": "Error",
+        "Detailed_Analysis": "Error"
+    }
+
+def analyze_row(row, text=None, registry=None, scoring="llm", profiles=None):
+    try:
+        job_reqs = registry.get(row['JobDescription']) if registry else None
+        result = analyze_resume(row['Resume'], row['JobDescription'], job_reqs, scoring=scoring, text=text)
+        if ats_func_4.is_failed(result):
+            raise RuntimeError("analysis failed")
+        if profiles is not None:
+            profiles.put(row, result)
+        print(f"Processed: {row['Applicant']}")
+        return format_row(row, result)
+    except Exception as e:
+        print(f"Error processing {row['Applicant']}: {str(e)}")
+        return error_row(row)
+
+def analyze_batch(rows, texts, registry=None, scoring="llm", stats=None, profiles=None):
+    """Analyze several rows with batched model requests (see ats_func_4.analyze_resumes)"""
+    try:
+        job_reqs = [registry.get(row['JobDescription']) if registry else None for row in rows]
+        results = analyze_resumes(
+            [row['Resume'] for row in rows],
+            [row['JobDescription'] for row in rows],
+            job_reqs,
+            texts,
+            scoring=scoring,
+            stats=stats,
+        )
+    except Exception as e:
+        print(f"Error processing batch of {len(rows)}: {str(e)}")
+        return [error_row(row) for row in rows]
+    formatted = []
+    for row, result in zip(rows, results):
         try:
-            #Introducing delay to avoid hit limits
-            delay = min((2 ** index) + random.uniform(0, 1), 60)
-            time.sleep(delay)
-            
-            result = analyze_resume(row['Resume'], row['JobDescription'])
-            results.append({
-                "Applicant": row['Applicant'],
-                "Position": row['Position'],
-                "Match_Percentage": result["Overall_Match"],
-                "Stability_Score": result["Stability_Score"],
-                "Total_Experience": result["Total_Experience"],
-                "Companies_Count": result["Companies_Count"],
-                "Strengths": ", ".join(result["Strengths"]),
-                "Weaknesses": ", ".join(result["Weaknesses"]),
-                "Score_Breakdown": json.dumps(result["Score_Breakdown"]),
-                "Detailed_Analysis": result["Detailed_Analysis"]
-            })
+            if ats_func_4.is_failed(result):
+                raise RuntimeError("analysis failed")
+            formatted.append(format_row(row, result))
+            if profiles is not None:
+                profiles.put(row, result)
             print(f"Processed: {row['Applicant']}")
         except Exception as e:
             print(f"Error processing {row['Applicant']}: {str(e)}")
-            results.append({
-                "Applicant": row['Applicant'],
-                "Position": row['Position'],
-                "Match_Percentage": "Error",
-                "Stability_Score": "Error",
-                "Total_Experience": "Error",
-                "Companies_Count": "Error",
-                "Strengths": "Error",
-                "Weaknesses": "Error",
-                "Score_Breakdown": "Error",
-                "Detailed_Analysis": "Error"
-            })
-    
-    pd.DataFrame(results).to_excel(output_file, index=False)
+            formatted.append(error_row(row))
+    return formatted
+
+def job_registry():
+    """JobRegistry of ats_func_4.parse_job_description, shared by every run"""
+    return JobRegistry(
+        ats_func_4.parse_job_description,
+        namespace=f"ats_func_4:{ats_func_4.JD_PROMPT_VERSION}:{ats_func_4.MODEL_NAME}",
+    )
+
+def process_resumes(input_file, output_file, workers=DEFAULT_WORKERS, rpm=DEFAULT_RPM,
+                    tpm=DEFAULT_TPM, backend=None, scoring="llm", pdf_workers=None,
+                    use_text_store=True, checkpoint=True, streaming=False,
+                    chunk_rows=DEFAULT_CHUNK_ROWS, batch_size=1, profiles=None,
+                    tier_band=None, tier_top_n=None, events=True, deduplicate=True):
+    """Analyze every row of `input_file` and write the results to `output_file`.
+
+    batch_size > 1 packs up to that many resumes into each extraction and
+    scoring request (within a token budget), falling back to single calls
+    only for candidates whose batched answer fails validation.
+
+    streaming=True reads the input in read-only chunks (.xlsx or .csv) and
+    appends each chunk's results to a write-only .xlsx, .csv or .parquet
+    sink, so memory stays flat for very large sheets.
+
+    scoring="tiered" scores every candidate locally and escalates to the LLM
+    only those whose local match lies in `tier_band` (low, high) or is among
+    the best `tier_top_n` of its job description (see tiered.TieredScorer;
+    None keeps the defaults there).
+
+    Per-stage timings, model calls, retries, sleeps, prompt/response sizes
+    and cache hits are written as one JSON line per resume (or batch) to
+    an .events.jsonl file next to the output when `events` is true, and
+    summarized as a table at the end (see telemetry).
+
+    With `deduplicate`, resubmitted copies of a resume (same or nearly the
+    same text, see dedup.Deduplicator) are not analyzed again for the same
+    job description; they reuse the first copy's result and are listed in a
+    .duplicates.csv report next to the output.
+
+    `profiles` (a profile_store.ProfileStore) keeps every scored candidate,
+    so the results can be re-ranked, filtered and re-exported later without
+    calling the model again, and re-scored after a JD edit (see rescore_resumes).
+    """
+    # Calls are paced by the shared rate limiter; workers only back off when
+    # the backend actually reports a rate-limit error. `backend` defaults to
+    # Gemini; pass model_client.FakeBackend() to run offline.
+    model_client.configure(backend=backend, limiter=RateLimiter(rpm=rpm, tpm=tpm))
+    recorder = telemetry.configure(telemetry.events_path(output_file, f"ats4-{scoring}") if events else None)
+
+    # Each distinct job description is parsed once and shared by its rows
+    registry = job_registry()
+    tiers = None
+    if scoring == "tiered":
+        import tiered
+
+        tiers = tiered.configure(
+            tiered.DEFAULT_BAND if tier_band is None else tier_band,
+            tiered.DEFAULT_TOP_N if tier_top_n is None else tier_top_n,
+        )
+    batch_stats = {}
+    if batch_size > 1:
+        worker = partial(analyze_batch, registry=registry, scoring=scoring, stats=batch_stats,
+                         profiles=profiles)
+    else:
+        worker = partial(analyze_row, registry=registry, scoring=scoring, profiles=profiles)
+
+    # PDFs are parsed on a process pool and each text is handed to the
+    # model-call threads as soon as it is ready; finished rows are journaled
+    # immediately so a restarted run skips them
+    store = TextStore() if use_text_store else None
+    journal = JobJournal(journal_path(output_file, f"ats4-{scoring}")) if checkpoint else None
+    duplicates = None
+    if deduplicate:
+        from dedup import Deduplicator
+
+        duplicates = Deduplicator()
+    run = partial(
+        process_rows,
+        worker=worker,
+        workers=workers,
+        pdf_workers=pdf_workers,
+        store=store,
+        journal=journal,
+        is_ok=lambda result: result["Match_Percentage"] != "Error",
+        dedup=duplicates,
+        batch_size=batch_size,
+    )
+
+    # One reference date for every "Present" in the run
+    dates.reset_stats()
+    structured_output.reset_stats()
+    retry.configure()
+    with dates.pinned():
+        if streaming:
+            sink = open_sink(output_file)
+            for chunk in iter_chunks(iter_input_rows(input_file), chunk_rows):
+                sink.write(run(chunk))
+            sink.close()
+        else:
+            import pandas as pd
+
+            df = pd.read_excel(input_file)
+            results = run([row for _, row in df.iterrows()])
+            pd.DataFrame(results).to_excel(output_file, index=False)
+
+    if journal is not None:
+        journal.close()
     print(f"Analysis complete. Results saved to {output_file}")
+    print(f"Extraction cache: {get_cache().stats()}")
+    if store is not None:
+        print(f"PDF text store: {store.stats()}")
+        store.close()
+    if duplicates is not None:
+        from dedup import duplicates_path
+
+        duplicates.write_report(duplicates_path(output_file, f"ats4-{scoring}"))
+        print(f"Duplicates: {duplicates.stats()}")
+    print(f"Dates: {dates.stats()}")
+    print(f"Structured output: {structured_output.stats()}")
+    print(f"Retries: {retry.get_retrier().stats()}")
+    if tiers is not None:
+        print(f"Tiered scoring: {tiers.stats()}")
+    if profiles is not None:
+        print(f"Profile store: {len(profiles)} profiles in {profiles.path}")
+    print(f"Job descriptions parsed: {registry.parse_calls}")
+    if batch_stats:
+        print(f"Batched requests: {batch_stats}")
+    print(recorder.table())
+    recorder.close()
+
+def rescore_resumes(old_job_description, new_job_description, output_file, profiles, rpm=DEFAULT_RPM,
+                    tpm=DEFAULT_TPM, backend=None, explain=True, explain_threshold=None):
+    """Re-score the candidates stored for `old_job_description` after it was edited.
+
+    Instead of re-running analyze_resume for every row, the two parsed JDs
+    are diffed and only the affected score components (skills, education,
+    experience) are recomputed from the profiles in `profiles` (see
+    rescore.Rescorer). Only candidates whose explanation depends on the
+    change are scored by the LLM again, in batches, without re-reading their
+    PDFs. Results are stored under the new JD and exported to `output_file`.
+    """
+    import rescore
+
+    model_client.configure(backend=backend, limiter=RateLimiter(rpm=rpm, tpm=tpm))
+    retry.configure()
+    registry = job_registry()
+    old_reqs = registry.get(old_job_description)
+    new_reqs = registry.get(new_job_description)
+    if old_reqs is None or new_reqs is None:
+        print("Could not parse the job descriptions; nothing re-scored")
+        return
+    pairs = profiles.results(jd_hash(old_job_description))
+    if not pairs:
+        print("No stored profiles for the previous job description")
+        return
+
+    diff = rescore.diff_requirements(old_reqs, new_reqs)
+    rescorer = rescore.Rescorer(
+        explain_threshold=rescore.DEFAULT_EXPLAIN_THRESHOLD if explain_threshold is None else explain_threshold
+    )
+    results, stale = rescorer.rescore(old_reqs, new_reqs, [result for _, result in pairs], diff)
+    batch_stats = {}
+    if explain and stale:
+        fresh = ats_func_4.rescore_results(
+            new_job_description, [rescore.resume_data(results[i]) for i in stale], new_reqs, stats=batch_stats
+        )
+        for i, result in zip(stale, fresh):
+            # A failed call keeps the locally re-scored result
+            if not ats_func_4.is_failed(result):
+                results[i] = result
+    profiles.put_many([(dict(row, JobDescription=new_job_description), result)
+                       for (row, _), result in zip(pairs, results)])
+    profiles.export(output_file, profiles.columns(job_description=new_job_description))
+
+    print(f"Job description change: {diff}")
+    print(f"Re-scored {len(pairs)} candidates locally; {len(stale) if explain else 0} sent back to the LLM")
+    print(f"Job descriptions parsed: {registry.parse_calls}")
+    if batch_stats:
+        print(f"Batched requests: {batch_stats}")
+    print(f"Retries: {retry.get_retrier().stats()}")
 
 if __name__ == "__main__":
     process_resumes(
         input_file="cvs.xlsx",
         output_file="ats_results.xlsx"
     )
-
-    
\ No newline at end of file
@@ -0,0 +1,293 @@
+import random
+import re
+import threading
+import time
+
+import telemetry
+from bulk_runner import is_rate_limit_error
+
+
+class InvalidAnswer(Exception):
+    """The model answered, but not in the expected shape; asking again may help"""
+
+
+class RetryPolicy:
+    """How often one error class is retried and how long to wait in between"""
+
+    __slots__ = ("attempts", "base", "cap")
+
+    def __init__(self, attempts, base=1.0, cap=30.0):
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+
+
+# Attempts per error class (including the first call) and jitter bounds in seconds
+DEFAULT_POLICIES = {
+    "rate_limit": RetryPolicy(6, 2.0, 60.0),
+    "server": RetryPolicy(5, 1.0, 30.0),
+    "timeout": RetryPolicy(3, 1.0, 10.0),
+    "invalid": RetryPolicy(3, 0.0, 0.0),
+    "client": RetryPolicy(1),
+    "other": RetryPolicy(3, 1.0, 20.0),
+}
+
+# Error classes that mean the backend is saturated and every worker should pause
+SATURATION = ("rate_limit", "server")
+
+_SERVER_NAMES = {"ServiceUnavailable", "InternalServerError", "BadGateway", "GatewayTimeout", "ServerError",
+                 "FakeServerError", "Aborted"}
+_TIMEOUT_NAMES = {"TimeoutError", "DeadlineExceeded", "ReadTimeout", "Timeout"}
+_CLIENT_NAMES = {"InvalidArgument", "PermissionDenied", "Unauthenticated", "NotFound", "BadRequest",
+                 "FailedPrecondition"}
+_SERVER_STATUS = re.compile(r"\b50[0-4]\b")
+
+
+def classify(exc):
+    """Error class of a failed model call, as used by the retry policies"""
+    if isinstance(exc, InvalidAnswer):
+        return "invalid"
+    if is_rate_limit_error(exc):
+        return "rate_limit"
+    name = type(exc).__name__
+    message = str(exc).lower()
+    if isinstance(exc, TimeoutError) or name in _TIMEOUT_NAMES or "timed out" in message or "deadline" in message:
+        return "timeout"
+    if name in _SERVER_NAMES or isinstance(exc, ConnectionError) or _SERVER_STATUS.search(message):
+        return "server"
+    if name in _CLIENT_NAMES:
+        return "client"
+    return "other"
+
+
+class RetryBudget:
+    """Caps retries to a share of all calls so a failing backend is not hammered.
+
+    Every call deposits `ratio` tokens and every retry spends one. Tokens
+    also trickle in at `min_per_second`, so a few retries stay possible when
+    traffic is low. At most `capacity` tokens are kept.
+    """
+
+    def __init__(self, ratio=0.2, min_per_second=0.1, capacity=20.0, clock=time.monotonic):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def record_call(self):
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def try_spend(self):
+        with self.lock:
+            now = self.clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.min_per_second)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    """Pauses every caller together once the backend looks saturated.
+
+    After `threshold` consecutive saturation errors (see SATURATION) the
+    breaker opens for `cooldown` seconds, doubling each time it re-opens
+    without a success in between, up to `max_cooldown`. The first success
+    closes it again.
+    """
+
+    def __init__(self, threshold=2, cooldown=2.0, max_cooldown=60.0, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self.failures = 0
+        self.streak = 0
+        self.opens = 0
+        self.open_until = 0.0
+        self.lock = threading.Lock()
+
+    def wait_time(self):
+        with self.lock:
+            return max(0.0, self.open_until - self.clock())
+
+    def record_failure(self):
+        """Count one saturation error; returns the pause length if this opened the breaker"""
+        with self.lock:
+            if self.clock() < self.open_until:
+                # In-flight calls failing while open are part of the same episode
+                return None
+            self.failures += 1
+            if self.failures < self.threshold:
+                return None
+            self.failures = 0
+            self.streak += 1
+            self.opens += 1
+            delay = min(self.cooldown * 2 ** (self.streak - 1), self.max_cooldown)
+            self.open_until = max(self.open_until, self.clock() + delay)
+        print(f"Model backend saturated: pausing all workers {delay:.0f}s")
+        telemetry.add("breaker_opens")
+        return delay
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.streak = 0
+
+
+class Retrier:
+    """One retry engine for every model call.
+
+    call(fn) runs `fn` until it returns, retrying failures according to
+    the policy of their error class (see classify) with decorrelated
+    jitter. Retries draw on a shared RetryBudget and saturation errors feed
+    a shared CircuitBreaker that every attempt waits on first. acall() is
+    the asyncio version and never blocks the event loop. Retries, sleep
+    time, breaker waits and give-ups are counted in stats() and telemetry.
+    """
+
+    def __init__(self, policies=None, budget=None, breaker=None, sleep=time.sleep, seed=None):
+        self.policies = dict(DEFAULT_POLICIES, **(policies or {}))
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+        self.sleep = sleep
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def _count(self, name, value=1):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + value
+        telemetry.add(name, value)
+
+    def _delay(self, policy, previous):
+        # Decorrelated jitter: uniform between the base and three times the last delay
+        with self.lock:
+            return min(policy.cap, self.rng.uniform(policy.base, max(previous, policy.base) * 3))
+
+    def _on_error(self, exc, attempts, delays):
+        """Seconds to wait before the next attempt, or None to give up"""
+        error_class = classify(exc)
+        attempts[error_class] = attempts.get(error_class, 0) + 1
+        policy = self.policies.get(error_class, self.policies["other"])
+        if error_class in SATURATION:
+            self.breaker.record_failure()
+        if attempts[error_class] >= policy.attempts:
+            self._count("retry_gave_up")
+            return None
+        if not self.budget.try_spend():
+            self._count("retry_budget_exhausted")
+            return None
+        delay = self._delay(policy, delays.get(error_class, 0.0))
+        delays[error_class] = delay
+        self._count("retries")
+        self._count(f"retries_{error_class}")
+        self._count("retry_sleep_s", delay)
+        return delay
+
+    def _breaker_wait(self):
+        wait = self.breaker.wait_time()
+        if wait > 0:
+            self._count("breaker_wait_s", wait)
+        return wait
+
+    def call(self, fn, *args, **kwargs):
+        attempts, delays = {}, {}
+        while True:
+            wait = self._breaker_wait()
+            if wait > 0:
+                self.sleep(wait)
+            self.budget.record_call()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._on_error(e, attempts, delays)
+                if delay is None:
+                    raise
+                if delay > 0:
+                    self.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def acall(self, fn, *args, **kwargs):
+        """call() for a coroutine function; waits with asyncio.sleep"""
+        import asyncio
+
+        attempts, delays = {}, {}
+        while True:
+            wait = self._breaker_wait()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.budget.record_call()
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._on_error(e, attempts, delays)
+                if delay is None:
+                    raise
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def stats(self):
+        with self.lock:
+            info = {name: round(value, 2) if isinstance(value, float) else value
+                    for name, value in self.counts.items()}
+        info["breaker_opens"] = self.breaker.opens
+        return info
+
+
+_retrier = None
+_lock = threading.Lock()
+
+
+def configure(**kwargs):
+    """Start a fresh shared Retrier (budget, breaker and counters) with Retrier(**kwargs)"""
+    global _retrier
+    with _lock:
+        _retrier = Retrier(**kwargs)
+        return _retrier
+
+
+def get_retrier():
+    """The shared Retrier, created with the default policies on first use"""
+    global _retrier
+    if _retrier is None:
+        with _lock:
+            if _retrier is None:
+                _retrier = Retrier()
+    return _retrier
+
+
+def call(fn, *args, **kwargs):
+    return get_retrier().call(fn, *args, **kwargs)
+
+
+async def acall(fn, *args, **kwargs):
+    return await get_retrier().acall(fn, *args, **kwargs)
+
+
+def generate_parsed(model, prompt, schema, **overrides):
+    """Ask `model` for an answer matching `schema` (see structured_output), with retries.
+
+    An empty or unparseable answer counts as an "invalid" error, so it is
+    asked again under that policy. Raises the last error when giving up.
+    """
+    import structured_output
+
+    def attempt():
+        response = model.generate_content(prompt, **overrides)
+        data = structured_output.parse(response.text, schema) if response.text else None
+        if data is None:
+            raise InvalidAnswer(f"no valid {schema.name} JSON in the answer")
+        return data
+
+    return call(attempt)
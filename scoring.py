@@ -0,0 +1,230 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+
+# Component weights (skills, education, experience)
+ATS_WEIGHTS = (0.4, 0.2, 0.4)
+UTILS_WEIGHTS = (0.5, 0.3, 0.2)
+
+# Canonical spellings for common abbreviations and variants. Keys and values
+# are already tokenized (lower case, punctuation split into spaces).
+PHRASE_ALIASES = {
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "cv": "computer vision",
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "sklearn": "scikit learn",
+    "tf": "tensorflow",
+    "torch": "pytorch",
+    "react js": "react",
+    "reactjs": "react",
+    "node js": "node",
+    "nodejs": "node",
+    "vue js": "vue",
+    "ci cd": "cicd",
+    "amazon web services": "aws",
+    "google cloud platform": "gcp",
+    "google cloud": "gcp",
+    "microsoft azure": "azure",
+    "rest api": "rest",
+    "restful api": "rest",
+    "cs": "computer science",
+    "it": "information technology",
+}
+
+SKILL_ALIASES = {
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "js": "javascript",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "sklearn": "scikit learn",
+}
+
+EDUCATION_ALIASES = {
+    "bsc": "bachelor",
+    "bs": "bachelor",
+    "ba": "bachelor",
+    "btech": "bachelor",
+    "bachelors": "bachelor",
+    "undergraduate": "bachelor",
+    "msc": "master",
+    "ms": "master",
+    "mtech": "master",
+    "masters": "master",
+    "postgraduate": "master",
+    "phd": "doctorate",
+    "doctoral": "doctorate",
+    "cs": "computer science",
+    "it": "information technology",
+    "ai": "artificial intelligence",
+    "ml": "machine learning",
+}
+
+# Degrees that are also English words ("to be considered"): only read as
+# degrees when dotted ("B.E.", "m.a.") or written in capitals ("BE", "MA")
+_WORD_DEGREES = {"be": "bachelor", "ba": "bachelor", "me": "master", "ma": "master"}
+_DOTTED_DEGREE_RE = re.compile(r"(?<![\w.])([bm])\.\s?([ae])\b\.?", re.IGNORECASE)
+_CAPITAL_DEGREE_RE = re.compile(r"\b(BE|BA|ME|MA)\b")
+
+EDUCATION_STOPWORDS = frozenset(
+    ["degree", "in", "of", "or", "and", "related", "field", "the", "a", "an",
+     "preferred", "equivalent", "with", "from", "s"]
+)
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_SUFFIXES = ("ations", "ation", "ings", "ing", "ment", "ers", "er", "ies", "es", "ed", "s")
+
+
+def _stem(token):
+    """Light iterative suffix stripper so "engineering" and "engineer" agree"""
+    while len(token) >= 5 and token.isalpha():
+        for suffix in _SUFFIXES:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+                token = token[: -len(suffix)] + ("y" if suffix == "ies" else "")
+                break
+        else:
+            return token[:-1] if token.endswith("e") else token
+    return token
+
+
+def _expand_degrees(text):
+    text = _DOTTED_DEGREE_RE.sub(lambda m: f" {_WORD_DEGREES[(m[1] + m[2]).lower()]} ", text)
+    return _CAPITAL_DEGREE_RE.sub(lambda m: _WORD_DEGREES[m[1].lower()], text)
+
+
+def _tokens(text):
+    # Joining dotted abbreviations keeps "B.Sc." and "Node.js" together
+    text = re.sub(r"(?<=\w)\.(?=\w)", "", str(text).casefold().replace("'s", "").replace("\u2019s", ""))
+    return _TOKEN_RE.findall(text)
+
+
+@lru_cache(maxsize=65536)
+def normalize_term(term, education=False):
+    """Canonical form of a skill or qualification: folded, de-aliased and stemmed"""
+    tokens = _tokens(_expand_degrees(str(term)) if education else term)
+    phrase = " ".join(tokens)
+    if phrase in PHRASE_ALIASES:
+        tokens = PHRASE_ALIASES[phrase].split()
+    else:
+        aliases = EDUCATION_ALIASES if education else SKILL_ALIASES
+        tokens = " ".join(aliases.get(token, token) for token in tokens).split()
+    return " ".join(_stem(token) for token in tokens)
+
+
+def _education_text(entry):
+    # utils.py extracts {"field": ..., "institution": ...} dicts, ats_func_* plain strings
+    if isinstance(entry, dict):
+        return " ".join(str(entry.get(k, "")) for k in ("degree", "field"))
+    return str(entry)
+
+
+def normalize_skills(skills):
+    return {normalize_term(skill) for skill in skills or [] if str(skill).strip()} - {""}
+
+
+def education_tokens(education):
+    tokens = set()
+    for entry in education or []:
+        tokens.update(normalize_term(_education_text(entry), education=True).split())
+    return tokens - EDUCATION_STOPWORDS
+
+
+class JobScorer:
+    """Deterministic, vectorized resume-vs-job scoring for one parsed job description.
+
+    `job_reqs` uses the parse_job_description shape (required_skills,
+    required_education, min_experience). Resumes use the extraction shape
+    plus a "total_experience" figure in years. With semantic=True a required
+    skill also counts as covered by a close spelling variant, judged by
+    skill_vectors (e.g. "TensorFlow 2" for "TensorFlow").
+    """
+
+    def __init__(self, job_reqs, weights=ATS_WEIGHTS, semantic=False):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.semantic = semantic
+        self.labels = {}
+        for skill in job_reqs.get("required_skills", []) or []:
+            self.labels.setdefault(normalize_term(skill), str(skill).strip())
+        self.labels.pop("", None)
+        self.skills = sorted(self.labels)
+        self.skill_index = {skill: i for i, skill in enumerate(self.skills)}
+
+        requirements = [education_tokens([entry]) for entry in job_reqs.get("required_education", [])]
+        requirements = [tokens for tokens in requirements if tokens]
+        self.edu_vocab = sorted(set().union(*requirements)) if requirements else []
+        self.edu_index = {token: i for i, token in enumerate(self.edu_vocab)}
+        self.edu_matrix = np.zeros((len(requirements), len(self.edu_vocab)), dtype=np.float32)
+        for row, tokens in enumerate(requirements):
+            self.edu_matrix[row, [self.edu_index[t] for t in tokens]] = 1.0
+        # A requirement counts as met when at least half of its tokens are present
+        self.edu_needed = np.ceil(self.edu_matrix.sum(axis=1) / 2.0)
+
+        try:
+            self.min_experience = float(job_reqs.get("min_experience") or 0)
+        except (TypeError, ValueError):
+            self.min_experience = 0.0
+
+    def _indicators(self, resumes):
+        n = len(resumes)
+        skill_hits = np.zeros((n, len(self.skills)), dtype=np.float32)
+        edu_hits = np.zeros((n, len(self.edu_vocab)), dtype=np.float32)
+        experience = np.zeros(n, dtype=np.float64)
+        skill_sets = []
+        for row, resume in enumerate(resumes):
+            skills = normalize_skills(resume.get("skills"))
+            skill_sets.append(skills)
+            cols = [self.skill_index[s] for s in skills if s in self.skill_index]
+            skill_hits[row, cols] = 1.0
+            cols = [self.edu_index[t] for t in education_tokens(resume.get("education")) if t in self.edu_index]
+            edu_hits[row, cols] = 1.0
+            try:
+                experience[row] = float(resume.get("total_experience") or 0)
+            except (TypeError, ValueError):
+                experience[row] = 0.0
+        if self.semantic and self.skills:
+            from skill_vectors import semantic_hits
+
+            skill_hits = np.maximum(skill_hits, semantic_hits(self.skills, skill_sets))
+        return skill_hits, edu_hits, experience
+
+    def score_batch(self, resumes):
+        """Score many resumes at once; returns component and total arrays (0-100)"""
+        skill_hits, edu_hits, experience = self._indicators(resumes)
+        n = len(resumes)
+
+        skills = skill_hits.mean(axis=1) if self.skills else np.zeros(n)
+        if len(self.edu_needed):
+            education = ((edu_hits @ self.edu_matrix.T) >= self.edu_needed).mean(axis=1)
+        else:
+            education = np.zeros(n)
+        if self.min_experience > 0:
+            exp = np.minimum(experience / self.min_experience, 1.0)
+        else:
+            exp = np.ones(n)
+
+        components = np.column_stack([skills, education, exp]).astype(np.float64)
+        return {
+            "match": components @ self.weights * 100,
+            "skills_match": components[:, 0] * 100,
+            "education_match": components[:, 1] * 100,
+            "experience_match": components[:, 2] * 100,
+        }
+
+    def score(self, resume):
+        """Score a single resume; returns plain floats"""
+        return {key: float(values[0]) for key, values in self.score_batch([resume]).items()}
+
+    def skill_gaps(self, resume):
+        """Required skills (as spelled in the JD) the resume covers and misses"""
+        covered = self._indicators([resume])[0][0]
+        matched = [self.labels[skill] for skill, hit in zip(self.skills, covered) if hit]
+        missing = [self.labels[skill] for skill, hit in zip(self.skills, covered) if not hit]
+        return matched, missing
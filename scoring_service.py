@@ -0,0 +1,301 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import model_client
+import retry
+import telemetry
+from ats_func_4 import analyze_resume, is_failed
+from bulk_runner import DEFAULT_RPM, DEFAULT_TPM, DEFAULT_WORKERS, RateLimiter
+from extraction_cache import get_cache
+from jd_registry import jd_hash
+from pdf_extract import extract_text
+from resume_bulk_analysis_4 import job_registry
+
+# Analyses allowed to wait for a worker before new requests get a 429
+DEFAULT_QUEUE_SIZE = 64
+# Seconds an HTTP request waits for its analysis before answering 504
+DEFAULT_TIMEOUT = 120.0
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+SCORING_MODES = ("llm", "local", "tiered")
+
+
+class Overloaded(Exception):
+    """Every worker is busy and the queue is full"""
+
+
+class ScoringService:
+    """analyze_resume behind a bounded worker pool, shared by every HTTP request.
+
+    The model clients, rate limiter, retry engine, extraction cache and job
+    registry are set up once and stay warm between requests. Job
+    descriptions are registered once and referred to by their jd_hash.
+    Concurrent requests for the same resume bytes, job and scoring mode
+    share one analysis. At most `workers` analyses run at once and
+    `queue_size` more wait; submit() raises Overloaded beyond that.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE, scoring="llm",
+                 rpm=DEFAULT_RPM, tpm=DEFAULT_TPM, backend=None, events_path=None):
+        if scoring not in SCORING_MODES:
+            raise ValueError(f"scoring must be one of {SCORING_MODES}")
+        model_client.configure(backend=backend, limiter=RateLimiter(rpm=rpm, tpm=tpm))
+        retry.configure()
+        self.recorder = telemetry.configure(events_path)
+        self.registry = job_registry()
+        self.scoring = scoring
+        self.jobs = {}
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="score")
+        self.slots = threading.BoundedSemaphore(workers + queue_size)
+        self.capacity = workers + queue_size
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.latency = telemetry.StageStats()
+        self.counters = {"requests": 0, "analyses": 0, "coalesced": 0, "rejected": 0, "failed": 0}
+        self.started = time.time()
+
+    def register(self, job_description):
+        """Parse `job_description` (once, via the job registry) and return its id"""
+        job_id = jd_hash(job_description)
+        requirements = self.registry.get(job_description)
+        if requirements is None:
+            raise ValueError("Could not parse the job description")
+        with self.lock:
+            self.jobs[job_id] = job_description
+        return job_id, requirements
+
+    def job(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def _analyze(self, body, is_text, job_id, scoring):
+        job_description = self.job(job_id)
+        job_reqs = self.registry.get(job_description)
+        if is_text:
+            text = body.decode("utf-8", errors="replace")
+        else:
+            with tempfile.NamedTemporaryFile(suffix=".pdf") as upload:
+                upload.write(body)
+                upload.flush()
+                with telemetry.stage("pdf_extract"):
+                    text = extract_text(upload.name)
+        self._count("analyses")
+        result = analyze_resume(f"upload:{job_id[:12]}", job_description, job_reqs, scoring=scoring, text=text)
+        if is_failed(result):
+            self._count("failed")
+            raise RuntimeError("Analysis failed")
+        return result
+
+    def _release(self, key, future):
+        self.slots.release()
+        with self.lock:
+            if self.inflight.get(key) is future:
+                del self.inflight[key]
+
+    def submit(self, body, job_id, is_text=False, scoring=None):
+        """Future of the analyze_resume() result and whether it was shared.
+
+        Raises KeyError for an unregistered job and Overloaded when the
+        pool and its queue are full.
+        """
+        scoring = scoring or self.scoring
+        if scoring not in SCORING_MODES:
+            raise ValueError(f"scoring must be one of {SCORING_MODES}")
+        if self.job(job_id) is None:
+            raise KeyError(job_id)
+        key = (hashlib.sha256(body).hexdigest(), job_id, scoring)
+        with self.lock:
+            self.counters["requests"] += 1
+            future = self.inflight.get(key)
+            if future is not None:
+                self.counters["coalesced"] += 1
+                return future, True
+            if not self.slots.acquire(blocking=False):
+                self.counters["rejected"] += 1
+                raise Overloaded()
+            future = self.inflight[key] = self.pool.submit(self._analyze, body, is_text, job_id, scoring)
+        # Outside the lock: the callback runs at once if the analysis already finished
+        future.add_done_callback(lambda done: self._release(key, done))
+        return future, False
+
+    def record(self, seconds):
+        with self.lock:
+            self.latency.add(seconds)
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+            stats.update(
+                jobs=len(self.jobs),
+                inflight=len(self.inflight),
+                capacity=self.capacity,
+                uptime_s=round(time.time() - self.started, 1),
+                p50_ms=round(self.latency.percentile(0.5) * 1000, 1),
+                p99_ms=round(self.latency.percentile(0.99) * 1000, 1),
+                max_ms=round(self.latency.max * 1000, 1),
+            )
+        stats["extraction_cache"] = get_cache().stats()
+        stats["retries"] = retry.get_retrier().stats()
+        stats["job_registry_parses"] = self.registry.parse_calls
+        return stats
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        self.recorder.close()
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    """JSON API over a ScoringService (set as the `service` class attribute).
+
+    POST /jobs            {"job_description": "..."} -> {"job_id", "requirements"}
+    GET  /jobs/<id>       the registered job description and its requirements
+    POST /score?job=<id>  resume PDF bytes, or its text with Content-Type
+                          text/plain; optional &scoring=llm|local|tiered
+    GET  /stats, /health
+    """
+
+    service = None
+    timeout_s = DEFAULT_TIMEOUT
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        # The body is left unread on every rejection, so the connection is closed
+        # rather than parsing the upload as the next request
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self._send(400, {"error": "a non-negative integer Content-Length is required"}, {"Connection": "close"})
+            return None
+        if length > MAX_UPLOAD_BYTES:
+            self._send(413, {"error": f"upload larger than {MAX_UPLOAD_BYTES} bytes"}, {"Connection": "close"})
+            return None
+        return self.rfile.read(length)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/health":
+            self._send(200, {"status": "ok"})
+        elif url.path == "/stats":
+            self._send(200, self.service.stats())
+        elif url.path.startswith("/jobs/"):
+            job_id = url.path[len("/jobs/"):]
+            job_description = self.service.job(job_id)
+            if job_description is None:
+                self._send(404, {"error": f"unknown job {job_id}"})
+                return
+            self._send(200, {"job_id": job_id, "job_description": job_description,
+                             "requirements": self.service.registry.get(job_description)})
+        else:
+            self._send(404, {"error": f"no route for {url.path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        body = self._body()
+        if body is None:
+            return
+        if url.path == "/jobs":
+            self._post_job(body)
+        elif url.path == "/score":
+            self._post_score(body, parse_qs(url.query))
+        else:
+            self._send(404, {"error": f"no route for {url.path}"})
+
+    def _post_job(self, body):
+        try:
+            job_description = json.loads(body)["job_description"]
+        except (ValueError, KeyError, TypeError):
+            self._send(400, {"error": 'expected {"job_description": "..."}'})
+            return
+        try:
+            job_id, requirements = self.service.register(job_description)
+        except Exception as e:
+            self._send(502, {"error": str(e)[:200]})
+            return
+        self._send(201, {"job_id": job_id, "requirements": requirements})
+
+    def _post_score(self, body, query):
+        started = time.perf_counter()
+        job_id = (query.get("job") or [""])[0]
+        scoring = (query.get("scoring") or [None])[0]
+        if not body:
+            self._send(400, {"error": "empty upload"})
+            return
+        is_text = (self.headers.get("Content-Type") or "").startswith("text/plain")
+        try:
+            future, coalesced = self.service.submit(body, job_id, is_text=is_text, scoring=scoring)
+        except KeyError:
+            self._send(404, {"error": f"unknown job {job_id!r}; register it with POST /jobs"})
+            return
+        except ValueError as e:
+            self._send(400, {"error": str(e)})
+            return
+        except Overloaded:
+            self._send(429, {"error": "scoring queue is full"}, {"Retry-After": "1"})
+            return
+        try:
+            result = future.result(timeout=self.timeout_s)
+        except FutureTimeout:
+            self._send(504, {"error": f"analysis took longer than {self.timeout_s:.0f}s"})
+            return
+        except Exception as e:
+            self._send(502, {"error": f"{type(e).__name__}: {str(e)[:200]}"})
+            return
+        self.service.record(time.perf_counter() - started)
+        self._send(200, {"job_id": job_id, "coalesced": coalesced, "result": result})
+
+
+def make_server(service, host="127.0.0.1", port=8080, timeout_s=DEFAULT_TIMEOUT):
+    """ThreadingHTTPServer answering with `service` (port 0 picks a free port)"""
+    handler = type("Handler", (ScoringHandler,), {"service": service, "timeout_s": timeout_s})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve(host="127.0.0.1", port=8080, **service_options):
+    """Run the scoring service until interrupted"""
+    service = ScoringService(**service_options)
+    server = make_server(service, host, port)
+    print(f"Scoring service listening on http://{host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        print(f"Service stats: {service.stats()}")
+        print(service.recorder.table())
+
+
+if __name__ == "__main__":
+    serve(
+        port=int(os.getenv("ATS_SERVICE_PORT", "8080")),
+        scoring=os.getenv("ATS_SERVICE_SCORING", "llm"),
+    )
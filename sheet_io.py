@@ -0,0 +1,127 @@
+import csv
+import os
+
+DEFAULT_CHUNK_ROWS = 1000
+
+
+def _extension(path):
+    return os.path.splitext(str(path))[1].lower()
+
+
+def iter_input_rows(path):
+    """Yield input rows as dicts without loading the whole sheet.
+
+    .xlsx files are read with openpyxl in read-only mode, .csv files with the
+    csv module. The first row holds the column names.
+    """
+    if _extension(path) == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.DictReader(f)
+        return
+
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        for values in rows:
+            if values is None or all(value is None for value in values):
+                continue
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def iter_chunks(rows, size=DEFAULT_CHUNK_ROWS):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ExcelSink:
+    """Write-only openpyxl workbook; rows are streamed to a temp file, not kept"""
+
+    def __init__(self, path):
+        from openpyxl import Workbook
+
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+        self.columns = None
+
+    def write(self, records):
+        for record in records:
+            if self.columns is None:
+                self.columns = list(record)
+                self.sheet.append(self.columns)
+            self.sheet.append([record.get(column) for column in self.columns])
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+class CsvSink:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = None
+
+    def write(self, records):
+        for record in records:
+            if self.writer is None:
+                self.writer = csv.DictWriter(self.file, fieldnames=list(record), extrasaction="ignore")
+                self.writer.writeheader()
+            self.writer.writerow(record)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink:
+    """Parquet output, one row group per write(); needs the optional pyarrow package"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow  # noqa: F401
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+        self.pq = pq
+        self.path = path
+        self.writer = None
+
+    def write(self, records):
+        import pyarrow as pa
+
+        if not records:
+            return
+        # Mixed numeric/"Error" cells are written as strings
+        table = pa.Table.from_pylist(
+            [{k: (v if v is None or isinstance(v, str) else str(v)) for k, v in r.items()} for r in records]
+        )
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table.cast(self.writer.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_sink(path):
+    """Incremental result writer chosen by the output file extension"""
+    extension = _extension(path)
+    if extension == ".csv":
+        return CsvSink(path)
+    if extension == ".parquet":
+        return ParquetSink(path)
+    return ExcelSink(path)
@@ -0,0 +1,241 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from scoring import normalize_term
+
+INDEX_PATH = os.getenv("ATS_SKILL_INDEX", os.path.join(".ats_cache", "skill_vectors"))
+DIM = 512
+NGRAMS = (3, 4)
+# Close spellings ("TensorFlow 2", "Postgres SQL") score above this; related but
+# different technologies ("React Native" for "React": 0.71) stay below it.
+# Pairs above it must also pass same_words ("ML Ops" for "Machine Learning": 0.89)
+DEFAULT_THRESHOLD = float(os.getenv("ATS_SKILL_SIMILARITY", 0.8))
+# Resume-side skills embedded on demand and kept in memory (never saved)
+MAX_CACHED_TERMS = 50000
+# Vector files no manifest names are removed by the next save once this old
+STALE_SECONDS = 600
+
+
+def _features(text):
+    for word in text.split():
+        padded = f" {word} "
+        yield "w:" + word
+        for n in NGRAMS:
+            for i in range(len(padded) - n + 1):
+                yield padded[i:i + n]
+
+
+def embed(term):
+    """Unit-length hashed character n-gram vector of a normalized skill"""
+    vector = np.zeros(DIM, dtype=np.float32)
+    for feature in _features(term):
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % DIM] += 1.0 if h & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+_embed_cached = lru_cache(maxsize=MAX_CACHED_TERMS)(embed)
+
+
+@lru_cache(maxsize=MAX_CACHED_TERMS)
+def same_words(a, b):
+    """Whether two normalized skills differ only by version tags or split words.
+
+    A word found in just one of them must carry a digit ("python 3", "es6")
+    or contain, or be contained in, a word of the other ("postgresql sql");
+    "machin learn ops" is not the same skill as "machin learn".
+    """
+    words_a, words_b = set(a.split()), set(b.split())
+    for word in words_a ^ words_b:
+        others = words_b if word in words_a else words_a
+        if any(c.isdigit() for c in word):
+            continue
+        if not any(min(len(word), len(other)) >= 3 and (word in other or other in word) for other in others):
+            return False
+    return True
+
+
+class SkillIndex:
+    """Job skill vectors, each embedded once and kept in a memory-mapped matrix.
+
+    save() writes the matrix under a unique .npy name, then atomically
+    replaces the .json manifest holding the vocabulary and that file name,
+    so concurrent processes never pair one run's matrix with another's
+    vocabulary. Saved vectors are opened read-only with
+    np.load(mmap_mode="r"). Resume-side skills go through lookup(): they
+    are embedded on demand and never saved, so the index only grows with
+    the job descriptions seen.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.vocab = {}
+        self.base = np.zeros((0, DIM), dtype=np.float32)
+        self.base_file = None
+        self.extra = np.zeros((64, DIM), dtype=np.float32)
+        self.extra_rows = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(f"{self.path}.json", encoding="utf-8") as f:
+                stored = json.load(f)
+            terms, base_file = stored["terms"], stored["vectors"]
+            base = np.load(os.path.join(os.path.dirname(self.path), base_file), mmap_mode="r")
+        except (OSError, ValueError, KeyError, TypeError):
+            # No index yet, an older layout, or vectors removed by a concurrent save
+            return
+        if base.shape == (len(terms), DIM):
+            self.base = base
+            self.base_file = base_file
+            self.vocab = {term: row for row, term in enumerate(terms)}
+
+    def __len__(self):
+        return len(self.vocab)
+
+    def ids(self, terms):
+        """Row ids of already-normalized terms, embedding any new ones"""
+        rows = []
+        with self.lock:
+            for term in terms:
+                row = self.vocab.get(term)
+                if row is None:
+                    row = self.vocab[term] = len(self.vocab)
+                    if self.extra_rows == len(self.extra):
+                        self.extra = np.concatenate([self.extra, np.zeros_like(self.extra)])
+                    self.extra[self.extra_rows] = embed(term)
+                    self.extra_rows += 1
+                rows.append(row)
+        return np.asarray(rows, dtype=np.int64)
+
+    def lookup(self, terms):
+        """Vectors of already-normalized terms; unknown terms are embedded but not added"""
+        with self.lock:
+            rows = [self.vocab.get(term) for term in terms]
+        out = np.empty((len(terms), DIM), dtype=np.float32)
+        known = [i for i, row in enumerate(rows) if row is not None]
+        if known:
+            out[known] = self.vectors([rows[i] for i in known])
+        for i, row in enumerate(rows):
+            if row is None:
+                out[i] = _embed_cached(terms[i])
+        return out
+
+    def vectors(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        out = np.empty((len(ids), DIM), dtype=np.float32)
+        in_base = ids < len(self.base)
+        out[in_base] = self.base[ids[in_base]]
+        if not in_base.all():
+            with self.lock:
+                out[~in_base] = self.extra[ids[~in_base] - len(self.base)]
+        return out
+
+    def save(self):
+        """Persist the vocabulary; in-memory state is left as it is"""
+        with self.lock:
+            if not self.extra_rows:
+                return
+            terms = sorted(self.vocab, key=self.vocab.get)
+            matrix = np.concatenate([np.asarray(self.base), self.extra[:self.extra_rows]])
+            directory = os.path.dirname(self.path)
+            name = os.path.basename(self.path)
+            os.makedirs(directory or ".", exist_ok=True)
+            fd, vectors_path = tempfile.mkstemp(dir=directory or ".", prefix=f"{name}.", suffix=".npy")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, matrix)
+            fd, manifest_path = tempfile.mkstemp(dir=directory or ".", prefix=f"{name}.", suffix=".json.tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"terms": terms, "vectors": os.path.basename(vectors_path)}, f, ensure_ascii=False)
+            os.replace(manifest_path, f"{self.path}.json")
+            self.base_file = os.path.basename(vectors_path)
+            self._remove_stale(directory or ".", name)
+
+    def _remove_stale(self, directory, name):
+        # Superseded by this or another process's save; a file a concurrent save
+        # is about to name in its manifest is always younger than STALE_SECONDS
+        cutoff = time.time() - STALE_SECONDS
+        for entry in os.scandir(directory):
+            if (entry.name.startswith(f"{name}.") and entry.name.endswith(".npy")
+                    and entry.name != self.base_file):
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+def _similarities(index, job_ids, resume_term_lists):
+    """Stacked resume terms, their similarity to each job skill, and where each resume starts"""
+    counts = np.array([len(terms) for terms in resume_term_lists], dtype=np.int64)
+    flat = [term for terms in resume_term_lists for term in terms]
+    similarity = index.lookup(flat) @ index.vectors(job_ids).T
+    starts = np.concatenate([[0], np.cumsum(counts[counts > 0])[:-1]])
+    return flat, similarity, starts, counts > 0
+
+
+def best_similarity(index, job_ids, resume_term_lists):
+    """Best cosine similarity of each resume's skills to each job skill.
+
+    One matrix product covers every resume: all resume skill vectors are
+    stacked, multiplied by the job skill matrix and max-reduced per resume.
+    Returns an (n_resumes, n_job_skills) array; resumes without skills get 0.
+    """
+    best = np.zeros((len(resume_term_lists), len(job_ids)), dtype=np.float32)
+    if not len(job_ids) or not any(resume_term_lists):
+        return best
+    _, similarity, starts, has_terms = _similarities(index, job_ids, resume_term_lists)
+    best[has_terms] = np.maximum.reduceat(similarity, starts, axis=0)
+    return best
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Process-wide SkillIndex, opened on first use and saved at exit"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SkillIndex()
+            atexit.register(_index.save)
+        return _index
+
+
+def semantic_hits(job_skills, resume_skill_sets, threshold=DEFAULT_THRESHOLD, index=None):
+    """(n_resumes, n_job_skills) booleans: job skill has a resume skill at least
+    `threshold` similar and with the same words (see same_words)"""
+    index = index if index is not None else get_index()
+    hits = np.zeros((len(resume_skill_sets), len(job_skills)), dtype=bool)
+    resume_terms = [sorted(skills) for skills in resume_skill_sets]
+    if not len(job_skills) or not any(resume_terms):
+        return hits
+    flat, similarity, starts, has_terms = _similarities(index, index.ids(job_skills), resume_terms)
+    close = similarity >= threshold
+    # Only the few pairs above the threshold get the word check
+    for row, col in zip(*np.nonzero(close)):
+        if not same_words(flat[row], job_skills[col]):
+            close[row, col] = False
+    hits[has_terms] = np.logical_or.reduceat(close, starts, axis=0)
+    return hits
+
+
+def similarity(a, b):
+    """Cosine similarity of two raw skill strings"""
+    return float(embed(normalize_term(a)) @ embed(normalize_term(b)))
+
+
+def same_skill(a, b, threshold=DEFAULT_THRESHOLD):
+    """Whether semantic_hits counts raw skill `b` as covering `a`"""
+    return similarity(a, b) >= threshold and same_words(normalize_term(a), normalize_term(b))
@@ -0,0 +1,399 @@
+import json
+import re
+import threading
+import time
+
+import telemetry
+
+_FENCE = "```"
+
+# Strings (either quote) and brackets; everything else is skipped by finditer.
+# The string alternatives cannot backtrack: their two branches are disjoint.
+_STRUCTURE = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|[{}\[\]]', re.S)
+
+# Tokens rewritten by repair(); runs of other characters pass through whole
+_REPAIR = re.compile(
+    r'"(?:[^"\\]|\\.)*"'           # JSON string: kept
+    r"|'((?:[^'\\]|\\.)*)'"         # single-quoted string: re-quoted
+    r"|(,)(?=\s*[}\]])"             # trailing comma: dropped
+    r"|\b(?:True|False|None)\b"     # Python literals: mapped
+    r"|[^\"',TFN]+|.",
+    re.S,
+)
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+MISSING = object()
+
+
+def _fenced(text):
+    """Body of the first ``` fenced block, or the whole text"""
+    start = text.find(_FENCE)
+    if start == -1:
+        return text
+    body = text.find("\n", start)
+    end = text.find(_FENCE, body + 1) if body != -1 else -1
+    return text[body + 1:end] if end != -1 else text
+
+
+def extract(text, opener=None):
+    """The first brace-balanced JSON object or array in `text`, or None.
+
+    One forward scan: a fenced block is preferred, strings (either quote)
+    are skipped whole, and the scan stops at the matching close bracket.
+    `opener` ("{" or "[") restricts the value type.
+    """
+    text = _fenced(text)
+    if opener:
+        start = text.find(opener)
+    else:
+        starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+        start = min(starts) if starts else -1
+    if start == -1:
+        return None
+    depth = 0
+    for match in _STRUCTURE.finditer(text, start):
+        token = match.group()
+        if token in "{[":
+            depth += 1
+        elif token in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:match.end()]
+    return None
+
+
+def _repair_token(match):
+    token = match.group()
+    if token[0] == "'":
+        inner = match.group(1).replace("\\'", "'").replace('"', '\\"')
+        return f'"{inner}"'
+    if match.group(2):
+        return ""
+    return _LITERALS.get(token, token)
+
+
+def repair(text):
+    """Fix trailing commas, single-quoted strings and Python True/False/None"""
+    return _REPAIR.sub(_repair_token, text)
+
+
+def loads(text, opener=None):
+    """Parse the JSON value embedded in a model answer; returns (value, repaired) or (None, False)"""
+    text = text or ""
+    stripped = text.strip()
+    if stripped[:1] == (opener or stripped[:1]) and stripped[:1] in ("{", "["):
+        # JSON mode answers are usually clean: let the C parser try first
+        try:
+            return json.loads(stripped), False
+        except ValueError:
+            pass
+    body = extract(text, opener)
+    if body is None:
+        return None, False
+    try:
+        return json.loads(body), False
+    except ValueError:
+        pass
+    try:
+        return json.loads(repair(body)), True
+    except ValueError:
+        return None, False
+
+
+# Field coercions: each returns the coerced value or raises ValueError
+
+def string(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        raise ValueError("expected text")
+    return str(value).strip()
+
+
+def string_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, list):
+        raise ValueError("expected a list")
+    return [str(item).strip() for item in value if item is not None and str(item).strip()]
+
+
+def percent(value):
+    """0-100 integer from 85, 85.6, "85", "85%" or "85 percent" """
+    if isinstance(value, bool):
+        raise ValueError("expected a percentage")
+    if isinstance(value, str):
+        match = _NUMBER.search(value)
+        if not match:
+            raise ValueError("expected a percentage")
+        value = match.group()
+    return max(0, min(100, int(float(value))))
+
+
+def number(value):
+    """Float from 3, "3", "3+ years"; anything unreadable counts as 0"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = _NUMBER.search(str(value or ""))
+    return float(match.group()) if match else 0.0
+
+
+def boolean(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "yes", "y", "1")
+    return bool(value)
+
+
+def percent_map(value):
+    if not isinstance(value, dict):
+        return {}
+    result = {}
+    for key, item in value.items():
+        try:
+            result[str(key)] = percent(item)
+        except (TypeError, ValueError):
+            continue
+    return result
+
+
+def records(schema):
+    """List of objects validated by `schema`; invalid entries are dropped"""
+    def coerce(value):
+        if value is None:
+            return []
+        if not isinstance(value, list):
+            raise ValueError("expected a list")
+        valid = (schema.validate(entry) for entry in value)
+        return [entry for entry in valid if entry is not None]
+    coerce.exact = lambda value: type(value) is list and all(map(schema.conforms, value))
+    return coerce
+
+
+def any_list(value):
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError("expected a list")
+    return value
+
+
+# Exact-shape checks: true only when the coercion would return an equal value,
+# so a clean answer can skip the coercing walk (see Schema.conforms)
+
+def _clean_string_list(value):
+    try:
+        return type(value) is list and "" not in value and all(map(str.__eq__, value, map(str.strip, value)))
+    except TypeError:
+        # A non-string item
+        return False
+
+
+string.exact = lambda value: type(value) is str and value == value.strip()
+string_list.exact = _clean_string_list
+percent.exact = lambda value: type(value) is int and 0 <= value <= 100
+number.exact = lambda value: type(value) in (int, float)
+boolean.exact = lambda value: type(value) is bool
+percent_map.exact = lambda value: type(value) is dict and all(
+    type(key) is str and percent.exact(item) for key, item in value.items()
+)
+any_list.exact = lambda value: type(value) is list
+
+
+class Field:
+    """One schema field: a coercion and whether (and how) it may be missing"""
+
+    __slots__ = ("name", "coerce", "required", "default")
+
+    def __init__(self, name, coerce, required=False, default=MISSING):
+        self.name = name
+        self.coerce = coerce
+        self.required = required
+        self.default = default
+
+
+class Schema:
+    """Typed record layout of one model answer.
+
+    validate() returns a new dict with exactly the declared fields, coerced;
+    a missing required field or an uncoercible required value fails the
+    record. Optional fields without a default are left out when absent.
+    """
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.names = {field.name for field in fields}
+        # Fields validate() always outputs: a clean answer must carry them
+        self.needed = {field.name for field in fields if field.required or field.default is not MISSING}
+        self.checks = [(field.name, getattr(field.coerce, "exact", None)) for field in fields]
+
+    def conforms(self, data):
+        """True when `data` already is what validate() would return"""
+        if type(data) is not dict or not self.needed <= data.keys() <= self.names:
+            return False
+        for name, exact in self.checks:
+            value = data.get(name, MISSING)
+            if value is not MISSING and (exact is None or not exact(value)):
+                return False
+        return True
+
+    def validate(self, data):
+        if not isinstance(data, dict):
+            return None
+        result = {}
+        for field in self.fields:
+            value = data.get(field.name, MISSING)
+            if value is not MISSING:
+                try:
+                    result[field.name] = field.coerce(value)
+                    continue
+                except (TypeError, ValueError):
+                    pass
+            if field.required:
+                return None
+            if field.default is not MISSING:
+                result[field.name] = field.default() if callable(field.default) else field.default
+        return result
+
+
+POSITION = Schema("position", [
+    Field("company", string),
+    Field("start", string),
+    Field("end", string),
+    Field("position", string),
+    Field("relevant", boolean),
+])
+
+RESUME = Schema("resume", [
+    Field("skills", string_list, required=True),
+    Field("education", string_list, required=True),
+    Field("experience", records(POSITION), required=True),
+])
+
+# utils.py extraction shape
+UTILS_POSITION = Schema("utils_position", [
+    Field("job_title", string),
+    Field("company", string),
+    Field("start_date", string),
+    Field("end_date", string),
+    Field("is_relevant", boolean, default=False),
+])
+
+UTILS_RESUME = Schema("utils_resume", [
+    Field("education", any_list, required=True),
+    Field("skills", string_list, required=True),
+    Field("experience", records(UTILS_POSITION), required=True),
+])
+
+JOB = Schema("job", [
+    Field("required_skills", string_list, required=True),
+    Field("required_education", string_list, required=True),
+    Field("min_experience", number, required=True),
+    Field("relevant_titles", string_list, default=list),
+    Field("keywords", string_list),
+])
+
+SCORE = Schema("score", [
+    Field("match", percent, required=True),
+    Field("stability", percent, required=True),
+    Field("score_breakdown", percent_map, default=dict),
+    Field("strengths", string_list, default=list),
+    Field("weaknesses", string_list, default=list),
+    Field("detailed_analysis", string, default=""),
+])
+
+# ats_func_3 scoring answer
+MATCH = Schema("match", [
+    Field("match", percent, required=True),
+    Field("stability", percent, required=True),
+])
+
+
+class ParseStats:
+    """Thread-safe per-schema counts of clean, repaired and failed parses and parse time"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counts = {}
+
+    def record(self, schema, outcome, seconds):
+        with self.lock:
+            counts = self.counts.setdefault(schema, {"ok": 0, "repaired": 0, "failed": 0, "seconds": 0.0})
+            counts[outcome] += 1
+            counts["seconds"] += seconds
+
+    def snapshot(self):
+        with self.lock:
+            info = {}
+            for schema, counts in self.counts.items():
+                total = counts["ok"] + counts["repaired"] + counts["failed"]
+                info[schema] = dict(
+                    counts,
+                    seconds=round(counts["seconds"], 4),
+                    failure_rate=round(counts["failed"] / total, 4) if total else 0.0,
+                    mean_us=round(counts["seconds"] / total * 1e6, 1) if total else 0.0,
+                )
+            return info
+
+
+_stats = ParseStats()
+
+
+def parse(response_text, schema):
+    """Validated record for a model answer expected to match `schema`, or None.
+
+    Malformed-but-recoverable answers are repaired locally instead of
+    costing another model call. Outcomes and time are counted in stats()
+    and telemetry.
+    """
+    started = time.perf_counter()
+    # Fast path: a clean JSON-mode answer already in the schema's shape skips
+    # answer extraction, repair and the coercing walk
+    try:
+        value = json.loads(response_text)
+    except (TypeError, ValueError):
+        value = None
+    repaired = False
+    if schema.conforms(value):
+        record = value
+    else:
+        if not isinstance(value, dict):
+            value, repaired = loads(response_text, "{")
+        record = schema.validate(value) if value is not None else None
+    outcome = "failed" if record is None else "repaired" if repaired else "ok"
+    seconds = time.perf_counter() - started
+    _stats.record(schema.name, outcome, seconds)
+    telemetry.add(f"parse_{outcome}")
+    telemetry.add("parse_s", seconds)
+    return record
+
+
+def parse_array(response_text):
+    """JSON array answer (batched prompts); a {"results": [...]} wrapper is unwrapped"""
+    started = time.perf_counter()
+    value, repaired = loads(response_text)
+    if isinstance(value, dict):
+        value = value.get("results")
+    if not isinstance(value, list):
+        value = None
+    outcome = "failed" if value is None else "repaired" if repaired else "ok"
+    seconds = time.perf_counter() - started
+    _stats.record("array", outcome, seconds)
+    telemetry.add(f"parse_{outcome}")
+    telemetry.add("parse_s", seconds)
+    return value or []
+
+
+def stats():
+    return _stats.snapshot()
+
+
+def reset_stats():
+    _stats.reset()
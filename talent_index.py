@@ -0,0 +1,166 @@
+import math
+import threading
+from collections import Counter
+
+import numpy as np
+
+from scoring import education_tokens, normalize_skills, normalize_term
+
+# Contribution of each field to a BM25 score
+FIELD_WEIGHTS = {"s": 1.0, "t": 0.5, "e": 0.3}
+DEFAULT_SHORTLIST = 50
+
+
+def _titles(resume_data):
+    # ats_func_* extraction uses "position", utils.py "job_title"
+    for entry in resume_data.get("experience") or []:
+        if isinstance(entry, dict):
+            title = entry.get("position") or entry.get("job_title")
+            if title:
+                yield title
+
+
+def profile_terms(resume_data):
+    """Field-prefixed index terms of one extracted profile, with frequencies"""
+    terms = Counter(f"s:{skill}" for skill in normalize_skills(resume_data.get("skills")))
+    terms.update(f"e:{token}" for token in education_tokens(resume_data.get("education")))
+    for title in _titles(resume_data):
+        terms.update(f"t:{token}" for token in normalize_term(title).split())
+    return terms
+
+
+def query_terms(job_reqs):
+    """Field-prefixed terms of a parsed job description (parse_job_description shape)"""
+    terms = {f"s:{skill}" for skill in normalize_skills(job_reqs.get("required_skills"))}
+    terms.update(f"e:{token}" for token in education_tokens(job_reqs.get("required_education")))
+    for title in job_reqs.get("relevant_titles") or []:
+        terms.update(f"t:{token}" for token in normalize_term(title).split())
+    return terms
+
+
+class TalentIndex:
+    """Inverted index over extracted profiles for BM25 shortlisting.
+
+    Terms are normalized skills, education tokens and job-title tokens (see
+    scoring.normalize_term), prefixed by field. Profiles can be added,
+    replaced and removed at any time; removed profiles leave a tombstone
+    until enough of them pile up to compact the postings.
+    """
+
+    def __init__(self, k1=1.2, b=0.75, field_weights=FIELD_WEIGHTS):
+        self.k1 = k1
+        self.b = b
+        self.field_weights = field_weights
+        self.lock = threading.Lock()
+        self.postings = {}
+        self.arrays = {}
+        self.doc_of = {}
+        self.profile_ids = []
+        self.doc_terms = []
+        self.lengths = np.zeros(1024, dtype=np.float64)
+        self.alive = np.zeros(1024, dtype=bool)
+        self.total_length = 0
+        self.removed = 0
+
+    def __len__(self):
+        return len(self.doc_of)
+
+    def __contains__(self, profile_id):
+        return profile_id in self.doc_of
+
+    def add(self, profile_id, resume_data):
+        """Index (or re-index) one profile under `profile_id`"""
+        terms = profile_terms(resume_data)
+        with self.lock:
+            if profile_id in self.doc_of:
+                self._remove(profile_id)
+            doc = len(self.profile_ids)
+            if doc == len(self.lengths):
+                self.lengths = np.concatenate([self.lengths, np.zeros_like(self.lengths)])
+                self.alive = np.concatenate([self.alive, np.zeros_like(self.alive)])
+            self.doc_of[profile_id] = doc
+            self.profile_ids.append(profile_id)
+            self.doc_terms.append(terms)
+            length = sum(terms.values())
+            self.lengths[doc] = length
+            self.alive[doc] = True
+            self.total_length += length
+            for term, tf in terms.items():
+                self.postings.setdefault(term, {})[doc] = tf
+                self.arrays.pop(term, None)
+
+    def add_many(self, items):
+        """Index (profile_id, resume_data) pairs, e.g. ExtractionCache.items()"""
+        for profile_id, resume_data in items:
+            self.add(profile_id, resume_data)
+
+    def remove(self, profile_id):
+        with self.lock:
+            if profile_id in self.doc_of:
+                self._remove(profile_id)
+                if self.removed > 1024 and self.removed > len(self.doc_of):
+                    self._compact()
+
+    def _remove(self, profile_id):
+        doc = self.doc_of.pop(profile_id)
+        for term in self.doc_terms[doc]:
+            postings = self.postings[term]
+            del postings[doc]
+            if not postings:
+                del self.postings[term]
+            self.arrays.pop(term, None)
+        self.total_length -= self.lengths[doc]
+        self.alive[doc] = False
+        self.doc_terms[doc] = None
+        self.profile_ids[doc] = None
+        self.removed += 1
+
+    def _compact(self):
+        live = [(profile_id, terms) for profile_id, terms in zip(self.profile_ids, self.doc_terms) if terms is not None]
+        self.postings, self.arrays, self.doc_of = {}, {}, {}
+        self.profile_ids, self.doc_terms = [], []
+        self.lengths[:] = 0
+        self.alive[:] = False
+        self.removed = 0
+        for doc, (profile_id, terms) in enumerate(live):
+            self.doc_of[profile_id] = doc
+            self.profile_ids.append(profile_id)
+            self.doc_terms.append(terms)
+            self.lengths[doc] = sum(terms.values())
+            self.alive[doc] = True
+            for term, tf in terms.items():
+                self.postings.setdefault(term, {})[doc] = tf
+
+    def _posting_arrays(self, term):
+        arrays = self.arrays.get(term)
+        if arrays is None:
+            postings = self.postings.get(term, {})
+            arrays = self.arrays[term] = (
+                np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float64, count=len(postings)),
+            )
+        return arrays
+
+    def search(self, job_reqs, k=DEFAULT_SHORTLIST):
+        """Top `k` (profile_id, score) pairs for a parsed job description, best first"""
+        with self.lock:
+            n = len(self.doc_of)
+            if not n:
+                return []
+            size = len(self.profile_ids)
+            average = self.total_length / n or 1.0
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[:size] / average)
+            scores = np.zeros(size)
+            for term in query_terms(job_reqs):
+                docs, tf = self._posting_arrays(term)
+                if not len(docs):
+                    continue
+                idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                weight = self.field_weights.get(term[0], 1.0) * idf
+                scores[docs] += weight * tf * (self.k1 + 1) / (tf + norm[docs])
+
+            candidates = np.flatnonzero((scores > 0) & self.alive[:size])
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+            return [(self.profile_ids[doc], float(scores[doc])) for doc in candidates]
@@ -0,0 +1,248 @@
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+EVENTS_PATH = os.getenv("ATS_TELEMETRY_EVENTS")
+ENABLED = os.getenv("ATS_TELEMETRY", "1").lower() not in ("0", "false", "no", "off")
+
+# Durations kept per stage for percentiles; older samples are replaced at random
+RESERVOIR_SIZE = 2048
+
+
+def events_path(output_file, tag):
+    """Events file next to the output file, like job_journal.journal_path"""
+    return f"{os.path.splitext(output_file)[0]}.{tag}.events.jsonl"
+
+
+class StageStats:
+    """Count, total, max and a sampled reservoir of one stage's wall times"""
+
+    __slots__ = ("count", "total", "max", "samples", "rng")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+        self.rng = random.Random(0)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(seconds)
+        else:
+            slot = self.rng.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self.samples[slot] = seconds
+
+    def percentile(self, q):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Trace:
+    """Stage times and counters of one unit of work (one resume or one batch)"""
+
+    __slots__ = ("fields", "stages", "counters")
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.stages = {}
+        self.counters = {}
+
+
+class Telemetry:
+    """Per-stage timings and counters, emitted as JSON lines and summarized at the end.
+
+    `trace()` opens a unit of work on the current thread; `stage()` times a
+    block within it and `add()` bumps a counter (model calls, retries, sleep
+    seconds, prompt and response sizes, cache hits). When the trace closes
+    its totals are merged into the run summary and, with an `events_path`,
+    written as one JSON line. Outside a trace, stages and counters go
+    straight to the summary. Recording costs two perf_counter calls and a
+    few dict updates, so it stays on in production.
+    """
+
+    def __init__(self, events_path=EVENTS_PATH, enabled=ENABLED):
+        self.enabled = enabled
+        self.events_path = events_path
+        self.events = None
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.traces = 0
+        if enabled and events_path:
+            os.makedirs(os.path.dirname(events_path) or ".", exist_ok=True)
+            self.events = open(events_path, "a", encoding="utf-8")
+
+    def _current(self):
+        return getattr(self.local, "trace", None)
+
+    @contextmanager
+    def trace(self, **fields):
+        """Record everything on this thread under one event carrying `fields`"""
+        if not self.enabled:
+            yield None
+            return
+        trace = Trace(fields)
+        parent = self._current()
+        self.local.trace = trace
+        started = time.perf_counter()
+        try:
+            yield trace
+        except BaseException as e:
+            trace.fields["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.local.trace = parent
+            self._finish(trace, time.perf_counter() - started)
+
+    def _finish(self, trace, seconds):
+        with self.lock:
+            self.traces += 1
+            self._stage(trace.fields.get("kind", "trace"), seconds)
+            for name, stage_seconds in trace.stages.items():
+                self._stage(name, stage_seconds)
+            for name, value in trace.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            if self.events is not None:
+                event = dict(trace.fields, ts=time.time(), seconds=round(seconds, 6),
+                             stages={name: round(value, 6) for name, value in trace.stages.items()},
+                             counters={name: round(value, 6) if isinstance(value, float) else value
+                                       for name, value in trace.counters.items()})
+                self.events.write(json.dumps(event, ensure_ascii=False, default=str) + "\n")
+
+    def _stage(self, name, seconds):
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats()
+        stats.add(seconds)
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage `name`"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name, seconds):
+        """Record a duration of stage `name` measured elsewhere (e.g. in a worker process)"""
+        if not self.enabled:
+            return
+        trace = self._current()
+        if trace is not None:
+            trace.stages[name] = trace.stages.get(name, 0.0) + seconds
+        else:
+            with self.lock:
+                self._stage(name, seconds)
+
+    def add(self, name, value=1):
+        """Add `value` to counter `name` of the current trace (or the summary)"""
+        if not self.enabled:
+            return
+        trace = self._current()
+        if trace is not None:
+            trace.counters[name] = trace.counters.get(name, 0) + value
+        else:
+            with self.lock:
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def note(self, **fields):
+        """Attach `fields` to the current trace's event"""
+        trace = self._current()
+        if trace is not None:
+            trace.fields.update(fields)
+
+    def summary(self):
+        """{"stages": {name: {...}}, "counters": {...}, "traces": n}"""
+        with self.lock:
+            stages = {
+                name: {
+                    "count": stats.count,
+                    "total_s": stats.total,
+                    "mean_ms": stats.total / stats.count * 1000,
+                    "p50_ms": stats.percentile(0.5) * 1000,
+                    "p95_ms": stats.percentile(0.95) * 1000,
+                    "max_ms": stats.max * 1000,
+                }
+                for name, stats in self.stages.items()
+            }
+            return {"stages": stages, "counters": dict(self.counters), "traces": self.traces}
+
+    def table(self):
+        """Summary as a plain-text table for the end of a run"""
+        summary = self.summary()
+        lines = [f"{'stage':<24} {'count':>8} {'total s':>10} {'mean ms':>10} {'p50 ms':>10} "
+                 f"{'p95 ms':>10} {'max ms':>10}"]
+        ordered = sorted(summary["stages"].items(), key=lambda item: -item[1]["total_s"])
+        for name, stats in ordered:
+            lines.append(f"{name:<24} {stats['count']:>8} {stats['total_s']:>10.2f} {stats['mean_ms']:>10.1f} "
+                         f"{stats['p50_ms']:>10.1f} {stats['p95_ms']:>10.1f} {stats['max_ms']:>10.1f}")
+        for name, value in sorted(summary["counters"].items()):
+            value = f"{value:.2f}" if isinstance(value, float) else str(value)
+            lines.append(f"{name:<24} {value:>8}")
+        return "\n".join(lines)
+
+    def close(self):
+        with self.lock:
+            if self.events is not None:
+                self.events.close()
+                self.events = None
+
+
+_telemetry = None
+_lock = threading.Lock()
+
+
+def get_telemetry():
+    """Process-wide Telemetry, created on first use from the environment"""
+    global _telemetry
+    if _telemetry is None:
+        with _lock:
+            if _telemetry is None:
+                _telemetry = Telemetry()
+    return _telemetry
+
+
+def configure(events_path=None, enabled=ENABLED):
+    """Start a fresh process-wide Telemetry (e.g. once per bulk run)"""
+    global _telemetry
+    with _lock:
+        if _telemetry is not None:
+            _telemetry.close()
+        _telemetry = Telemetry(events_path, enabled)
+        return _telemetry
+
+
+def trace(**fields):
+    return get_telemetry().trace(**fields)
+
+
+def stage(name):
+    return get_telemetry().stage(name)
+
+
+def record(name, seconds):
+    get_telemetry().record(name, seconds)
+
+
+def add(name, value=1):
+    get_telemetry().add(name, value)
+
+
+def note(**fields):
+    get_telemetry().note(**fields)
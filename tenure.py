@@ -0,0 +1,149 @@
+import numpy as np
+
+import dates
+
+DAY_US = 86_400_000_000
+_OFFSET_BITS = 42
+_OFFSET_MASK = (1 << _OFFSET_BITS) - 1
+
+
+def date_key(value):
+    """int64 key: month index << 42 | microseconds into the month.
+
+    Key order is datetime order, and whole-month differences can be taken
+    from keys without building relativedelta objects.
+    """
+    month = (value.year - 1970) * 12 + value.month - 1
+    offset = (value.day - 1) * DAY_US + (
+        ((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 + value.microsecond
+    )
+    return (month << _OFFSET_BITS) | offset
+
+
+def months_between(end, start):
+    """relativedelta(end, start) as total months, for int64 date-key arrays"""
+    end = np.asarray(end, dtype=np.int64)
+    start = np.asarray(start, dtype=np.int64)
+    end_month, end_offset = end >> _OFFSET_BITS, end & _OFFSET_MASK
+    start_month, start_offset = start >> _OFFSET_BITS, start & _OFFSET_MASK
+
+    # relativedelta adds the month count to `start`, clamping its day to the
+    # length of the target month, then steps one month back if it overshot
+    month_start = end_month.astype("datetime64[M]")
+    days_in_month = ((month_start + 1).astype("datetime64[D]") - month_start.astype("datetime64[D]")).astype(np.int64)
+    start_day = np.minimum(start_offset // DAY_US, days_in_month - 1)
+    clamped = start_day * DAY_US + start_offset % DAY_US
+
+    months = end_month - start_month
+    forward = end >= start
+    months -= forward & (end_offset < clamped)
+    months += ~forward & (end_offset > clamped)
+    return months
+
+
+def experience_columns(experience_lists, start_default="01/2000", end_default="Present", now=None):
+    """Relevant positions of every candidate as columns.
+
+    Returns a dict with `candidate` (row index into `experience_lists`),
+    `start` and `end` date keys, the candidate count `n` and `failed`,
+    {candidate: error} for entries that could not be read.
+    """
+    candidates, raw_starts, raw_ends, failed = [], [], [], {}
+    for index, experiences in enumerate(experience_lists):
+        try:
+            rows = [
+                (exp.get("start", start_default), exp.get("end", end_default))
+                for exp in experiences
+                if exp.get("relevant", False)
+            ]
+        except Exception as e:
+            failed[index] = e
+            continue
+        for start, end in rows:
+            candidates.append(index)
+            raw_starts.append(start)
+            raw_ends.append(end)
+
+    now_key = date_key(now or dates.reference_date())
+    starts, ends = (
+        [now_key if month is None else ((month[0] - 1970) * 12 + month[1] - 1) << _OFFSET_BITS
+         for month in dates.parse_months(values)]
+        for values in (raw_starts, raw_ends)
+    )
+    return {
+        "candidate": np.array(candidates, dtype=np.int64),
+        "start": np.array(starts, dtype=np.int64),
+        "end": np.array(ends, dtype=np.int64),
+        "n": len(experience_lists),
+        "failed": failed,
+    }
+
+
+def _merged_months_scalar(starts, ends):
+    """calculate_experience's merge loop over one candidate's date keys"""
+    intervals = sorted(zip(starts.tolist(), ends.tolist()), key=lambda x: x[0])
+    merged = [intervals[0]]
+    for start, end in intervals[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end:
+            merged[-1] = (min(last_start, start), max(last_end, end))
+        else:
+            merged.append((start, end))
+    return int(months_between([e for _, e in merged], [s for s, _ in merged]).sum())
+
+
+def total_experience(columns):
+    """Years of merged relevant experience per candidate (calculate_experience)"""
+    n = columns["n"]
+    candidate, start, end = columns["candidate"], columns["start"], columns["end"]
+    total_months = np.zeros(n, dtype=np.int64)
+    if len(candidate):
+        order = np.lexsort((start, candidate))
+        candidate, start, end = candidate[order], start[order], end[order]
+
+        # Running max of ends within each candidate: rank the keys so that
+        # candidate * ranks + rank orders by candidate first
+        keys, ranks = np.unique(np.concatenate([start, end]), return_inverse=True)
+        start_rank, end_rank = ranks[:len(start)], ranks[len(start):]
+        running = np.maximum.accumulate(candidate * len(keys) + end_rank) - candidate * len(keys)
+
+        new_range = np.ones(len(candidate), dtype=bool)
+        new_range[1:] = (candidate[1:] != candidate[:-1]) | (start_rank[1:] > running[:-1])
+        first = np.flatnonzero(new_range)
+        last = np.append(first[1:] - 1, len(candidate) - 1)
+        months = months_between(keys[running[last]], start[first])
+        np.add.at(total_months, candidate[first], months)
+
+        # The loop restarts a range at its first position's end even when that
+        # position ends before it starts, which a running max does not do;
+        # candidates where that happens are redone with the loop
+        for index in np.unique(candidate[new_range & (end < start)]).tolist():
+            rows = slice(*np.searchsorted(candidate, [index, index + 1]))
+            total_months[index] = _merged_months_scalar(start[rows], end[rows])
+
+    years = total_months / 12
+    for index, error in columns["failed"].items():
+        print(f"Experience calculation error: {str(error)[:50]}")
+        years[index] = 0.0
+    return years
+
+
+def stability(columns):
+    """Tenure-bucket stability score per candidate (calculate_stability)"""
+    n = columns["n"]
+    candidate = columns["candidate"]
+    months = months_between(columns["end"], columns["start"])
+    points = np.select(
+        [months < 6, months < 12, months < 24, months < 36],
+        [0.25, 0.5, 1.0, 1.5],
+        default=2.0,
+    )
+    counts = np.bincount(candidate, minlength=n)
+    sums = np.bincount(candidate, weights=points, minlength=n)
+    scores = np.zeros(n)
+    has_points = counts > 0
+    scores[has_points] = np.minimum(sums[has_points] / counts[has_points] * 100, 100)
+    for index, error in columns["failed"].items():
+        print(f"Stability calculation error: {str(error)[:50]}")
+        scores[index] = 0
+    return scores
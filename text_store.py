@@ -0,0 +1,98 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+STORE_PATH = os.getenv("ATS_TEXT_STORE", os.path.join(".ats_cache", "pdf_text.sqlite"))
+
+
+def file_digest(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TextStore:
+    """SQLite store of extracted PDF text keyed by file fingerprint.
+
+    A path whose size and mtime are unchanged is served without reading the
+    file. Otherwise the content hash is checked, so renamed, copied or
+    touched-but-identical files still skip extraction.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, sha256 TEXT)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS texts (sha256 TEXT PRIMARY KEY, text TEXT)")
+        self.conn.commit()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.lookup_seconds = 0.0
+        self.extract_seconds = 0.0
+
+    def _fingerprint(self, file_path):
+        stat = os.stat(file_path)
+        return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+    def get(self, file_path):
+        """Stored text for `file_path`, or None when it must be (re-)extracted"""
+        started = time.perf_counter()
+        try:
+            path, size, mtime_ns = self._fingerprint(file_path)
+            with self.lock:
+                row = self.conn.execute(
+                    "SELECT t.text FROM files f JOIN texts t ON t.sha256 = f.sha256"
+                    " WHERE f.path = ? AND f.size = ? AND f.mtime_ns = ?",
+                    (path, size, mtime_ns),
+                ).fetchone()
+            if row is None:
+                sha256 = file_digest(file_path)
+                with self.lock:
+                    row = self.conn.execute("SELECT text FROM texts WHERE sha256 = ?", (sha256,)).fetchone()
+                    if row is not None:
+                        self.conn.execute(
+                            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (path, size, mtime_ns, sha256)
+                        )
+                        self.conn.commit()
+        except OSError:
+            row = None
+        with self.lock:
+            self.lookup_seconds += time.perf_counter() - started
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0]
+
+    def put(self, file_path, text, extract_seconds=0.0):
+        try:
+            path, size, mtime_ns = self._fingerprint(file_path)
+            sha256 = file_digest(file_path)
+        except OSError:
+            return
+        with self.lock:
+            self.extract_seconds += extract_seconds
+            self.conn.execute("INSERT OR REPLACE INTO texts VALUES (?, ?)", (sha256, text))
+            self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (path, size, mtime_ns, sha256))
+            self.conn.commit()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "lookup_seconds": round(self.lookup_seconds, 3),
+            "extract_seconds": round(self.extract_seconds, 3),
+        }
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,154 @@
+import heapq
+import threading
+
+import numpy as np
+
+from jd_registry import jd_hash
+
+# Local match scores inside this range are too close to call locally
+DEFAULT_BAND = (40.0, 75.0)
+# The best candidates per job description always get the LLM's explanation.
+# Scored one at a time, the first top_n candidates of a job description all
+# lead so far and escalate, so savings only start after that many rows.
+DEFAULT_TOP_N = 5
+
+
+class TieredScorer:
+    """Decides which locally pre-scored candidates are escalated to LLM scoring.
+
+    A candidate is escalated when its local match lies inside `band`
+    (inclusive) or is among the `top_n` best local matches seen so far for
+    its job description. The running top-N always contains the final top-N,
+    so every true leader is escalated regardless of arrival order; early
+    arrivals may be escalated and later overtaken. select() ranks a whole
+    group at once, so only its real leaders escalate; should_escalate()
+    escalates each job description's first `top_n` candidates. Shared by
+    all workers of a run.
+    """
+
+    def __init__(self, band=DEFAULT_BAND, top_n=DEFAULT_TOP_N):
+        self.band = band
+        self.top_n = top_n
+        self.lock = threading.Lock()
+        self.leaders = {}
+        self.candidates = 0
+        self.escalated = 0
+
+    def _in_band(self, match):
+        return self.band is not None and self.band[0] <= match <= self.band[1]
+
+    def _lead(self, key, matches):
+        """Positions of `matches` that join the job description's running top-N"""
+        leading = set()
+        if not self.top_n:
+            return leading
+        heap = self.leaders.setdefault(key, [])
+        # Best first: a group member only displaces earlier leaders, never a better member
+        for i in sorted(range(len(matches)), key=lambda i: -matches[i]):
+            if len(heap) < self.top_n:
+                heapq.heappush(heap, matches[i])
+            elif matches[i] > heap[0]:
+                heapq.heapreplace(heap, matches[i])
+            else:
+                break
+            leading.add(i)
+        return leading
+
+    def should_escalate(self, job_desc, match):
+        """Record one local match score and return True if it needs the LLM"""
+        return self.select(job_desc, [match])[0]
+
+    def select(self, job_desc, matches):
+        """should_escalate for several candidates of one job description, ranked together"""
+        key = jd_hash(job_desc)
+        matches = [float(match) for match in matches]
+        with self.lock:
+            leading = self._lead(key, matches)
+            decisions = [i in leading or self._in_band(match) for i, match in enumerate(matches)]
+            self.candidates += len(decisions)
+            self.escalated += sum(decisions)
+        return decisions
+
+    def stats(self):
+        return {
+            "candidates": self.candidates,
+            "llm_calls": self.escalated,
+            "llm_calls_saved": self.candidates - self.escalated,
+        }
+
+
+_scorer = None
+_lock = threading.Lock()
+
+
+def configure(band=DEFAULT_BAND, top_n=DEFAULT_TOP_N):
+    """Start a fresh shared TieredScorer for the next run"""
+    global _scorer
+    with _lock:
+        _scorer = TieredScorer(band, top_n)
+    return _scorer
+
+
+def get_scorer():
+    """The shared TieredScorer, created with the defaults on first use"""
+    global _scorer
+    with _lock:
+        if _scorer is None:
+            _scorer = TieredScorer()
+        return _scorer
+
+
+def _ranks(values):
+    order = np.argsort(values, kind="stable")
+    ranks = np.empty(len(values), dtype=np.float64)
+    ranks[order] = np.arange(len(values))
+    # Tied values share their average rank
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    sums = np.zeros(len(counts))
+    np.add.at(sums, inverse, ranks)
+    return (sums / counts)[inverse]
+
+
+def rank_agreement(reference, scores, k=DEFAULT_TOP_N):
+    """How closely `scores` rank candidates like `reference` (e.g. full LLM scores).
+
+    Returns Spearman's rank correlation and "top_k_overlap", the share of
+    the reference top-`k` that is also in the top-`k` of `scores`.
+    """
+    reference = np.asarray(reference, dtype=np.float64)
+    scores = np.asarray(scores, dtype=np.float64)
+    n = len(reference)
+    if n < 2:
+        return {"spearman": 1.0, "top_k_overlap": 1.0}
+    a = _ranks(reference) - (n - 1) / 2.0
+    b = _ranks(scores) - (n - 1) / 2.0
+    denominator = np.sqrt((a @ a) * (b @ b))
+    spearman = float(a @ b / denominator) if denominator else 0.0
+    k = min(k, n)
+    top_reference = set(np.argsort(-reference, kind="stable")[:k].tolist())
+    top_scores = set(np.argsort(-scores, kind="stable")[:k].tolist())
+    return {"spearman": spearman, "top_k_overlap": len(top_reference & top_scores) / k}
+
+
+def replay(local, llm, band=DEFAULT_BAND, top_n=DEFAULT_TOP_N):
+    """Apply the tiered policy to a labelled sample of one job description.
+
+    `local` and `llm` are each candidate's local and full-LLM match scores,
+    ranked as one group (as analyze_resumes does). Returns the tiered scores (LLM where escalated, local
+    otherwise), the escalation mask and the agreement of tiered and
+    local-only rankings with the LLM ranking, so the band and top-N can be
+    tuned without model calls.
+    """
+    local = np.asarray(local, dtype=np.float64)
+    llm = np.asarray(llm, dtype=np.float64)
+    tiers = TieredScorer(band, top_n)
+    escalated = np.asarray(tiers.select("", local), dtype=bool)
+    tiered = np.where(escalated, llm, local)
+    k = top_n or DEFAULT_TOP_N
+    return {
+        "scores": tiered,
+        "escalated": escalated,
+        "stats": tiers.stats(),
+        "tiered_agreement": rank_agreement(llm, tiered, k),
+        "local_agreement": rank_agreement(llm, local, k),
+    }
@@ -1,16 +1,33 @@
-import pandas as pd
-import pdfplumber
-import google.generativeai as genai
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
-import os
-import re
-import json
-
-genai.configure(api_key=os.environ['GOOGLE_API_KEY'])
-model = genai.GenerativeModel('gemini-1.5-flash')
-
-def extract_resume_data(resume_text):
+import dates
+import retry
+import structured_output
+import telemetry
+from extraction_cache import cache_key, get_cache
+from model_client import get_client
+from jd_registry import JobRegistry, jd_hash
+from pdf_extract import extract_text
+from preprocess import prepare_job_description, prepare_resume
+
+MODEL_NAME = 'gemini-1.5-flash'
+EXTRACTION_PROMPT_VERSION = 'utils-resume-v2'
+JD_PROMPT_VERSION = 'utils-jd-v2'
+
+# process_resume's default: parse the JD itself (None means a failed parse)
+_NOT_SUPPLIED = object()
+
+def get_model():
+    # Plain-text generation config; answers go through structured_output
+    return get_client(MODEL_NAME)
+
+def extract_resume_data(resume_text, use_cache=True):
+    resume_text = prepare_resume(resume_text)
+    cache = get_cache()
+    key = cache_key(resume_text, EXTRACTION_PROMPT_VERSION, MODEL_NAME)
+    if use_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     prompt = f"""**Resume Analysis Task**
     
     Return ONLY VALID JSON with:
@@ -29,7 +46,7 @@ def extract_resume_data(resume_text):
     }}
     
     Rules:
-    - Current date: {datetime.now().strftime('%m/%Y')}
+    - Current date: {dates.reference_date().strftime('%m/%Y')}
     - Exclude freelance/volunteer roles
     - Format dates as MM/YYYY
     - is_relevant: true only for professional IT roles
@@ -39,12 +56,13 @@ def extract_resume_data(resume_text):
     """
     
     try:
-        response = model.generate_content(prompt)
-        json_str = re.search(r'\{.*\}', response.text, re.DOTALL).group()
-        return json.loads(json_str)
+        data = retry.generate_parsed(get_model(), prompt, structured_output.UTILS_RESUME)
+        if use_cache:
+            cache.put(key, data)
+        return data
     except Exception as e:
         print(f"Error parsing resume: {str(e)}")
-        return {"education": [], "skills": [], "experience": []}
+        return {"education": [], "skills": [], "experience": [], "failed": True}
 
 def parse_job_description(job_desc):
     prompt = f"""**Job Description Analysis Task**
@@ -58,13 +76,11 @@ def parse_job_description(job_desc):
     }}
     
     Job Description:
-    {job_desc}
+    {prepare_job_description(job_desc)}
     """
     
     try:
-        response = model.generate_content(prompt)
-        json_str = re.search(r'\{.*\}', response.text, re.DOTALL).group()
-        return json.loads(json_str)
+        return retry.generate_parsed(get_model(), prompt, structured_output.JOB)
     except Exception as e:
         print(f"Error parsing job description: {str(e)}")
         return {"required_education": [], "required_skills": [], "min_experience": 0}
@@ -79,13 +95,20 @@ def parse_job_description(job_desc):
     4. relevant_titles: List of relevant job titles/positions
     
     Job Description:
-    {job_desc}
+    {prepare_job_description(job_desc)}
     """
     
-    response = model.generate_content(prompt)
-    return eval(response.text)
+    # None marks a failed parse, which JobRegistry does not cache
+    try:
+        return retry.generate_parsed(get_model(), prompt, structured_output.JOB)
+    except Exception as e:
+        print(f"Error parsing job description: {str(e)[:50]}")
+        telemetry.note(last_error=str(e))
+        return None
 
 def calculate_experience(periods):
+    from dateutil.relativedelta import relativedelta
+
     if not periods:
         return 0.0
     
@@ -108,27 +131,24 @@ def calculate_experience(periods):
     return round(total_months / 12, 2)
 
 def calculate_match_score(job_reqs, resume_data):
-    edu_intersection = set(resume_data['education']) & set(job_reqs['required_education'])
-    edu_score = len(edu_intersection) / len(job_reqs['required_education']) if job_reqs['required_education'] else 0
-    
-    skill_intersection = set(resume_data['skills']) & set(job_reqs['required_skills'])
-    skill_score = len(skill_intersection) / len(job_reqs['required_skills']) if job_reqs['required_skills'] else 0
-    
-    exp_score = min(resume_data['total_experience'] / job_reqs['min_experience'], 1.0) if job_reqs['min_experience'] > 0 else 1.0
-    
-    return (0.3 * edu_score + 0.5 * skill_score + 0.2 * exp_score) * 100
+    from scoring import UTILS_WEIGHTS, JobScorer
+
+    # Normalized (case, aliases, stemming) overlap plus close spelling
+    # variants (skill_vectors); see scoring.JobScorer
+    return JobScorer(job_reqs, weights=UTILS_WEIGHTS, semantic=True).score(resume_data)['match']
 
-def calculate_stability(experiences):
+def calculate_stability(experiences, now=None):
     if not experiences:
         return 0.0
     
+    now = now or dates.reference_date()
     total_points = 0
     for exp in experiences:
         if not exp['is_relevant']:
             continue
             
-        start = datetime.strptime(exp['start_date'], '%m/%Y')
-        end = datetime.strptime(exp['end_date'], '%m/%Y') if exp['end_date'].lower() != 'present' else datetime.now()
+        start = dates.parse_date(exp['start_date'], now)
+        end = dates.parse_date(exp['end_date'], now)
         
         years = (end - start).days / 365.25
         
@@ -143,44 +163,81 @@ def calculate_stability(experiences):
     
     return min((total_points / len(experiences)) * 100, 100)
 
-def process_resume(job_desc, resume_path):
-    with pdfplumber.open(resume_path) as pdf:
-        resume_text = "\n".join(page.extract_text() for page in pdf.pages)
-    
-    resume_data = extract_resume_data(resume_text)
-    job_reqs = parse_job_description(job_desc)
-    
-    periods = []
-    for exp in resume_data['experience']:
-        if exp['is_relevant']:
-            start = datetime.strptime(exp['start_date'], '%m/%Y')
-            end = datetime.strptime(exp['end_date'], '%m/%Y') if exp['end_date'].lower() != 'present' else datetime.now()
-            periods.append((start, end))
-    
-    resume_data['total_experience'] = calculate_experience(periods)
-    
-    match_score = calculate_match_score(job_reqs, resume_data)
-    stability_score = calculate_stability(resume_data['experience'])
-    
-    return round(match_score, 2), round(stability_score, 2)
+def process_resume(job_desc, resume_path, job_reqs=_NOT_SUPPLIED, resume_text=None):
+    with telemetry.trace(kind="resume", resume=str(resume_path), scoring="local"):
+        if job_reqs is _NOT_SUPPLIED:
+            with telemetry.stage("jd_parse"):
+                job_reqs = parse_job_description(job_desc)
+        if job_reqs is None:
+            # Checked first: no resume extraction call for a job that cannot be scored
+            raise RuntimeError("Job description parsing failed")
+        
+        if resume_text is None:
+            with telemetry.stage("pdf_extract"):
+                resume_text = extract_text(resume_path)
+        
+        with telemetry.stage("extraction"):
+            resume_data = extract_resume_data(resume_text)
+        if resume_data.get("failed"):
+            # main() reports the row as an error instead of scoring an empty resume
+            raise RuntimeError("Resume extraction failed")
+        
+        with telemetry.stage("post_processing"):
+            now = dates.reference_date()
+            periods = []
+            for exp in resume_data['experience']:
+                if exp['is_relevant']:
+                    start = dates.parse_date(exp['start_date'], now)
+                    end = dates.parse_date(exp['end_date'], now)
+                    periods.append((start, end))
+            
+            resume_data['total_experience'] = calculate_experience(periods)
+        
+        with telemetry.stage("local_scoring"):
+            match_score = calculate_match_score(job_reqs, resume_data)
+            stability_score = calculate_stability(resume_data['experience'], now)
+        
+        return round(match_score, 2), round(stability_score, 2)
+
+def main(input_file, output_file, events=True):
+    import pandas as pd
 
-def main(input_file, output_file):
+    recorder = telemetry.configure(telemetry.events_path(output_file, "utils") if events else None)
     df = pd.read_excel(input_file)
     results = []
-    
-    for _, row in df.iterrows():
-        try:
-            match, stability = process_resume(row['JobDescription'], row['Resume'])
-            results.append({
-                'Applicant': row['Applicant'],
-                'Position': row['Position'],
-                'Match%': match,
-                'Stability%': stability
-            })
-        except Exception as e:
-            print(f"Error processing {row['Applicant']}: {str(e)}")
+    dates.reset_stats()
+    structured_output.reset_stats()
+    registry = JobRegistry(parse_job_description, namespace=f"utils:{JD_PROMPT_VERSION}:{MODEL_NAME}")
+    # JDs whose parse failed this run: their other rows are errors without another model call
+    failed_jds = set()
+    
+    with dates.pinned():
+        for _, row in df.iterrows():
+            try:
+                if jd_hash(row['JobDescription']) in failed_jds:
+                    raise RuntimeError("Job description could not be parsed")
+                job_reqs = registry.get(row['JobDescription'])
+                if job_reqs is None:
+                    failed_jds.add(jd_hash(row['JobDescription']))
+                    raise RuntimeError("Job description could not be parsed")
+                match, stability = process_resume(row['JobDescription'], row['Resume'], job_reqs)
+                results.append({
+                    'Applicant': row['Applicant'],
+                    'Position': row['Position'],
+                    'Match%': match,
+                    'Stability%': stability
+                })
+            except Exception as e:
+                print(f"Error processing {row['Applicant']}: {str(e)}")
     
     pd.DataFrame(results).to_excel(output_file, index=False)
+    print(f"Extraction cache: {get_cache().stats()}")
+    print(f"Job descriptions parsed: {registry.parse_calls} for {len(df)} rows")
+    print(f"Dates: {dates.stats()}")
+    print(f"Structured output: {structured_output.stats()}")
+    print(f"Retries: {retry.get_retrier().stats()}")
+    print(recorder.table())
+    recorder.close()
 
 if __name__ == "__main__":
     main('cvs.xlsx', 'output.xlsx')
\ No newline at end of file